@@ -0,0 +1,303 @@
+"""
+Набор бенчмарков CalcServ.
+
+Микробенчмарки solve_quadratic (разные виды уравнений), parse_request
+(корректные и некорректные запросы), create_response (json.dumps) и
+сериализатора по шаблону (response_encoder.py), а с флагом --http -
+нагрузочный тест сервера (load.py), с флагом --cold-start - время от запуска
+сервера до первого ответа в каждом режиме прогрева.
+
+Результаты пишутся в JSON (по умолчанию bench_output.txt в корне проекта):
+одна метрика на строку, ключи отсортированы, поэтому два прогона удобно
+сравнивать обычным diff. С --baseline результаты сравниваются с сохранённым
+прогоном, и при замедлении больше --threshold скрипт завершается с кодом 1.
+
+Примеры:
+    python benchmarks/bench.py
+    python benchmarks/bench.py --output baseline.json
+    python benchmarks/bench.py --http --baseline baseline.json
+    python benchmarks/bench.py --cold-start
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+PROJECT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from quadratic import solve_quadratic, solve_quadratic_batch, solve_quadratic_arrays
+from json_parser import parse_request, create_response, parse_batch_request, create_batch_response
+from binary_protocol import decode_request, encode_arrays, encode_request
+from response_encoder import encode_result, encode_batch
+
+# Ошибки разбора некорректных запросов логируются - в бенчмарке они не нужны
+logging.disable(logging.CRITICAL)
+
+DEFAULT_OUTPUT = os.path.join(PROJECT_ROOT, 'bench_output.txt')
+
+# Метрики, для которых больше - лучше (для остальных лучше меньше)
+HIGHER_IS_BETTER = {'requests_per_sec'}
+
+# Метрики, которые сравниваются с базовым прогоном
+COMPARED_METRICS = {'best_ns', 'requests_per_sec', 'p50_ms', 'p99_ms', 'p999_ms', 'first_response_ms'}
+
+
+def make_equations(kind, count, rng):
+    """
+    Тройки (a, b, c) одного вида:
+        real - два действительных корня
+        complex - комплексные корни
+        degenerate - D = 0
+        linear - a = 0
+        mixed - всё вперемешку
+    """
+    equations = []
+    for _ in range(count):
+        if kind == 'real':
+            x1, x2 = rng.uniform(-100, 100), rng.uniform(-100, 100)
+            a = rng.choice([-1, 1]) * rng.uniform(0.5, 10)
+            equations.append((a, -a * (x1 + x2), a * x1 * x2))
+        elif kind == 'complex':
+            re, im = rng.uniform(-100, 100), rng.uniform(1, 100)
+            a = rng.uniform(0.5, 10)
+            equations.append((a, -2 * a * re, a * (re * re + im * im)))
+        elif kind == 'degenerate':
+            x = rng.randint(-50, 50)
+            a = rng.randint(1, 10)
+            equations.append((float(a), float(-2 * a * x), float(a * x * x)))
+        elif kind == 'linear':
+            equations.append((0.0, rng.choice([0.0, rng.uniform(-100, 100)]), rng.uniform(-100, 100)))
+        else:
+            kind_of = rng.choice(['real', 'complex', 'degenerate', 'linear'])
+            equations.extend(make_equations(kind_of, 1, rng))
+    return equations
+
+
+def make_requests(kind, count, rng):
+    """
+    Тела запросов (bytes, как их получает сервер):
+        valid - корректные запросы с целыми и дробными коэффициентами
+        malformed - битый json, нет params, строки вместо чисел
+    """
+    bodies = []
+    for _ in range(count):
+        a, b, c = rng.randint(-100, 100), rng.uniform(-100, 100), rng.randint(-100, 100)
+        if kind == 'valid':
+            body = json.dumps({"params": {"a": a, "b": b, "c": c}})
+        else:
+            body = rng.choice([
+                '{"params": {"a": %d, "b": ' % a,
+                json.dumps({"a": a, "b": b, "c": c}),
+                json.dumps({"params": {"a": str(a), "b": b, "c": c}}),
+                json.dumps({"params": {"a": a, "b": b}}),
+                'not json',
+            ])
+        bodies.append(body.encode('utf-8'))
+    return bodies
+
+
+def measure(function, inputs, repeat=5, min_time=0.2):
+    """
+    Замеряет время одного вызова function(*args) по списку входов.
+
+    Возвращает словарь: лучшее и медианное время на операцию (нс) и
+    число операций в одном замере
+    """
+    loops = 1
+    # Подбираем число проходов по входам, чтобы замер длился не меньше min_time
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            for args in inputs:
+                function(*args)
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or loops >= 1 << 20:
+            break
+        loops *= 2
+
+    timings = [elapsed]
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(loops):
+            for args in inputs:
+                function(*args)
+        timings.append(time.perf_counter() - started)
+
+    operations = loops * len(inputs)
+    return {
+        "best_ns": min(timings) / operations * 1e9,
+        "median_ns": statistics.median(timings) / operations * 1e9,
+        "operations": operations,
+    }
+
+
+def micro_benchmarks(size=1000, seed=0, repeat=5, min_time=0.2):
+    """
+    Все микробенчмарки: имя -> результат measure().
+    """
+    rng = random.Random(seed)
+    results = {}
+
+    for kind in ('real', 'complex', 'degenerate', 'linear', 'mixed'):
+        equations = make_equations(kind, size, rng)
+        results[f"solve_quadratic.{kind}"] = measure(solve_quadratic, equations, repeat, min_time)
+
+    # Пакетные варианты - время на одно уравнение
+    mixed = make_equations('mixed', size, rng)
+    a, b, c = (list(column) for column in zip(*mixed))
+    json_body = json.dumps({"params": {"a": a, "b": b, "c": c}}).encode('utf-8')
+    binary_body = encode_request(mixed)
+
+    def json_batch(body):
+        return create_batch_response(solve_quadratic_batch(*parse_batch_request(body)))
+
+    def binary_batch(body):
+        return encode_arrays(*solve_quadratic_arrays(*decode_request(body)))
+
+    def json_dumps_batch(results):
+        return create_batch_response(results).encode('utf-8')
+
+    solutions = solve_quadratic_batch(a, b, c)
+    for name, function, args in (
+        ("solve_quadratic_batch.mixed", solve_quadratic_batch, (a, b, c)),
+        ("batch_roundtrip.json", json_batch, (json_body,)),
+        ("batch_roundtrip.binary", binary_batch, (binary_body,)),
+        ("batch_serialize.json_dumps", json_dumps_batch, (solutions,)),
+        ("batch_serialize.encoder", encode_batch, (solutions,)),
+    ):
+        batch = measure(function, [args], repeat, min_time)
+        results[name] = {
+            "best_ns": batch["best_ns"] / size,
+            "median_ns": batch["median_ns"] / size,
+            "operations": batch["operations"] * size,
+        }
+
+    for kind in ('valid', 'malformed'):
+        bodies = [(body,) for body in make_requests(kind, size, rng)]
+        results[f"parse_request.{kind}"] = measure(parse_request, bodies, repeat, min_time)
+
+    for kind in ('real', 'complex', 'linear'):
+        solutions = [solve_quadratic(*equation) for equation in make_equations(kind, size, rng)]
+        results[f"create_response.{kind}"] = measure(create_response, solutions, repeat, min_time)
+        results[f"encode_result.{kind}"] = measure(encode_result, solutions, repeat, min_time)
+
+    return results
+
+
+def serializer_speedups(results):
+    """
+    Во сколько раз сериализатор по шаблону быстрее json.dumps:
+    вид ответа -> отношение лучших времён.
+    """
+    pairs = {
+        kind: (f"create_response.{kind}", f"encode_result.{kind}") for kind in ('real', 'complex', 'linear')
+    }
+    pairs["batch"] = ("batch_serialize.json_dumps", "batch_serialize.encoder")
+    return {
+        kind: results[generic]["best_ns"] / results[encoder]["best_ns"]
+        for kind, (generic, encoder) in pairs.items()
+        if generic in results and encoder in results
+    }
+
+
+def compare(current, baseline, threshold=0.20):
+    """
+    Сравнивает результаты с базовым прогоном.
+
+    Возвращает список (бенчмарк, метрика, было, стало, относительное
+    изменение, хуже ли на threshold и больше). Изменение положительно,
+    когда стало хуже
+    """
+    rows = []
+    for name in sorted(current.keys() & baseline.keys()):
+        for metric in sorted(current[name].keys() & baseline[name].keys() & COMPARED_METRICS):
+            old, new = baseline[name][metric], current[name][metric]
+            if not old:
+                continue
+            change = (new - old) / old
+            if metric in HIGHER_IS_BETTER:
+                change = -change
+            rows.append((name, metric, old, new, change, change > threshold))
+    return rows
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарки CalcServ")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="куда записать результаты (JSON)")
+    parser.add_argument('--baseline', help="файл с результатами прошлого прогона для сравнения")
+    parser.add_argument('--threshold', type=float, default=0.20,
+                        help="допустимое замедление относительно базового прогона (0.20 = 20%%)")
+    parser.add_argument('--size', type=int, default=1000, help="число входов в каждом микробенчмарке")
+    parser.add_argument('--repeat', type=int, default=5, help="число замеров каждого микробенчмарка")
+    parser.add_argument('--seed', type=int, default=0, help="зерно генератора входных данных")
+    parser.add_argument('--http', action='store_true', help="запустить также нагрузочный тест сервера")
+    parser.add_argument('--modes', default='threads', help="режимы сервера для --http через запятую")
+    parser.add_argument('--concurrency', type=int, default=8, help="число клиентов для --http")
+    parser.add_argument('--requests', type=int, default=10000, help="число запросов для --http")
+    parser.add_argument('--cold-start', action='store_true',
+                        help="замерить время от запуска сервера до первого ответа")
+    args = parser.parse_args(argv)
+
+    results = micro_benchmarks(args.size, args.seed, args.repeat)
+
+    if args.http:
+        from load import benchmark_server
+        for mode in args.modes.split(','):
+            results[f"http.{mode}"] = benchmark_server(mode, args.concurrency, args.requests, seed=args.seed)
+
+    if args.cold_start:
+        from load import benchmark_cold_start
+        for mode in args.modes.split(','):
+            for warmup, result in benchmark_cold_start(mode).items():
+                results[f"cold_start.{mode}.{warmup}"] = result
+
+    report = {"environment": environment(), "benchmarks": results}
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=1, sort_keys=True)
+        file.write('\n')
+
+    for name, result in sorted(results.items()):
+        summary = ', '.join(
+            f"{metric}={value:.1f}" for metric, value in sorted(result.items())
+            if metric in COMPARED_METRICS
+        )
+        print(f"{name:32} {summary}")
+    speedups = ', '.join(f"{kind} x{speedup:.1f}" for kind, speedup in serializer_speedups(results).items())
+    print(f"Сериализатор по шаблону быстрее json.dumps: {speedups}")
+    print(f"Результаты записаны в {args.output}")
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)["benchmarks"]
+
+    regressions = 0
+    print(f"\nСравнение с {args.baseline}:")
+    for name, metric, old, new, change, regressed in compare(results, baseline, args.threshold):
+        mark = "  ЗАМЕДЛЕНИЕ" if regressed else ""
+        print(f"{name:32} {metric:16} {old:12.1f} -> {new:12.1f} {change:+7.1%}{mark}")
+        regressions += regressed
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
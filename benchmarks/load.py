@@ -0,0 +1,261 @@
+"""
+Нагрузочный тест сервера: запускает run_server.py в отдельном процессе и
+шлёт ему POST /calculate?quadratic с фиксированным числом параллельных
+клиентов.
+
+Результат - задержки p50/p99/p999 (в миллисекундах) и число запросов в
+секунду. Клиенты - потоки одного процесса, поэтому на быстрых серверах
+пределом может оказаться сам генератор нагрузки: сравнивать имеет смысл
+только прогоны на одной машине с одинаковыми параметрами.
+
+С --cold-start вместо нагрузки замеряется время от запуска процесса до
+первого успешного ответа (по умолчанию для каждого режима прогрева).
+
+Пример:
+    python benchmarks/load.py --concurrency 16 --requests 20000 --mode threads
+    python benchmarks/load.py --cold-start --mode prefork
+"""
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+PROJECT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+RUN_SERVER = os.path.join(PROJECT_ROOT, 'run_server.py')
+
+PATH = '/calculate?quadratic'
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Server did not start on port {port}")
+
+
+def start_server(port, server_args=()):
+    """
+    Запускает run_server.py и ждёт, пока он начнёт принимать соединения.
+    """
+    process = subprocess.Popen(
+        [sys.executable, RUN_SERVER, '--host', '127.0.0.1', '--port', str(port), *server_args],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(port)
+    except Exception:
+        process.kill()
+        process.wait()
+        raise
+    return process
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def make_bodies(count, seed=0, coefficient_range=20):
+    """
+    Тела запросов с небольшими целыми коэффициентами, как у калькулятора.
+    """
+    rng = random.Random(seed)
+    bodies = []
+    for _ in range(count):
+        a, b, c = (rng.randint(-coefficient_range, coefficient_range) for _ in range(3))
+        bodies.append(json.dumps({"params": {"a": a, "b": b, "c": c}}).encode('utf-8'))
+    return bodies
+
+
+def percentile(sorted_values, fraction):
+    """
+    Перцентиль по методу ближайшего ранга.
+    """
+    if not sorted_values:
+        return 0.0
+    index = max(math.ceil(fraction * len(sorted_values)) - 1, 0)
+    return sorted_values[index]
+
+
+def client(port, bodies, latencies, errors, keep_alive):
+    connection = None
+    for body in bodies:
+        started = time.perf_counter()
+        try:
+            if connection is None:
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            connection.request('POST', PATH, body, {'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+            if not keep_alive or response.will_close:
+                connection.close()
+                connection = None
+        except (OSError, http.client.HTTPException):
+            errors.append(0)
+            if connection is not None:
+                connection.close()
+            connection = None
+            continue
+        latencies.append(time.perf_counter() - started)
+
+    if connection is not None:
+        connection.close()
+
+
+def run_load(port, concurrency=8, requests=10000, warmup=500, seed=0, keep_alive=True):
+    """
+    Нагружает сервер на port и возвращает словарь результатов.
+
+    requests делятся поровну между concurrency клиентами, первые warmup
+    запросов не учитываются.
+    """
+    per_client = max(requests // concurrency, 1)
+
+    # Прогрев: кэши, импорты, пул потоков
+    client(port, make_bodies(warmup, seed + 1), [], [], keep_alive)
+
+    latencies = [[] for _ in range(concurrency)]
+    errors = []
+    threads = [
+        threading.Thread(
+            target=client,
+            args=(port, make_bodies(per_client, seed * 1000 + index), latencies[index], errors, keep_alive),
+        )
+        for index in range(concurrency)
+    ]
+
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    values = sorted(latency for client_latencies in latencies for latency in client_latencies)
+    return {
+        "concurrency": concurrency,
+        "requests": len(values),
+        "errors": len(errors),
+        "requests_per_sec": len(values) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": percentile(values, 0.50) * 1000,
+        "p99_ms": percentile(values, 0.99) * 1000,
+        "p999_ms": percentile(values, 0.999) * 1000,
+    }
+
+
+def benchmark_server(mode='threads', concurrency=8, requests=10000, server_args=(), seed=0):
+    """
+    Запускает сервер в режиме mode, нагружает его и останавливает.
+    """
+    port = free_port()
+    process = start_server(port, ['--mode', mode, *server_args])
+    try:
+        result = run_load(port, concurrency, requests, seed=seed)
+    finally:
+        stop_server(process)
+    result["mode"] = mode
+    return result
+
+
+def time_to_first_response(server_args=(), timeout=30.0, poll_interval=0.002):
+    """
+    Запускает run_server.py и опрашивает его POST-запросами, пока не придёт
+    ответ 200. Возвращает время от запуска процесса до этого ответа и до
+    GET /healthz = 200 (конец прогрева) в миллисекундах.
+    """
+    port = free_port()
+    body = make_bodies(1)[0]
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, RUN_SERVER, '--host', '127.0.0.1', '--port', str(port), '--log', 'none', *server_args],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+    def poll(method, path, body=None):
+        deadline = started + timeout
+        while time.perf_counter() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"Server exited with code {process.returncode}")
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=timeout)
+            try:
+                connection.request(method, path, body)
+                response = connection.getresponse()
+                response.read()
+                if response.status == 200:
+                    return (time.perf_counter() - started) * 1000
+            except OSError:
+                pass
+            finally:
+                connection.close()
+            time.sleep(poll_interval)
+        raise RuntimeError(f"No response from {path} in {timeout} s")
+
+    try:
+        first_response = poll('POST', PATH, body)
+        ready = poll('GET', '/healthz')
+    finally:
+        stop_server(process)
+    return {"first_response_ms": first_response, "ready_ms": ready}
+
+
+def benchmark_cold_start(mode='threads', warmup_modes=('background', 'eager', 'off'), server_args=(), runs=3):
+    """
+    Время до первого ответа для каждого режима прогрева (лучшее из runs запусков).
+    """
+    results = {}
+    for warmup in warmup_modes:
+        samples = [
+            time_to_first_response(['--mode', mode, '--warmup', warmup, *server_args])
+            for _ in range(runs)
+        ]
+        results[warmup] = {
+            metric: min(sample[metric] for sample in samples) for metric in samples[0]
+        }
+        results[warmup]["mode"] = mode
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Нагрузочный тест CalcServ")
+    parser.add_argument('--mode', default='threads', help="режим run_server.py")
+    parser.add_argument('--concurrency', type=int, default=8, help="число параллельных клиентов")
+    parser.add_argument('--requests', type=int, default=10000, help="общее число запросов")
+    parser.add_argument('--seed', type=int, default=0, help="зерно генератора коэффициентов")
+    parser.add_argument('--cold-start', action='store_true', help="замерить время до первого ответа")
+    parser.add_argument('server_args', nargs='*', help="дополнительные аргументы run_server.py (после --)")
+    args = parser.parse_args(argv)
+
+    if args.cold_start:
+        result = benchmark_cold_start(args.mode, server_args=args.server_args)
+        print(json.dumps(result, indent=1, sort_keys=True))
+        return
+
+    result = benchmark_server(args.mode, args.concurrency, args.requests, args.server_args, args.seed)
+    print(json.dumps(result, indent=1, sort_keys=True))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""
+Скрипт запуска сервера.
+
+Примеры:
+    python run_server.py
+    python run_server.py --mode prefork --workers 4 --threads 16
+    python run_server.py --mode asyncio --idle-timeout 10
+    python run_server.py --stage-timers
+    python run_server.py --warmup eager
+    python run_server.py --profiling --profile profile.folded
+"""
+import argparse
+import sys
+import os
+
+# Добавляем src в путь Python
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+import server
+import async_server
+from store import open_store, DEFAULT_CAPACITY
+from request_list import DEFAULT_MIN_ITEMS as LIST_MIN_ITEMS
+from structured_log import setup_logging, disable_logging
+from profiler import start_profile
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="CalcServ - сервис решения квадратных уравнений")
+    parser.add_argument('--host', default='localhost', help="адрес для прослушивания")
+    parser.add_argument('--port', type=int, default=8000, help="порт")
+    parser.add_argument('--mode', choices=['single', 'threads', 'prefork', 'asyncio'], default='threads',
+                        help="модель конкурентности")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="число процессов в режиме prefork (по умолчанию по числу ядер)")
+    parser.add_argument('--threads', type=int, default=8, help="размер пула потоков в процессе")
+    parser.add_argument('--backlog', type=int, default=128, help="длина очереди соединений сокета")
+    parser.add_argument('--cache-size', type=int, default=4096,
+                        help="число записей в кэше решений (0 - без кэша)")
+    parser.add_argument('--response-cache-bytes', type=int, default=16 * 1024 * 1024,
+                        help="бюджет памяти кэша готовых ответов в байтах (0 - без кэша)")
+    parser.add_argument('--idle-timeout', type=float, default=5.0,
+                        help="сколько секунд держать простаивающее keep-alive соединение (режим asyncio)")
+    parser.add_argument('--store', default=None,
+                        help="файл постоянного хранилища решений, общего для процессов (.db/.sqlite - SQLite)")
+    parser.add_argument('--store-size', type=int, default=DEFAULT_CAPACITY,
+                        help="размер нового хранилища: число слотов (mmap) или записей (SQLite)")
+    parser.add_argument('--warmup', choices=['background', 'eager', 'off'], default='background',
+                        help="прогрев: в фоне после открытия сокета, до открытия сокета или без прогрева")
+    parser.add_argument('--lookup-limit', type=int, default=0,
+                        help="таблица решений для целых коэффициентов от -N до N (0 - без таблицы)")
+    parser.add_argument('--lookup-file', default=None,
+                        help="файл таблицы решений (.npy): загрузить, а если его нет - построить и сохранить")
+    parser.add_argument('--max-body-size', type=int, default=1024 * 1024,
+                        help="максимальный размер тела запроса в байтах (413 для большего)")
+    parser.add_argument('--read-timeout', type=float, default=10.0,
+                        help="таймаут чтения из сокета в секундах (режимы single, threads, prefork)")
+    parser.add_argument('--max-in-flight', type=int, default=256,
+                        help="сколько соединений принимать в обработку и очередь, остальным - 503 (0 - без ограничения)")
+    parser.add_argument('--rate-limit', type=float, default=0.0,
+                        help="запросов в секунду с одного адреса, сверх - 429 (0 - без ограничения)")
+    parser.add_argument('--rate-burst', type=float, default=None,
+                        help="запас запросов сверх --rate-limit (по умолчанию две секунды запросов)")
+    parser.add_argument('--log', default='-',
+                        help="журнал доступа и ошибок в формате JSON lines: файл, '-' - stderr, 'none' - не вести")
+    parser.add_argument('--log-sample', type=float, default=1.0,
+                        help="доля строк об успешных ответах в журнале (ошибки пишутся всегда)")
+    parser.add_argument('--max-batch-items', type=int, default=10000,
+                        help="наибольшее число запросов в списке [{\"params\": ...}, ...] (больше - 413)")
+    parser.add_argument('--batch-processes', type=int, default=0,
+                        help="процессов-решателей с общей памятью для больших пачек и списков (0 - в процессе сервера)")
+    parser.add_argument('--batch-parallel-threshold', type=int, default=20000,
+                        help="с какого числа уравнений в пачке (&batch, двоичный формат) решать в процессах")
+    parser.add_argument('--list-parallel-threshold', type=int, default=LIST_MIN_ITEMS,
+                        help="с какого числа разных уравнений в списке запросов решать в процессах; "
+                             "список длиннее --max-batch-items получает 413 раньше, "
+                             "поэтому порог больше него не срабатывает")
+    parser.add_argument('--batch-chunk-size', type=int, default=65536,
+                        help="уравнений в одном куске, который получает процесс-решатель")
+    parser.add_argument('--no-coalesce', action='store_true',
+                        help="не объединять одинаковые одновременные запросы")
+    parser.add_argument('--precise', action='store_true',
+                        help="режим повышенной точности для плохо обусловленных уравнений (медленнее)")
+    parser.add_argument('--complex-format', choices=('string', 'object'), default='string',
+                        help="комплексные корни в ответах json: строка \"(1+2j)\" или объект {\"re\": 1.0, \"im\": 2.0}")
+    parser.add_argument('--stage-timers', action='store_true',
+                        help="замерять время этапов запроса для GET /metrics")
+    parser.add_argument('--profiling', action='store_true',
+                        help="включить GET /debug/profile и Server-Timing по заголовку X-Calcserv-Trace: 1")
+    parser.add_argument('--profile', default=None,
+                        help="профилировать всё время работы и записать свёрнутые стеки в файл при завершении "
+                             "(в режиме prefork процессы пишут в файл.<pid>)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.log != 'none':
+        setup_logging(args.log, args.log_sample)
+    else:
+        disable_logging()
+    server.solution_cache.resize(args.cache_size)
+    server.response_cache.resize(args.response_cache_bytes)
+    server.metrics.timing = args.stage_timers
+    if args.profiling:
+        server.enable_profiling()
+    if args.profile:
+        start_profile(args.profile)
+    server.coalescer.enabled = not args.no_coalesce
+    server.list_solver.configure(args.max_batch_items, min_items=args.list_parallel_threshold)
+    server.configure_solver_pool(args.batch_processes, args.batch_chunk_size, args.batch_parallel_threshold)
+    server.rate_limiter.configure(args.rate_limit, args.rate_burst)
+    server.QuadraticHandler.max_body_size = args.max_body_size
+    server.QuadraticHandler.timeout = args.read_timeout
+    if args.precise:
+        server.use_precise_solver()
+    server.use_complex_format(args.complex_format)
+    if (args.lookup_limit or args.lookup_file) and not args.precise:
+        # Таблица строится секунды: при прогреве - отдельным шагом, а до
+        # готовности запросы решаются без неё
+        def load_table():
+            from lookup import open_table, describe, DEFAULT_LIMIT
+            server.solution_cache.table = open_table(args.lookup_limit or DEFAULT_LIMIT, args.lookup_file)
+            print(describe(server.solution_cache.table), file=sys.stderr)
+
+        if args.warmup == 'off':
+            load_table()
+        else:
+            server.warmup.add('lookup', load_table)
+    if args.store:
+        server.solution_cache.store = open_store(args.store, args.store_size, precise=args.precise)
+
+    if args.mode == 'asyncio':
+        async_server.run(args.host, args.port, args.idle_timeout, args.backlog,
+                         args.max_body_size, args.max_in_flight, args.warmup)
+    else:
+        server.run(args.host, args.port, args.mode, args.workers, args.threads, args.backlog,
+                   args.max_in_flight, args.warmup)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Контроль нагрузки: ограничение числа запросов в обработке и частоты
+запросов от одного клиента.
+
+При перегрузке сервер сразу отвечает 503 (Retry-After), а не копит
+соединения в очереди, поэтому задержка для остальных клиентов остаётся
+ограниченной. Клиент, превысивший свою частоту, получает 429.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+
+
+# Через сколько секунд клиенту стоит повторить запрос после 503
+RETRY_AFTER = 1
+
+
+class InFlightLimiter:
+    """
+    Счётчик запросов в обработке с верхней границей limit.
+
+    В отличие от семафора не ждёт: acquire() сразу отвечает, есть ли место.
+    limit = 0 снимает ограничение.
+    """
+
+    def __init__(self, limit=0):
+        self.limit = limit
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            if self.limit and self.count >= self.limit:
+                return False
+            self.count += 1
+            return True
+
+    def release(self):
+        with self.lock:
+            self.count -= 1
+
+
+class ClientRateLimiter:
+    """
+    Ограничивает частоту запросов одного клиента: не больше rate запросов
+    в секунду (token bucket с запасом burst).
+
+    Хранит не больше max_clients клиентов, давно не приходившие
+    вытесняются. rate = 0 снимает ограничение.
+    """
+
+    def __init__(self, rate=0.0, burst=None, max_clients=10000):
+        self.max_clients = max_clients
+        self.lock = threading.Lock()
+        # клиент -> [токены, время последнего пополнения]
+        self.buckets = OrderedDict()
+        self.configure(rate, burst)
+
+    def configure(self, rate, burst=None):
+        """
+        Меняет ограничение (по умолчанию запас - две секунды запросов).
+        """
+        with self.lock:
+            self.rate = rate
+            self.burst = burst or max(2 * rate, 1.0)
+            self.buckets.clear()
+
+    def acquire(self, client):
+        """
+        Забирает токен клиента.
+
+        Возвращает 0, если запрос можно обработать, иначе - через сколько
+        секунд (целое, для Retry-After) у клиента появится токен
+        """
+        if self.rate <= 0:
+            return 0
+
+        with self.lock:
+            now = time.monotonic()
+            bucket = self.buckets.get(client)
+            if bucket is None:
+                bucket = self.buckets[client] = [self.burst, now]
+                if len(self.buckets) > self.max_clients:
+                    self.buckets.popitem(last=False)
+            else:
+                self.buckets.move_to_end(client)
+
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens < 1:
+                bucket[0] = tokens
+                return max(math.ceil((1 - tokens) / self.rate), 1)
+
+            bucket[0] = tokens - 1
+            return 0
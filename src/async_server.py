@@ -0,0 +1,342 @@
+"""
+Асинхронный HTTP сервер на asyncio.
+
+Обслуживает те же маршруты, что и QuadraticHandler (/, статика и
+/calculate?quadratic), но держит соединения открытыми (HTTP/1.1 keep-alive)
+и отвечает на конвейерные (pipelined) запросы по порядку. Тысячи клиентов
+обслуживаются одним циклом событий без потока на соединение.
+
+Запросы с большим телом (пачки, многочлены, решение в пуле solver_pool)
+считаются в потоках исполнителя цикла, чтобы долгое решение не держало
+остальные соединения; короткие решаются прямо в цикле.
+"""
+import asyncio
+import signal
+import time
+from http import HTTPStatus
+
+from server import (
+    MAX_BODY_SIZE, get_route, post_route, static_files, metrics, rate_limiter, error_page, http_date,
+    start_warmup, RouteError, trace_timer, with_server_timing, TRACE_HEADER,
+)
+from admission import RETRY_AFTER
+from structured_log import log_access
+
+
+# Максимальный размер строки запроса вместе с заголовками
+MAX_HEADER_SIZE = 64 * 1024
+
+SERVER_NAME = 'CalcServ-asyncio'
+
+# POST с телом больше этого (байт) обрабатывается в потоке исполнителя
+INLINE_BODY_SIZE = 256
+
+
+class BadRequest(Exception):
+    """Некорректный HTTP запрос"""
+
+    status = 400
+
+
+class PayloadTooLarge(BadRequest):
+    """Тело запроса больше допустимого"""
+
+    status = 413
+
+
+def parse_head(head):
+    """
+    Разбирает строку запроса и заголовки.
+
+    Возвращает (метод, путь, версия, словарь заголовков в нижнем регистре)
+    """
+    lines = head.decode('latin-1').split('\r\n')
+    parts = lines[0].split()
+
+    if len(parts) != 3 or parts[2] not in ('HTTP/1.0', 'HTTP/1.1'):
+        raise BadRequest(f"Bad request line: {lines[0]!r}")
+
+    method, path, version = parts
+    headers = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, separator, value = line.partition(':')
+        if not separator or not name.strip():
+            raise BadRequest(f"Bad header: {line!r}")
+        headers[name.strip().lower()] = value.strip()
+
+    return method, path, version, headers
+
+
+def is_keep_alive(version, headers):
+    """
+    HTTP/1.1 держит соединение по умолчанию, HTTP/1.0 - только по запросу клиента.
+    """
+    connection = headers.get('connection', '').lower()
+    if version == 'HTTP/1.0':
+        return connection == 'keep-alive'
+    return connection != 'close'
+
+
+def route(method, path, body, headers=None, timer=None):
+    """
+    Обрабатывает запрос теми же функциями, что и QuadraticHandler.
+
+    headers - заголовки запроса (имена в нижнем регистре)
+    timer - StageTimer для замера этапов (None - без замеров)
+
+    Возвращает (код ответа, закодированные заголовки и тело)
+    """
+    try:
+        get = get_route(path) if method == 'GET' else None
+        if get is not None:
+            return get()
+
+        if method == 'GET':
+            status, asset = static_files.lookup(path)
+            if status != 200:
+                return error_page(status, asset)
+
+            headers = headers or {}
+            status, response_headers, content = asset.respond(
+                headers.get('if-none-match'), headers.get('accept-encoding'),
+            )
+            head = ''.join(f"{name}: {value}\r\n" for name, value in response_headers) + '\r\n'
+            return status, head.encode('latin-1') + content
+
+        if method == 'POST':
+            headers = headers or {}
+            status, calculate = post_route(path, headers.get('content-type'), headers.get('accept'))
+            if status != 200:
+                return error_page(status, calculate)
+
+            timer = trace_timer(timer, headers.get(TRACE_HEADER.lower()))
+            response = calculate(body, timer)
+
+            if response is None:
+                return error_page(400, "Invalid request")
+            return 200, with_server_timing(timer, response)
+
+        return error_page(501, f"Unsupported method ({method!r})")
+
+    except RouteError as error:
+        return error_page(error.status, str(error))
+
+    except Exception as e:
+        return error_page(500, f"Server error: {str(e)}")
+
+
+def route_in_thread(method, path, body, headers, timing):
+    """
+    route для потока исполнителя.
+
+    Счётчики метрик у каждого потока свои (metrics.Shard), поэтому таймер
+    этапов (если timing) создаётся в этом потоке, а не берётся из цикла.
+    """
+    return route(method, path, body, headers, metrics.timer() if timing else None)
+
+
+class AsyncQuadraticServer:
+    """
+    Обработчик соединений для asyncio.start_server.
+
+    idle_timeout - сколько секунд ждать следующий запрос (и тело запроса)
+    в открытом соединении, прежде чем закрыть его.
+    max_body_size - максимальный размер тела запроса (413 для большего).
+    max_connections - сколько соединений обслуживать одновременно, новым
+    сверх этого отвечать 503 (0 - без ограничения).
+    """
+
+    def __init__(self, idle_timeout=5.0, max_body_size=MAX_BODY_SIZE, max_connections=0):
+        self.idle_timeout = idle_timeout
+        self.max_body_size = max_body_size
+        self.max_connections = max_connections
+        self.closing = False
+        # Открытые соединения: writer -> обрабатывается ли сейчас запрос
+        self.connections = {}
+
+    def build_response(self, status, response, keep_alive):
+        """
+        Дополняет закодированный ответ строкой статуса и общими заголовками.
+        """
+        metrics.count_status(status)
+        head = (
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+            f"Server: {SERVER_NAME}\r\n"
+            f"Date: {http_date()}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        )
+        return head.encode('latin-1') + response
+
+    async def read_request(self, reader):
+        """
+        Читает один запрос из соединения.
+
+        Возвращает (метод, путь, версия, заголовки, тело) или None,
+        если клиент закрыл соединение или молчал дольше idle_timeout.
+        """
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), self.idle_timeout)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            return None
+        except asyncio.LimitOverrunError:
+            raise BadRequest("Request header too large")
+
+        method, path, version, headers = parse_head(head)
+
+        if 'transfer-encoding' in headers:
+            raise BadRequest("Transfer-Encoding is not supported, use Content-Length")
+
+        try:
+            content_length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise BadRequest("Bad Content-Length")
+        if content_length < 0:
+            raise BadRequest("Bad Content-Length")
+        if content_length > self.max_body_size:
+            raise PayloadTooLarge(f"Request body is larger than {self.max_body_size} bytes")
+
+        body = b''
+        if content_length:
+            try:
+                body = await asyncio.wait_for(reader.readexactly(content_length), self.idle_timeout)
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                return None
+
+        return method, path, version, headers, body
+
+    async def handle_connection(self, reader, writer):
+        """
+        Обслуживает соединение: запросы читаются и обрабатываются по очереди,
+        поэтому ответы на конвейерные запросы уходят в том же порядке.
+        """
+        if self.max_connections and len(self.connections) >= self.max_connections:
+            await self.reject(reader, writer)
+            return
+
+        peer = writer.get_extra_info('peername')
+        client = peer[0] if isinstance(peer, tuple) else peer
+
+        self.connections[writer] = False
+        metrics.connection_opened()
+        try:
+            while not self.closing:
+                try:
+                    request = await self.read_request(reader)
+                except BadRequest as error:
+                    writer.write(self.build_response(*error_page(error.status, str(error)), keep_alive=False))
+                    break
+
+                if request is None:
+                    break
+
+                self.connections[writer] = True
+                started = time.perf_counter()
+                metrics.request_started()
+                try:
+                    method, path, version, headers, body = request
+                    keep_alive = is_keep_alive(version, headers) and not self.closing
+                    timer = metrics.timer()
+
+                    retry_after = rate_limiter.acquire(client)
+                    if retry_after:
+                        response = error_page(429, "Too many requests", [('Retry-After', retry_after)])
+                    elif method == 'POST' and len(body) > INLINE_BODY_SIZE:
+                        response = await asyncio.get_running_loop().run_in_executor(
+                            None, route_in_thread, method, path, body, headers, timer is not None,
+                        )
+                        # Запись в сокет замеряется от конца решения
+                        timer = metrics.timer()
+                    else:
+                        response = route(method, path, body, headers, timer)
+                    writer.write(self.build_response(*response, keep_alive=keep_alive))
+                    log_access(client, method, path, response[0], len(response[1]), started)
+                    # drain не ждёт, пока буфер записи не заполнен, так что ответы
+                    # на пачку конвейерных запросов уходят вместе
+                    await writer.drain()
+                    if timer is not None:
+                        timer.lap('write')
+                finally:
+                    metrics.request_finished()
+                self.connections[writer] = False
+
+                if not keep_alive:
+                    break
+
+        except ConnectionError:
+            pass
+        finally:
+            self.connections.pop(writer, None)
+            metrics.connection_closed()
+            writer.close()
+
+    async def reject(self, reader, writer):
+        """
+        Отвечает 503 соединению сверх max_connections и закрывает его.
+        """
+        try:
+            # Дочитываем запрос, чтобы клиент получил ответ, а не RST
+            await self.read_request(reader)
+        except BadRequest:
+            pass
+        try:
+            writer.write(self.build_response(
+                *error_page(503, "Server is busy", [('Retry-After', RETRY_AFTER)]), keep_alive=False,
+            ))
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def drain(self, timeout=10.0):
+        """
+        Закрывает простаивающие соединения и ждёт завершения начатых запросов.
+        """
+        self.closing = True
+        for writer, busy in list(self.connections.items()):
+            if not busy:
+                writer.close()
+
+        deadline = time.monotonic() + timeout
+        while self.connections and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+
+
+async def serve(host='localhost', port=8000, idle_timeout=5.0, backlog=128,
+                max_body_size=MAX_BODY_SIZE, max_connections=0, warmup_mode='background'):
+    """
+    Запускает сервер и обслуживает запросы до SIGTERM/SIGINT.
+
+    Прогрев в режиме background идёт в отдельном потоке и цикл событий не держит
+    """
+    handler = AsyncQuadraticServer(idle_timeout, max_body_size, max_connections)
+    server = await asyncio.start_server(
+        handler.handle_connection, host, port, backlog=backlog, limit=MAX_HEADER_SIZE,
+    )
+    start_warmup(warmup_mode)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, stop.set)
+
+    await stop.wait()
+
+    # Перестаём принимать соединения и дорабатываем начатые запросы
+    server.close()
+    await handler.drain()
+    await server.wait_closed()
+
+
+def run(host='localhost', port=8000, idle_timeout=5.0, backlog=128, max_body_size=MAX_BODY_SIZE, max_connections=0,
+        warmup_mode='background'):
+    if warmup_mode == 'eager':
+        start_warmup('eager')
+    print(f"Server: http://{host}:{port} (asyncio)")
+    asyncio.run(serve(host, port, idle_timeout, backlog, max_body_size, max_connections, warmup_mode))
+
+
+if __name__ == '__main__':
+    run()
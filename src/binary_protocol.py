@@ -0,0 +1,143 @@
+"""
+Компактный двоичный протокол для внутренних сервисов (application/x-calcserv).
+
+Запрос - подряд записанные тройки коэффициентов (a, b, c), каждая как три
+float64 little-endian (24 байта). Ответ - записи фиксированного размера
+(48 байт) в том же порядке:
+
+    вид решения    uint8 (KIND_* из quadratic.py) и 7 байт выравнивания
+    первый корень  float64 re, float64 im
+    второй корень  float64 re, float64 im
+    дискриминант   float64
+
+Неиспользуемые корни (вид NONE, ANY, второй корень у ONE) равны нулю.
+Запрос разбирается без копирования (np.frombuffer), ответ собирается одним
+структурированным массивом NumPy. Для клиентов на чистом Python есть
+encode_request и iter_records (memoryview и struct.iter_unpack).
+NumPy импортируется при первом разборе запроса.
+"""
+import functools
+import struct
+
+from quadratic import KIND_NONE, KIND_ANY, KIND_ONE, KIND_TWO
+
+
+CONTENT_TYPE = 'application/x-calcserv'
+
+REQUEST = struct.Struct('<3d')
+RECORD = struct.Struct('<B7x5d')
+
+
+@functools.cache
+def record_dtype():
+    """
+    Структурированный тип NumPy для записи ответа (RECORD).
+    """
+    import numpy as np
+
+    dtype = np.dtype([
+        ('kind', 'u1'),
+        ('padding', 'V7'),
+        ('roots', '<c16', (2,)),
+        ('discriminant', '<f8'),
+    ])
+    assert dtype.itemsize == RECORD.size
+    return dtype
+
+
+# Медиатипы в Accept, при которых клиент примет двоичный ответ
+_ACCEPTED = {CONTENT_TYPE, 'application/*', '*/*'}
+
+
+def media_type(header):
+    """
+    Медиатип из Content-Type без параметров, в нижнем регистре.
+    """
+    return (header or '').split(';', 1)[0].strip().lower()
+
+
+def accepts_binary(accept):
+    """
+    Допускает ли заголовок Accept двоичный ответ (нет заголовка - допускает).
+    """
+    if not accept:
+        return True
+    for item in accept.split(','):
+        media, _, params = item.partition(';')
+        if media.strip().lower() not in _ACCEPTED:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            return True
+    return False
+
+
+def decode_request(body):
+    """
+    Разбирает тело запроса без копирования.
+
+    Возвращает (a, b, c) - представления массивов float64 поверх body,
+    или None, если длина тела не кратна размеру тройки
+    """
+    import numpy as np
+
+    if len(body) % REQUEST.size:
+        return None
+    triples = np.frombuffer(body, dtype='<f8').reshape(-1, 3)
+    return triples[:, 0], triples[:, 1], triples[:, 2]
+
+
+def encode_arrays(kinds, roots, discriminants):
+    """
+    Упаковывает результат solve_quadratic_arrays в записи ответа.
+    """
+    import numpy as np
+
+    records = np.zeros(len(kinds), dtype=record_dtype())
+    records['kind'] = kinds
+    records['roots'] = roots
+    records['discriminant'] = discriminants
+    return records.tobytes()
+
+
+def encode_solutions(results):
+    """
+    Упаковывает список (корни, дискриминант) в формате solve_quadratic.
+    """
+    output = bytearray(RECORD.size * len(results))
+    for offset, (roots, discriminant) in zip(range(0, len(output), RECORD.size), results):
+        if roots == ["Любое число"]:
+            kind, values = KIND_ANY, (0.0, 0.0)
+        else:
+            kind = (KIND_NONE, KIND_ONE, KIND_TWO)[len(roots)]
+            values = (list(roots) + [0.0, 0.0])[:2]
+        first, second = (complex(value) for value in values)
+        RECORD.pack_into(
+            output, offset, kind,
+            first.real, first.imag, second.real, second.imag, float(discriminant),
+        )
+    return bytes(output)
+
+
+def encode_request(triples):
+    """
+    Упаковывает тройки (a, b, c) в тело запроса (для клиентов).
+    """
+    return b''.join(REQUEST.pack(*triple) for triple in triples)
+
+
+def iter_records(data):
+    """
+    Читает записи ответа без копирования (для клиентов).
+
+    Выдаёт (вид решения, первый корень, второй корень, дискриминант)
+    """
+    for kind, re1, im1, re2, im2, discriminant in RECORD.iter_unpack(memoryview(data)):
+        yield kind, complex(re1, im1), complex(re2, im2), discriminant
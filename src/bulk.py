@@ -0,0 +1,116 @@
+"""
+Потоковое решение уравнений из NDJSON файла или stdin.
+
+Каждая строка входа - запрос в формате parse_request, каждая строка выхода -
+ответ в формате create_response (в том же порядке). Строки обрабатываются
+кусками по chunk_size и решаются векторизованно, поэтому память не зависит
+от размера входа. Некорректная строка не останавливает обработку: вместо
+ответа для неё выводится error_response.
+
+Пример:
+    python src/bulk.py requests.ndjson > responses.ndjson
+    cat requests.ndjson | python src/bulk.py --chunk-size 10000
+"""
+import argparse
+import itertools
+import sys
+import time
+
+from quadratic import solve_quadratic_batch
+from json_parser import parse_request, error_response
+from response_encoder import encode_result
+
+
+INVALID_REQUEST = "Некорректный запрос"
+
+
+def solve_chunk(lines, precise=False, complex_format='string'):
+    """
+    Решает кусок строк-запросов.
+
+    precise - решать в режиме повышенной точности (solve_quadratic_precise)
+    complex_format - вид комплексных корней (см. response_encoder.py)
+
+    Возвращает список строк-ответов (без перевода строки) и число ошибок
+    """
+    responses = [None] * len(lines)
+    positions, a, b, c = [], [], [], []
+
+    for position, line in enumerate(lines):
+        try:
+            coefficients = parse_request(line)
+        except (OverflowError, ValueError):
+            # Огромное целое (float() от него бросает OverflowError) -
+            # ошибка этой строки, как в parse_request_list
+            coefficients = (None, None, None)
+        if coefficients[0] is None:
+            responses[position] = error_response(INVALID_REQUEST)
+        else:
+            positions.append(position)
+            a.append(coefficients[0])
+            b.append(coefficients[1])
+            c.append(coefficients[2])
+
+    for position, (roots, discriminant) in zip(positions, solve_quadratic_batch(a, b, c, precise)):
+        responses[position] = encode_result(roots, discriminant, complex_format=complex_format).decode('utf-8')
+
+    return responses, len(lines) - len(positions)
+
+
+def iter_solved_chunks(lines, chunk_size=4096, precise=False, complex_format='string'):
+    """
+    Решает поток строк-запросов кусками по chunk_size строк.
+
+    Пустые строки пропускаются. Для каждого куска выдаёт
+    (список строк-ответов, число ошибок)
+    """
+    lines = (line for line in lines if line.strip())
+
+    while True:
+        chunk = list(itertools.islice(lines, chunk_size))
+        if not chunk:
+            return
+        yield solve_chunk(chunk, precise, complex_format)
+
+
+def solve_stream(lines, output, chunk_size=4096, precise=False):
+    """
+    Решает поток строк-запросов и пишет ответы в output.
+
+    Возвращает (число обработанных строк, число ошибок)
+    """
+    total = errors = 0
+
+    for responses, chunk_errors in iter_solved_chunks(lines, chunk_size, precise):
+        output.write('\n'.join(responses) + '\n')
+        total += len(responses)
+        errors += chunk_errors
+
+    return total, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Решение квадратных уравнений из NDJSON")
+    parser.add_argument('input', nargs='?', default='-', help="файл с запросами (по умолчанию stdin)")
+    parser.add_argument('--chunk-size', type=int, default=4096, help="сколько строк решать за раз")
+    parser.add_argument('--precise', action='store_true',
+                        help="режим повышенной точности для плохо обусловленных уравнений")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+
+    # Читаем байты: parse_request разбирает их без декодирования
+    if args.input == '-':
+        total, errors = solve_stream(sys.stdin.buffer, sys.stdout, args.chunk_size, args.precise)
+    else:
+        with open(args.input, 'rb') as file:
+            total, errors = solve_stream(file, sys.stdout, args.chunk_size, args.precise)
+
+    sys.stdout.flush()
+    elapsed = time.perf_counter() - started
+    rate = total / elapsed if elapsed > 0 else 0.0
+    print(f"Обработано строк: {total}, ошибок: {errors}, {elapsed:.3f} с, {rate:.0f} строк/с", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
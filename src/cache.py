@@ -0,0 +1,243 @@
+"""
+Кэши для горячего пути сервера.
+
+Трафик сильно повторяется: калькулятор и интеграции присылают одни и те же
+небольшие целые коэффициенты. Здесь два кэша:
+
+- SolutionCache - результаты solve_quadratic, ограничен числом записей.
+  Уравнения, отличающиеся множителем - степенью двойки, например (4, -20, 24)
+  и (1, -5, 6), попадают в одну запись: такое умножение во float точное,
+  и solve_quadratic даёт для них одни и те же корни до бита. Дискриминант
+  считается для каждой тройки отдельно.
+- ResponseCache - готовые байты ответа (заголовки и тело) для тройки (a, b, c),
+  ограничен бюджетом памяти в байтах.
+
+Оба вытесняют давно не использованные записи (LRU) и считают попадания,
+промахи и вытеснения.
+"""
+import math
+import struct
+import sys
+import threading
+from collections import OrderedDict
+
+from quadratic import solve_quadratic
+
+
+# Целые числа до 2**53 представимы во float точно
+MAX_EXACT_INTEGER = 2**53
+
+# Примерные накладные расходы на запись OrderedDict (узел списка и слот словаря)
+ENTRY_OVERHEAD = 100
+
+_pack_key = struct.Struct('<3d').pack
+
+
+def coefficients_key(a, b, c):
+    """
+    Точный ключ тройки коэффициентов - их битовое представление.
+
+    В отличие от кортежа float, различает 0.0 и -0.0 (от знака нуля зависит
+    знак корня) и совпадает для одинаковых NaN.
+    """
+    return _pack_key(a, b, c)
+
+
+def normalize_coefficients(a, b, c):
+    """
+    Приводит тройки, отличающиеся множителем 2**k, к общему виду.
+
+    Целые коэффициенты делятся на наибольшую степень двойки, на которую
+    делятся все три (знак сохраняется, чтобы не менялся порядок корней).
+    На другие общие множители не делим: корни (3, 15, 18) и (1, 5, 6)
+    совпадают математически, но не до последнего бита. Остальные тройки
+    используются как есть.
+
+    Возвращает (a, b, c) - нормализованную тройку
+    """
+    a, b, c = float(a), float(b), float(c)
+
+    if not all(x.is_integer() and abs(x) < MAX_EXACT_INTEGER for x in (a, b, c)):
+        return a, b, c
+
+    divisor = math.gcd(int(a), int(b), int(c))
+    # Младший бит НОД - наибольшая общая степень двойки
+    divisor &= -divisor
+    if divisor <= 1:
+        return a, b, c
+    return a / divisor, b / divisor, c / divisor
+
+
+def discriminant_of(a, b, c):
+    """
+    Дискриминант в том же виде, что возвращает solve_quadratic.
+    """
+    if a == 0:
+        return 0.0
+    return float(b**2 - 4*a*c)
+
+
+class LRUCache:
+    """
+    Потокобезопасный LRU кэш с ограничением суммарного веса записей.
+
+    max_weight - предел суммы весов, 0 отключает кэш.
+    Вес записи задаёт weigh(), по умолчанию 1 (предел числа записей).
+    """
+
+    def __init__(self, max_weight):
+        self.max_weight = max_weight
+        self.entries = OrderedDict()
+        self.weight = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def weigh(self, key, value):
+        return 1
+
+    def get(self, key):
+        """
+        Возвращает значение или None (промах).
+        """
+        with self.lock:
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.entries.move_to_end(key)
+                self.hits += 1
+            return value
+
+    def put(self, key, value):
+        weight = self.weigh(key, value)
+        with self.lock:
+            if weight > self.max_weight:
+                return
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.weight -= self.weigh(key, previous)
+            self.entries[key] = value
+            self.weight += weight
+            self.evict(self.max_weight)
+
+    def evict(self, max_weight):
+        # Вызывается под self.lock
+        while self.entries and self.weight > max_weight:
+            key, value = self.entries.popitem(last=False)
+            self.weight -= self.weigh(key, value)
+            self.evictions += 1
+
+    def resize(self, max_weight):
+        """
+        Меняет предел кэша, лишние записи вытесняются сразу.
+        """
+        with self.lock:
+            self.max_weight = max_weight
+            self.evict(max(max_weight, 0))
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.weight = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        Статистика кэша: размер, попадания, промахи и вытеснения.
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class SolutionCache(LRUCache):
+    """
+    Кэш решений solve_quadratic.
+
+    maxsize - максимальное число записей, 0 отключает кэш
+    solver - функция решения, discriminant - функция дискриминанта
+    (для уравнения, которое попало в кэш через нормализованную тройку)
+    store - постоянное хранилище (store.py), куда уходят промахи кэша
+    table - таблица решений небольших целых троек (lookup.py), в неё
+    смотрим раньше кэша
+    """
+
+    def __init__(self, maxsize=4096, solver=solve_quadratic, discriminant=None, store=None, table=None):
+        super().__init__(maxsize)
+        self.solver = solver
+        self.discriminant = discriminant or discriminant_of
+        self.store = store
+        self.table = table
+
+    @property
+    def maxsize(self):
+        return self.max_weight
+
+    def solve(self, a, b, c):
+        """
+        Решает уравнение, используя кэш.
+
+        Возвращает (корни, дискриминант), как solve_quadratic
+        """
+        if self.table is not None:
+            roots = self.table.lookup(a, b, c)
+            if roots is not None:
+                return roots, self.discriminant(a, b, c)
+
+        if self.max_weight <= 0:
+            return self.solver(a, b, c)
+
+        normalized = normalize_coefficients(a, b, c)
+        key = coefficients_key(*normalized)
+
+        roots = self.get(key)
+        if roots is None:
+            if self.store is not None:
+                roots = self.store.get(key)
+            if roots is None:
+                # Для нормализованной тройки корни те же, что для исходной
+                roots, _ = self.solver(*normalized)
+                if self.store is not None:
+                    self.store.put(key, roots)
+            self.put(key, roots)
+
+        return list(roots), self.discriminant(a, b, c)
+
+    def stats(self):
+        stats = super().stats()
+        stats["maxsize"] = self.max_weight
+        return stats
+
+
+class ResponseCache(LRUCache):
+    """
+    Кэш готовых байтов ответа по тройке (a, b, c).
+
+    max_bytes - бюджет памяти в байтах (с учётом ключей и накладных
+    расходов на запись), 0 отключает кэш
+    """
+
+    def __init__(self, max_bytes=16 * 1024 * 1024):
+        super().__init__(max_bytes)
+
+    def weigh(self, key, value):
+        return sys.getsizeof(key) + sys.getsizeof(value) + ENTRY_OVERHEAD
+
+    def get(self, key):
+        if self.max_weight <= 0:
+            return None
+        return super().get(key)
+
+    def stats(self):
+        stats = super().stats()
+        stats["bytes"] = self.weight
+        stats["max_bytes"] = self.max_weight
+        return stats
@@ -0,0 +1,111 @@
+"""
+Объединение одинаковых одновременных запросов (single-flight).
+
+Всплеск одинаковых запросов (пример из учебника, который решает весь класс)
+приходит раньше, чем первый из них попадёт в кэш ответов, и каждый поток
+решал и сериализовал бы уравнение сам. SingleFlight пропускает к вычислению
+только первый запрос с данным ключом (ведущий), а остальные ждут его
+результат и получают те же байты ответа.
+
+    response, shared = coalescer.do(key, compute)
+
+В асинхронном сервере короткие запросы обрабатываются в цикле событий по
+очереди и друг с другом не пересекаются. Запросы с телом больше
+INLINE_BODY_SIZE (async_server.py) считаются в потоках исполнителя, и
+одинаковые из них объединяются так же, как в многопоточном сервере.
+"""
+import threading
+
+
+class _Call:
+    """
+    Вычисление в процессе: результат или исключение ведущего.
+
+    Ведущий держит done, пока считает; ожидающие ждут на нём. Голый Lock
+    на порядок дешевле Event, а платит за него каждый запрос.
+    """
+
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Lock()
+        self.done.acquire()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Не более одного одновременного вычисления на ключ.
+
+    enabled - False отключает объединение: do() просто вызывает функцию
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.calls = {}
+        self.lock = threading.Lock()
+        self.leaders = 0
+        self.shared = 0
+        self.errors = 0
+
+    def do(self, key, function):
+        """
+        Вызывает function() или ждёт результат того же вызова из другого потока.
+
+        Возвращает (результат, shared), где shared - результат получен от
+        другого запроса. Исключение ведущего получают и ожидающие.
+        """
+        if not self.enabled:
+            return function(), False
+
+        with self.lock:
+            call = self.calls.get(key)
+            if call is None:
+                call = self.calls[key] = _Call()
+                self.leaders += 1
+                leader = True
+            else:
+                self.shared += 1
+                leader = False
+
+        if not leader:
+            with call.done:
+                pass
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        try:
+            call.value = function()
+        except BaseException as error:
+            call.error = error
+            with self.lock:
+                self.errors += 1
+            raise
+        finally:
+            # Новые запросы с этим ключом после этого пойдут уже в кэш ответов
+            with self.lock:
+                del self.calls[key]
+            call.done.release()
+        return call.value, False
+
+    def clear(self):
+        with self.lock:
+            self.leaders = self.shared = self.errors = 0
+
+    def stats(self):
+        """
+        Статистика: вычисления (leaders), запросы, получившие чужой результат
+        (shared), их доля и число вычислений в процессе.
+        """
+        with self.lock:
+            requests = self.leaders + self.shared
+            return {
+                "enabled": self.enabled,
+                "leaders": self.leaders,
+                "shared": self.shared,
+                "errors": self.errors,
+                "in_flight": len(self.calls),
+                "share_rate": self.shared / requests if requests else 0.0,
+            }
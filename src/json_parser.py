@@ -7,13 +7,100 @@
 """
 import json
 import logging
+import re
+import threading
+import time
 
 
-# Настройка логирования
-logging.basicConfig(level=logging.WARNING)
+# Обработчики настраивает приложение (structured_log.setup_logging), не модуль
 logger = logging.getLogger(__name__)
 
 
+class LogRateLimiter:
+    """
+    Ограничивает частоту сообщений об ошибках: не больше rate сообщений
+    в секунду на категорию (token bucket с запасом burst).
+
+    Поток некорректных запросов не превращается в поток записей в лог:
+    лишние сообщения отбрасываются до форматирования, а их число
+    дописывается к следующему пропущенному сообщению.
+    """
+
+    def __init__(self, rate=5.0, burst=20):
+        self.rate = rate
+        self.burst = burst
+        self.lock = threading.Lock()
+        # категория -> [токены, время последнего пополнения, пропущено сообщений]
+        self.buckets = {}
+
+    def __call__(self, level, category, message, *args):
+        with self.lock:
+            now = time.monotonic()
+            bucket = self.buckets.get(category)
+            if bucket is None:
+                bucket = self.buckets[category] = [self.burst, now, 0]
+
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens < 1:
+                bucket[0] = tokens
+                bucket[2] += 1
+                return
+
+            bucket[0] = tokens - 1
+            suppressed, bucket[2] = bucket[2], 0
+
+        if not logger.isEnabledFor(level):
+            return
+        if suppressed:
+            message += " (пропущено похожих сообщений: %d)"
+            args += (suppressed,)
+        logger.log(level, message, *args)
+
+
+log_error = LogRateLimiter()
+
+
+# Быстрый разбор канонического запроса {"params": {"a": .., "b": .., "c": ..}}
+# без json.loads. Всё остальное (другой порядок ключей, строки, лишние поля,
+# ошибки) разбирается обычным путём, поэтому результат не отличается.
+_WS = r'[ \t\n\r]*'
+_NUMBER = r'(-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?)'
+_CANONICAL_REQUEST = (
+    _WS + r'\{' + _WS + r'"params"' + _WS + ':' + _WS + r'\{'
+    + _WS + r'"a"' + _WS + ':' + _WS + _NUMBER + _WS + ','
+    + _WS + r'"b"' + _WS + ':' + _WS + _NUMBER + _WS + ','
+    + _WS + r'"c"' + _WS + ':' + _WS + _NUMBER + _WS
+    + r'\}' + _WS + r'\}' + _WS
+)
+_CANONICAL_STR = re.compile(_CANONICAL_REQUEST)
+_CANONICAL_BYTES = re.compile(_CANONICAL_REQUEST.encode('ascii'))
+
+# Длиннее не разбираем быстро: json превращает огромные целые в int,
+# и float() от них бросает OverflowError, а не даёт inf
+_MAX_FAST_NUMBER = 300
+
+
+def _parse_canonical(json_string):
+    """
+    Быстрый путь parse_request для канонической формы запроса.
+
+    Возвращает (a, b, c) или None, если нужен полный разбор
+    """
+    pattern = _CANONICAL_BYTES if isinstance(json_string, (bytes, bytearray)) else _CANONICAL_STR
+    match = pattern.fullmatch(json_string)
+    if match is None:
+        return None
+
+    coefficients = []
+    for token in match.groups():
+        if len(token) > _MAX_FAST_NUMBER:
+            return None
+        # json читает "-0" как целое 0, то есть 0.0, а float("-0") даёт -0.0
+        coefficients.append(0.0 if token in ('-0', b'-0') else float(token))
+    return tuple(coefficients)
+
+
 def parse_request(json_string):
     """
     Парсит запрос из json от клиента.
@@ -27,30 +114,66 @@ def parse_request(json_string):
         }
     }
     
+    Принимает строку или байты (тело запроса в UTF-8).
+
     Возвращает:
         (a, b, c) или (None, None, None) при ошибке
     """
+    # Канонический запрос разбираем без json.loads
+    coefficients = _parse_canonical(json_string)
+    if coefficients is not None:
+        return coefficients
+
     try:
+        if isinstance(json_string, (bytes, bytearray)):
+            json_string = json_string.decode('utf-8')
+
         # Парсим весь json
         data = json.loads(json_string)
 
-    except json.JSONDecodeError as err:
+    except (json.JSONDecodeError, UnicodeDecodeError) as err:
         # Логируем ошибку парсинга JSON
-        logger.warning(f"Ошибка парсинга JSON: {err}")
+        log_error(logging.WARNING, "json", "Ошибка парсинга JSON: %s", err)
         return None, None, None
     
     except Exception as err:
         # Ловим любые другие неожиданные ошибки
-        logger.error(f"Неожиданная ошибка при парсинге JSON: {err}")
+        log_error(logging.ERROR, "unexpected", "Неожиданная ошибка при парсинге JSON: %s", err)
         return None, None, None
-    
 
-    if "params" not in data:
-        logger.warning("Отсутствует ключ 'params' в JSON запросе")
+    try:
+        return request_coefficients(data)
+
+    except InvalidRequest as err:
+        log_error(logging.WARNING, err.category, "%s", err)
         return None, None, None
-        
+
+
+class InvalidRequest(ValueError):
+    """
+    Запрос разобран, но не содержит корректных коэффициентов.
+
+    category - категория ошибки для log_error
+    """
+
+    def __init__(self, category, message):
+        super().__init__(message)
+        self.category = category
+
+
+def request_coefficients(data):
+    """
+    Коэффициенты из уже разобранного запроса {"params": {"a": .., "b": .., "c": ..}}.
+
+    Возвращает (a, b, c), бросает InvalidRequest, если запрос некорректный
+    """
+    if not isinstance(data, dict) or "params" not in data:
+        raise InvalidRequest("params", "Отсутствует ключ 'params' в JSON запросе")
+
     # Извлекаем только коэффиценты
     params = data["params"]
+    if not isinstance(params, dict):
+        raise InvalidRequest("type", "Ключ 'params' должен быть объектом")
 
     # Проверяем наличие всех необходимых коэффициентов
     missing_coefficients = []
@@ -60,43 +183,29 @@ def parse_request(json_string):
         missing_coefficients.append("b")
     if "c" not in params:
         missing_coefficients.append("c")
-    
+
     if missing_coefficients:
-        logger.warning(f"Отсутствуют коэффициенты: {', '.join(missing_coefficients)}")
-        return None, None, None
+        raise InvalidRequest("missing", f"Отсутствуют коэффициенты: {', '.join(missing_coefficients)}")
 
-    try:    
+    try:
         # Превращаем в числа
-        a = float(params["a"])
-        b = float(params["b"])
-        c = float(params["c"])
+        return float(params["a"]), float(params["b"]), float(params["c"])
 
-        return a, b, c
-    
     except ValueError as err:
         # Если коэффициенты не являются числами
-        logger.warning(f"Коэффициенты не являются числами: {err}")
-        return None, None, None
-        
+        raise InvalidRequest("value", f"Коэффициенты не являются числами: {err}") from None
+
     except TypeError as err:
         # Если тип данных неправильный (например, None)
-        logger.warning(f"Неправильный тип данных коэффициентов: {err}")
-        return None, None, None
+        raise InvalidRequest("type", f"Неправильный тип данных коэффициентов: {err}") from None
 
 
-def create_response(roots, discriminant, error = None):
+def build_response(roots, discriminant, error = None, complex_format = 'string'):
     """
-    Парсит ответ в json для клиента.
+    Собирает структуру ответа (словарь) для create_response.
 
-    Пример ответа:
-    {
-        "result": {
-            "roots": [корень1, корень2] или [],
-            "discriminant": число,
-            "message": "успех или описание"
-        },
-        "error": null или "текст ошибки"
-    }
+    complex_format - 'string' (комплексный корень - str(root)) или 'object'
+    ({"re": .., "im": ..}, см. response_encoder.py)
     """
     # Автоматически определяем сообщение на основе результатов
     if roots == ["Любое число"]:
@@ -105,13 +214,18 @@ def create_response(roots, discriminant, error = None):
         message = "Успех! Нет действительных корней"
     elif len(roots) == 1:
         message = "Успех! Один корень"
-    else:  # len(roots) == 2
+    elif len(roots) == 2:
         message = "Успех! Два корня"
+    else:
+        # Уравнения высших степеней (polynomial.py)
+        message = f"Успех! Корней: {len(roots)}"
 
     # Преобразуем комплексные числа в строки, чтобы не было ошибки TypeError
     json_safe_roots = []
     for root in roots:
-        if isinstance(root, complex):
+        if isinstance(root, complex) and complex_format == 'object':
+            json_safe_roots.append({"re": root.real, "im": root.imag})
+        elif isinstance(root, complex):
             # Комплексное число -> строка
             # Используем стандартное строковое представление
             json_safe_roots.append(str(root))
@@ -120,7 +234,7 @@ def create_response(roots, discriminant, error = None):
             json_safe_roots.append(root)
 
     # Собираем структуру ответа
-    response_data = {
+    return {
         "result": {
             "roots": json_safe_roots,
             "discriminant": discriminant,
@@ -129,6 +243,23 @@ def create_response(roots, discriminant, error = None):
         "error": error
     }
 
+
+def create_response(roots, discriminant, error = None):
+    """
+    Парсит ответ в json для клиента.
+
+    Пример ответа:
+    {
+        "result": {
+            "roots": [корень1, корень2] или [],
+            "discriminant": число,
+            "message": "успех или описание"
+        },
+        "error": null или "текст ошибки"
+    }
+    """
+    response_data = build_response(roots, discriminant, error)
+
     try:
         # Преобразуем в JSON строку
         return json.dumps(response_data, ensure_ascii=False)
@@ -146,15 +277,254 @@ def create_response(roots, discriminant, error = None):
         return error_response("Критическая ошибка")
 
 
-def error_response(error_msg):
+def parse_batch_request(json_string):
     """
-    Создает простой ответ об ошибке.
+    Парсит пакетный запрос из json от клиента.
+
+    Пример запроса:
+    {
+        "params": {
+            "a": [1, 2],
+            "b": [-5, 4],
+            "c": [6, 2]
+        }
+    }
+
+    Возвращает:
+        (список a, список b, список c) или (None, None, None) при ошибке
     """
-    return json.dumps({
+    try:
+        if isinstance(json_string, (bytes, bytearray)):
+            json_string = json_string.decode('utf-8')
+
+        data = json.loads(json_string)
+
+    except (json.JSONDecodeError, UnicodeDecodeError) as err:
+        log_error(logging.WARNING, "json", "Ошибка парсинга JSON: %s", err)
+        return None, None, None
+
+    except Exception as err:
+        log_error(logging.ERROR, "unexpected", "Неожиданная ошибка при парсинге JSON: %s", err)
+        return None, None, None
+
+    if not isinstance(data, dict) or not isinstance(data.get("params"), dict):
+        log_error(logging.WARNING, "params", "Отсутствует ключ 'params' в JSON запросе")
+        return None, None, None
+
+    params = data["params"]
+
+    missing_coefficients = [name for name in ("a", "b", "c") if name not in params]
+    if missing_coefficients:
+        log_error(logging.WARNING, "missing", "Отсутствуют коэффициенты: %s", ', '.join(missing_coefficients))
+        return None, None, None
+
+    if not all(isinstance(params[name], list) for name in ("a", "b", "c")):
+        log_error(logging.WARNING, "batch", "Коэффициенты пакетного запроса должны быть списками")
+        return None, None, None
+
+    if not len(params["a"]) == len(params["b"]) == len(params["c"]):
+        log_error(logging.WARNING, "batch", "Списки коэффициентов разной длины")
+        return None, None, None
+
+    try:
+        # Превращаем в числа так же, как parse_request
+        a = [float(value) for value in params["a"]]
+        b = [float(value) for value in params["b"]]
+        c = [float(value) for value in params["c"]]
+
+        return a, b, c
+
+    except (ValueError, OverflowError) as err:
+        # OverflowError - огромное целое, как в parse_request_list
+        log_error(logging.WARNING, "value", "Коэффициенты не являются числами: %s", err)
+        return None, None, None
+
+    except TypeError as err:
+        log_error(logging.WARNING, "type", "Неправильный тип данных коэффициентов: %s", err)
+        return None, None, None
+
+
+def _list(value):
+    if not isinstance(value, list):
+        raise TypeError(f"ожидается список, получено {type(value).__name__}")
+    return value
+
+
+def _floats(values):
+    """
+    Список чисел из json -> список float (TypeError, если это не список).
+    """
+    return [float(value) for value in _list(values)]
+
+
+def parse_request_list(json_string):
+    """
+    Парсит список обычных запросов.
+
+    Пример запроса:
+    [
+        {"params": {"a": 1, "b": -5, "c": 6}},
+        {"params": {"a": 1, "b": 2}}
+    ]
+
+    Возвращает список, где для каждого запроса - (a, b, c) или InvalidRequest
+    с текстом ошибки, или None, если тело - не список JSON
+    """
+    try:
+        if isinstance(json_string, (bytes, bytearray)):
+            json_string = json_string.decode('utf-8')
+
+        data = json.loads(json_string)
+
+    except (json.JSONDecodeError, UnicodeDecodeError) as err:
+        log_error(logging.WARNING, "json", "Ошибка парсинга JSON: %s", err)
+        return None
+
+    except Exception as err:
+        log_error(logging.ERROR, "unexpected", "Неожиданная ошибка при парсинге JSON: %s", err)
+        return None
+
+    if not isinstance(data, list):
+        log_error(logging.WARNING, "list", "Ожидался список запросов")
+        return None
+
+    items = []
+    for item in data:
+        try:
+            items.append(request_coefficients(item))
+        except InvalidRequest as err:
+            # Ошибка уходит клиенту в ответе на этот запрос, в лог не пишем
+            items.append(err)
+        except OverflowError as err:
+            # Огромное целое: parse_request здесь бросает, а в списке это ошибка одного запроса
+            items.append(InvalidRequest("value", f"Коэффициенты не являются числами: {err}"))
+    return items
+
+
+def parse_equation_request(json_string, names, batch=False, vector=False):
+    """
+    Парсит запрос для уравнения любого вида (solvers.py).
+
+    names - имена коэффициентов в params, например ("a", "b", "c", "d").
+    batch - у каждого коэффициента список значений (по одному на уравнение).
+    vector - коэффициент сам по себе список (многочлен):
+        {"params": {"coefficients": [1, 0, -1]}}
+        {"params": {"coefficients": [[1, 0, -1], [1, -3, 2]]}}  (batch)
+
+    Возвращает список столбцов (по одному на имя) или None при ошибке
+    """
+    try:
+        if isinstance(json_string, (bytes, bytearray)):
+            json_string = json_string.decode('utf-8')
+
+        data = json.loads(json_string)
+
+    except (json.JSONDecodeError, UnicodeDecodeError) as err:
+        log_error(logging.WARNING, "json", "Ошибка парсинга JSON: %s", err)
+        return None
+
+    except Exception as err:
+        log_error(logging.ERROR, "unexpected", "Неожиданная ошибка при парсинге JSON: %s", err)
+        return None
+
+    if not isinstance(data, dict) or not isinstance(data.get("params"), dict):
+        log_error(logging.WARNING, "params", "Отсутствует ключ 'params' в JSON запросе")
+        return None
+
+    params = data["params"]
+
+    missing_coefficients = [name for name in names if name not in params]
+    if missing_coefficients:
+        log_error(logging.WARNING, "missing", "Отсутствуют коэффициенты: %s", ', '.join(missing_coefficients))
+        return None
+
+    try:
+        if batch and vector:
+            columns = [[_floats(row) for row in _list(params[name])] for name in names]
+        elif batch or vector:
+            columns = [_floats(params[name]) for name in names]
+        else:
+            columns = [float(params[name]) for name in names]
+
+    except (ValueError, OverflowError) as err:
+        # OverflowError - огромное целое, как в parse_request_list
+        log_error(logging.WARNING, "value", "Коэффициенты не являются числами: %s", err)
+        return None
+
+    except TypeError as err:
+        log_error(logging.WARNING, "type", "Неправильный тип данных коэффициентов: %s", err)
+        return None
+
+    if batch and len({len(column) for column in columns}) > 1:
+        log_error(logging.WARNING, "batch", "Списки коэффициентов разной длины")
+        return None
+
+    return columns
+
+
+def create_batch_response(results):
+    """
+    Парсит пакетный ответ в json для клиента.
+
+    results - список кортежей (корни, дискриминант), как из solve_quadratic_batch.
+    Ответ - список объектов в формате create_response.
+    """
+    try:
+        return json.dumps(
+            [build_response(roots, discriminant) for roots, discriminant in results],
+            ensure_ascii=False,
+        )
+
+    except (TypeError, ValueError) as err:
+        logger.error(f"{type(err).__name__}: {err}")
+        return error_response(f"Ошибка сериализации: {err}")
+
+
+def create_list_response(results):
+    """
+    Ответ на список запросов (parse_request_list) в json для клиента.
+
+    results - для каждого запроса (корни, дискриминант) или ошибка
+    (InvalidRequest или текст). Ответ - список объектов в формате
+    create_response, у ошибочных запросов - в формате error_response.
+    Один и тот же объект результата (повторяющиеся запросы) собирается один раз.
+    """
+    built = {}
+    entries = []
+    for result in results:
+        entry = built.get(id(result))
+        if entry is None:
+            if isinstance(result, tuple):
+                entry = build_response(*result)
+            else:
+                entry = build_error(str(result))
+            built[id(result)] = entry
+        entries.append(entry)
+
+    try:
+        return json.dumps(entries, ensure_ascii=False)
+
+    except (TypeError, ValueError) as err:
+        logger.error(f"{type(err).__name__}: {err}")
+        return error_response(f"Ошибка сериализации: {err}")
+
+
+def build_error(error_msg):
+    """
+    Собирает структуру ответа об ошибке (словарь) для error_response.
+    """
+    return {
         "result": {
             "roots": [],
             "discriminant": 0.0,
             "message": "Ошибка"
         },
         "error": error_msg
-    }, ensure_ascii=False)
\ No newline at end of file
+    }
+
+
+def error_response(error_msg):
+    """
+    Создает простой ответ об ошибке.
+    """
+    return json.dumps(build_error(error_msg), ensure_ascii=False)
\ No newline at end of file
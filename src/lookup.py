@@ -0,0 +1,212 @@
+"""
+Таблица готовых решений для небольших целых коэффициентов.
+
+Калькулятор (ui/script.js) присылает в основном небольшие целые числа,
+набранные по цифрам. Для всех троек (a, b, c) с |a|, |b|, |c| <= limit
+решения считаются заранее, одним проходом solve_quadratic_arrays, и
+решение такой тройки - это вычисление индекса и чтение трёх чисел.
+
+Таблица - массив float64 формы (n, 3): первый и второй корень
+(действительные части) и мнимая часть первого корня (у второго она
+противоположна). Вид решения не хранится: он однозначно следует из целых
+коэффициентов (a = b = 0, a = 0 или b² = 4ac). Так на тройку уходит
+24 байта: при limit = 50 это 24 МиБ, при limit = 100 - 186 МиБ.
+
+Решения считаются для самой тройки (без сокращения на общий множитель) и
+совпадают с solve_quadratic(a, b, c) до бита. Таблицу можно сохранить в
+файл .npy; при загрузке файл отображается в память, и процессы prefork
+делят одни и те же страницы:
+
+    python src/lookup.py build --limit 100 table.npy
+"""
+import argparse
+import math
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+from quadratic import solve_quadratic_arrays, KIND_ONE
+
+ANY_NUMBER = "Любое число"
+
+DEFAULT_LIMIT = 50
+
+
+def _solve_slice(a, limit):
+    """
+    Значения таблицы для всех (b, c) при фиксированном a.
+    """
+    values = np.arange(-limit, limit + 1, dtype=np.int64)
+    b, c = (grid.ravel() for grid in np.meshgrid(values, values, indexing='ij'))
+    a = np.full_like(b, a)
+
+    # Без сокращения на НОД: корни (3, 15, 18) и (1, 5, 6) расходятся
+    # в последнем бите, а таблица должна совпадать с solve_quadratic
+    kinds, roots, _ = solve_quadratic_arrays(a.astype(float), b.astype(float), c.astype(float))
+
+    table = np.empty((len(b), 3))
+    table[:, 0] = roots.real[:, 0]
+    table[:, 1] = np.where(kinds == KIND_ONE, 0.0, roots.real[:, 1])
+    table[:, 2] = roots.imag[:, 0]
+    return table
+
+
+def _as_integers(*coefficients):
+    """
+    Коэффициенты как int или (None, None, None), если среди них есть
+    дробное, бесконечное или NaN значение, или -0.0 (от знака нуля
+    зависят знак и порядок корней).
+    """
+    integers = []
+    for x in coefficients:
+        try:
+            integer = int(x)
+        except (ValueError, OverflowError, TypeError):
+            return None, None, None
+        if integer != x or (integer == 0 and math.copysign(1.0, x) < 0):
+            return None, None, None
+        integers.append(integer)
+    return integers
+
+
+class LookupTable:
+    """
+    Решения всех целых троек с коэффициентами от -limit до limit.
+
+    values - готовый массив (n, 3), например загруженный из файла;
+    без него таблица строится заново
+    """
+
+    def __init__(self, limit=DEFAULT_LIMIT, values=None):
+        self.limit = limit
+        self.width = 2 * limit + 1
+        # Таблица общая для потоков сервера: счётчики меняются под lock
+        self.lock = threading.Lock()
+        self.hits = self.misses = 0
+
+        started = time.perf_counter()
+        if values is None:
+            values = np.empty((self.width ** 3, 3))
+            rows = self.width ** 2
+            for index, a in enumerate(range(-limit, limit + 1)):
+                values[index * rows:(index + 1) * rows] = _solve_slice(a, limit)
+        elif values.shape != (self.width ** 3, 3):
+            raise ValueError(f"Table shape {values.shape} does not match limit {limit}")
+        self.build_seconds = time.perf_counter() - started
+
+        self.values = values
+        # memoryview отдаёт элементы сразу как float, без скаляров NumPy
+        self.flat = memoryview(values).cast('B').cast('d')
+
+    @classmethod
+    def load(cls, path):
+        """
+        Загружает таблицу из .npy, отображая файл в память.
+        """
+        values = np.load(path, mmap_mode='r')
+        width = round(len(values) ** (1 / 3))
+        if width ** 3 != len(values) or width % 2 == 0:
+            raise ValueError(f"{path} is not a lookup table")
+        return cls(width // 2, values)
+
+    def save(self, path):
+        # Через файловый объект, чтобы np.save не добавлял к имени .npy
+        with open(path, 'wb') as file:
+            np.save(file, np.asarray(self.values))
+
+    def lookup(self, a, b, c):
+        """
+        Корни в формате solve_quadratic или None, если тройки нет в таблице
+        (не целые коэффициенты, вне диапазона, -0.0).
+        """
+        # json отдаёт целые коэффициенты как int - это быстрый путь
+        if not (type(a) is int and type(b) is int and type(c) is int):
+            a, b, c = _as_integers(a, b, c)
+            if a is None:
+                with self.lock:
+                    self.misses += 1
+                return None
+
+        limit = self.limit
+        if not (-limit <= a <= limit and -limit <= b <= limit and -limit <= c <= limit):
+            with self.lock:
+                self.misses += 1
+            return None
+
+        with self.lock:
+            self.hits += 1
+        flat = self.flat
+        index = 3 * (((a + limit) * self.width + b + limit) * self.width + c + limit)
+        if a == 0:
+            if b == 0:
+                return [ANY_NUMBER] if c == 0 else []
+            return [flat[index]]
+        if b * b == 4 * a * c:
+            return [flat[index]]
+
+        imag = flat[index + 2]
+        if imag == 0:
+            return [flat[index], flat[index + 1]]
+        return [complex(flat[index], imag), complex(flat[index + 1], -imag)]
+
+    def stats(self):
+        with self.lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "limit": self.limit,
+            "size": self.width ** 3,
+            "bytes": self.values.nbytes,
+            "build_seconds": self.build_seconds,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+
+def open_table(limit=DEFAULT_LIMIT, path=None):
+    """
+    Загружает таблицу из path, а если файла нет - строит и сохраняет в path.
+    """
+    if path and os.path.exists(path):
+        return LookupTable.load(path)
+    table = LookupTable(limit)
+    if path:
+        table.save(path)
+    return table
+
+
+def describe(table):
+    """
+    Строка о размере таблицы для вывода при запуске.
+    """
+    return (f"Таблица решений ±{table.limit}: {table.width ** 3} троек, "
+            f"{table.values.nbytes / 2**20:.1f} МиБ, {table.build_seconds:.2f} с")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Таблица решений для целых коэффициентов CalcServ")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = commands.add_parser('build', help="построить таблицу и сохранить в .npy")
+    build_parser.add_argument('path', help="файл таблицы")
+    build_parser.add_argument('--limit', type=int, default=DEFAULT_LIMIT,
+                              help="наибольший модуль коэффициента")
+
+    stats_parser = commands.add_parser('stats', help="показать размер таблицы")
+    stats_parser.add_argument('path', help="файл таблицы")
+
+    args = parser.parse_args(argv)
+    if args.command == 'build':
+        table = LookupTable(args.limit)
+        table.save(args.path)
+    else:
+        table = LookupTable.load(args.path)
+    print(describe(table), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+"""
+Метрики сервера в текстовом формате Prometheus (GET /metrics).
+
+Каждый поток пишет в свой набор счётчиков (Shard), поэтому на горячем пути
+нет блокировок: общий lock берётся только при первом обращении потока и при
+выдаче метрик, когда наборы всех потоков складываются.
+
+Считаются:
+- ответы по кодам статуса;
+- запросы в обработке и открытые соединения (gauge);
+- гистограммы времени этапов запроса (чтение тела, parse_request,
+  solve_quadratic, create_response, запись в сокет). Таймеры этапов
+  включаются флагом timing; когда он выключен, timer() возвращает None
+  и этапы не замеряются вовсе. Этап coalesce - ожидание результата
+  одинакового запроса из другого потока (coalesce.py).
+"""
+import threading
+from bisect import bisect_left
+from time import perf_counter
+
+
+# Границы корзин гистограммы времени этапов, в секундах
+LATENCY_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+)
+
+# Этапы обработки запроса (порядок вывода в /metrics)
+STAGES = ('read', 'parse', 'coalesce', 'solve', 'serialize', 'write')
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Shard:
+    """
+    Счётчики одного потока.
+
+    stages: этап -> [счётчики по корзинам (последняя - +Inf), сумма]
+    """
+
+    __slots__ = ('buckets', 'stages', 'statuses', 'in_flight', 'connections')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.stages = {}
+        self.statuses = {}
+        self.in_flight = 0
+        self.connections = 0
+
+    def observe(self, stage, seconds):
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            histogram = self.stages[stage] = [[0] * (len(self.buckets) + 1), 0.0]
+        histogram[0][bisect_left(self.buckets, seconds)] += 1
+        histogram[1] += seconds
+
+
+class StageTimer:
+    """
+    Замер этапов одного запроса: lap() записывает время с предыдущей отметки.
+    """
+
+    __slots__ = ('shard', 'last')
+
+    def __init__(self, shard):
+        self.shard = shard
+        self.last = perf_counter()
+
+    def lap(self, stage):
+        now = perf_counter()
+        self.shard.observe(stage, now - self.last)
+        self.last = now
+
+
+class Metrics:
+    """
+    Метрики процесса.
+
+    timing - замерять ли время этапов (по умолчанию выключено)
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS, timing=False):
+        self.buckets = tuple(buckets)
+        self.timing = timing
+        self.local = threading.local()
+        self.shards = []
+        self.lock = threading.Lock()
+
+    def shard(self):
+        """
+        Счётчики текущего потока (создаются при первом обращении).
+        """
+        try:
+            return self.local.shard
+        except AttributeError:
+            shard = self.local.shard = Shard(self.buckets)
+            with self.lock:
+                self.shards.append(shard)
+            return shard
+
+    def timer(self):
+        """
+        Таймер этапов запроса или None, если замеры выключены.
+        """
+        if not self.timing:
+            return None
+        return StageTimer(self.shard())
+
+    def count_status(self, status):
+        statuses = self.shard().statuses
+        statuses[status] = statuses.get(status, 0) + 1
+
+    def request_started(self):
+        self.shard().in_flight += 1
+
+    def request_finished(self):
+        self.shard().in_flight -= 1
+
+    def connection_opened(self):
+        self.shard().connections += 1
+
+    def connection_closed(self):
+        self.shard().connections -= 1
+
+    def reset(self):
+        with self.lock:
+            for shard in self.shards:
+                shard.stages.clear()
+                shard.statuses.clear()
+
+    def collect(self):
+        """
+        Складывает счётчики всех потоков.
+
+        Возвращает (этап -> (счётчики по корзинам, сумма), код -> число ответов,
+        запросов в обработке, открытых соединений)
+        """
+        stages, statuses = {}, {}
+        in_flight = connections = 0
+
+        with self.lock:
+            shards = list(self.shards)
+
+        for shard in shards:
+            in_flight += shard.in_flight
+            connections += shard.connections
+            for status, count in list(shard.statuses.items()):
+                statuses[status] = statuses.get(status, 0) + count
+            for stage, (counts, total) in list(shard.stages.items()):
+                merged = stages.setdefault(stage, [[0] * len(counts), 0.0])
+                for index, count in enumerate(counts):
+                    merged[0][index] += count
+                merged[1] += total
+
+        return stages, statuses, in_flight, connections
+
+    def render(self, caches=None, coalescing=None):
+        """
+        Метрики в текстовом формате Prometheus.
+
+        caches - имя кэша -> статистика (LRUCache.stats())
+        coalescing - статистика объединения запросов (SingleFlight.stats())
+        """
+        stages, statuses, in_flight, connections = self.collect()
+        lines = []
+
+        lines.append('# HELP calcserv_responses_total Responses sent, by status code.')
+        lines.append('# TYPE calcserv_responses_total counter')
+        for status in sorted(statuses):
+            lines.append(f'calcserv_responses_total{{code="{status}"}} {statuses[status]}')
+
+        lines.append('# HELP calcserv_requests_in_flight Requests being processed.')
+        lines.append('# TYPE calcserv_requests_in_flight gauge')
+        lines.append(f'calcserv_requests_in_flight {in_flight}')
+
+        lines.append('# HELP calcserv_connections_open Open client connections.')
+        lines.append('# TYPE calcserv_connections_open gauge')
+        lines.append(f'calcserv_connections_open {connections}')
+
+        lines.append('# HELP calcserv_stage_timing_enabled Whether per-stage timers are on.')
+        lines.append('# TYPE calcserv_stage_timing_enabled gauge')
+        lines.append(f'calcserv_stage_timing_enabled {int(self.timing)}')
+
+        lines.append('# HELP calcserv_stage_seconds Time spent in each request stage.')
+        lines.append('# TYPE calcserv_stage_seconds histogram')
+        order = [stage for stage in STAGES if stage in stages]
+        order += sorted(stage for stage in stages if stage not in STAGES)
+        for stage in order:
+            counts, total = stages[stage]
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'calcserv_stage_seconds_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+            lines.append(f'calcserv_stage_seconds_sum{{stage="{stage}"}} {total!r}')
+            lines.append(f'calcserv_stage_seconds_count{{stage="{stage}"}} {cumulative}')
+
+        if caches:
+            lines.extend(render_cache_stats(caches))
+        if coalescing:
+            lines.extend(render_coalescing_stats(coalescing))
+
+        return '\n'.join(lines) + '\n'
+
+
+# Метрики кэшей: ключ статистики -> (имя метрики, тип, описание)
+CACHE_METRICS = (
+    ('hits', 'calcserv_cache_hits_total', 'counter', 'Cache hits.'),
+    ('misses', 'calcserv_cache_misses_total', 'counter', 'Cache misses.'),
+    ('evictions', 'calcserv_cache_evictions_total', 'counter', 'Cache evictions.'),
+    ('size', 'calcserv_cache_entries', 'gauge', 'Entries in the cache.'),
+    ('bytes', 'calcserv_cache_bytes', 'gauge', 'Estimated memory used by the cache.'),
+)
+
+
+def render_cache_stats(caches):
+    """
+    Строки метрик для статистики кэшей (имя кэша -> LRUCache.stats()).
+    """
+    lines = []
+    for key, name, kind, description in CACHE_METRICS:
+        values = [(cache, stats[key]) for cache, stats in caches.items() if key in stats]
+        if not values:
+            continue
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {kind}')
+        for cache, value in values:
+            lines.append(f'{name}{{cache="{cache}"}} {value}')
+    return lines
+
+
+def render_coalescing_stats(stats):
+    """
+    Строки метрик объединения одинаковых запросов (SingleFlight.stats()).
+    """
+    return [
+        '# HELP calcserv_coalesce_leaders_total Computations started for coalesced keys.',
+        '# TYPE calcserv_coalesce_leaders_total counter',
+        f'calcserv_coalesce_leaders_total {stats["leaders"]}',
+        '# HELP calcserv_coalesce_shared_total Requests answered with another request\'s result.',
+        '# TYPE calcserv_coalesce_shared_total counter',
+        f'calcserv_coalesce_shared_total {stats["shared"]}',
+        '# HELP calcserv_coalesce_in_flight Computations other requests can join.',
+        '# TYPE calcserv_coalesce_in_flight gauge',
+        f'calcserv_coalesce_in_flight {stats["in_flight"]}',
+    ]
@@ -0,0 +1,405 @@
+"""
+Векторизованные решатели уравнений других степеней.
+
+- solve_linear_batch - ax + b = 0 (через ветку a = 0 решателя квадратных);
+- solve_cubic_batch - ax³ + bx² + cx + d = 0: тригонометрическая формула
+  для трёх действительных корней, формула Кардано для остальных;
+- solve_quartic_batch - ax⁴ + bx³ + cx² + dx + e = 0, метод Феррари
+  (через резольвенту - кубическое уравнение);
+- solve_polynomial_batch - многочлен произвольной степени, корни - собственные
+  числа сопровождающей матрицы (np.linalg.eigvals для всей пачки сразу).
+
+Все решатели принимают столбцы коэффициентов (многочлены - списком списков)
+и возвращают список (корни, дискриминант) в формате solve_quadratic_batch.
+Корни уравнений степени 3 и выше выводятся с учётом кратности, по убыванию
+действительной части (при равной - мнимой) и уточняются шагами Ньютона.
+Кратный корень численно распадается на группу близких корней с ошибкой
+порядка eps^(1/m) (m - кратность): такая группа заменяется средним, если
+многочлен в среднем равен нулю с точностью вычисления (_merge_multiple).
+Если старший коэффициент равен нулю, уравнение решается как уравнение
+меньшей степени.
+"""
+import sys
+
+import numpy as np
+
+from quadratic import solve_quadratic_batch, ZERO_TOLERANCE
+
+
+# Наибольшая степень многочлена: собственные числа считаются за O(n³)
+MAX_DEGREE = 64
+
+# Сколько шагов Ньютона делать для уточнения корней
+POLISH_STEPS = 2
+
+# Расстояния (относительно max(1, |корень|)), на которых ищутся группы
+# корней, распавшихся из кратного: от крупных групп к мелким
+MULTIPLE_TOLERANCES = (1e-2, 1e-3, 1e-4, 1e-5, 1e-6)
+
+# Во сколько раз значение многочлена в корне может превышать оценку
+# погрешности схемы Горнера (степень * eps * сумма |коэффициент| |x|^i)
+RESIDUAL_FACTOR = 4
+
+# q приведённого уравнения четвёртой степени считается нулём, если он не
+# больше стольких eps от суммы модулей слагаемых, из которых получен:
+# иначе шум округления уводит формулу Феррари далеко от корней
+BIQUADRATIC_FACTOR = 16
+
+
+def _columns(*columns):
+    return np.broadcast_arrays(*(np.asarray(column, dtype=np.float64).ravel() for column in columns))
+
+
+def _horner(coefficients, x):
+    """
+    Значения многочленов (строки coefficients, от старшего) в точках x (n, k).
+    """
+    value = np.zeros_like(x)
+    for index in range(coefficients.shape[1]):
+        value = value * x + coefficients[:, index, None]
+    return value
+
+
+def _polish(coefficients, roots, steps=POLISH_STEPS):
+    """
+    Уточняет корни шагами Ньютона. Шаг принимается, только если значение
+    многочлена уменьшилось (у кратных корней производная близка к нулю).
+    """
+    degree = coefficients.shape[1] - 1
+    derivative = coefficients[:, :-1] * np.arange(degree, 0, -1)
+    with np.errstate(all='ignore'):
+        for _ in range(steps):
+            value = _horner(coefficients, roots)
+            candidate = roots - value / _horner(derivative, roots)
+            better = np.isfinite(candidate) & (np.abs(_horner(coefficients, candidate)) < np.abs(value))
+            roots = np.where(better, candidate, roots)
+    return roots
+
+
+def _is_root(coefficients, x, radius):
+    """
+    Равен ли многочлен (список коэффициентов) нулю в точке x с точностью
+    вычисления по схеме Горнера в круге радиуса radius вокруг x.
+    """
+    value = 0j
+    bound = 0.0
+    modulus = abs(x) + radius
+    for coefficient in coefficients:
+        value = value * x + coefficient
+        bound = bound * modulus + abs(coefficient)
+    return abs(value) <= RESIDUAL_FACTOR * len(coefficients) * sys.float_info.epsilon * bound
+
+
+def _merge_row(coefficients, roots):
+    """
+    Кратные корни одного многочлена: группы близких корней -> их среднее.
+
+    Среднее группы, распавшейся из кратного корня, точнее отдельных корней:
+    их ошибки расходятся от корня симметрично. Группа сводится, только если
+    многочлен в среднем равен нулю с точностью вычисления на размере группы
+    (_is_root), поэтому различимые близкие корни остаются как есть.
+    """
+    roots = roots.tolist()
+    merged = [False] * len(roots)
+    for tolerance in MULTIPLE_TOLERANCES:
+        # Группы по цепочкам близких корней среди ещё не сведённых
+        groups = []
+        for index, root in enumerate(roots):
+            if merged[index]:
+                continue
+            for group in groups:
+                if any(abs(root - roots[other]) <= tolerance * max(1.0, abs(root), abs(roots[other]))
+                       for other in group):
+                    group.append(index)
+                    break
+            else:
+                groups.append([index])
+
+        for group in groups:
+            if len(group) < 2:
+                continue
+            mean = sum(roots[index] for index in group) / len(group)
+            radius = max(abs(roots[index] - mean) for index in group)
+            if _is_root(coefficients, mean, radius):
+                for index in group:
+                    roots[index] = mean
+                    merged[index] = True
+    return roots, merged
+
+
+def _merge_multiple(coefficients, roots):
+    """
+    Сводит кратные корни (массив (n, k)) многочленов coefficients (n, k + 1).
+
+    Возвращает корни и маску сведённых
+    """
+    count, size = roots.shape
+    merged = np.zeros(roots.shape, dtype=bool)
+    if count == 0 or size < 2:
+        return roots, merged
+    scale = np.maximum(1.0, np.abs(roots))
+    with np.errstate(invalid='ignore'):
+        close = np.abs(roots[:, :, None] - roots[:, None, :]) <= (
+            MULTIPLE_TOLERANCES[0] * np.maximum(scale[:, :, None], scale[:, None, :])
+        )
+    close[:, np.arange(size), np.arange(size)] = False
+    candidates = np.flatnonzero(close.any(axis=(1, 2)) & np.isfinite(roots).all(axis=1))
+    if len(candidates) == 0:
+        return roots, merged
+
+    roots = roots.copy()
+    for row in candidates.tolist():
+        roots[row], merged[row] = _merge_row(coefficients[row].tolist(), roots[row])
+    return roots, merged
+
+
+def _refine(coefficients, roots):
+    """
+    Сводит кратные корни и уточняет остальные шагами Ньютона.
+
+    Сведённые корни не уточняются: производная в них почти ноль, и шаг
+    Ньютона уводит к соседнему корню.
+    """
+    roots, merged = _merge_multiple(coefficients, roots)
+    return np.where(merged, roots, _polish(coefficients, roots))
+
+
+def polynomial_discriminant(leading, roots):
+    """
+    Дискриминант многочлена по его корням: a^(2n-2) * prod (x_i - x_j)^2.
+
+    Произведение считается через логарифмы модулей и сумму аргументов,
+    поэтому при переполнении получается ±inf, а не nan; у многочлена с
+    кратным корнем дискриминант ровно 0.
+    """
+    count, degree = roots.shape
+    upper = np.triu_indices(degree, 1)
+    with np.errstate(all='ignore'):
+        differences = (roots[:, :, None] - roots[:, None, :])[:, upper[0], upper[1]]
+        logarithm = (2 * degree - 2) * np.log(np.abs(leading)) + 2 * np.log(np.abs(differences)).sum(axis=1)
+        # Дискриминант действительный: знак - по сумме аргументов
+        angle = 2 * np.angle(differences).sum(axis=1) + (2 * degree - 2) * np.angle(leading)
+        discriminants = np.copysign(np.exp(logarithm), np.cos(angle))
+    discriminants[(differences == 0).any(axis=1)] = 0.0
+    return discriminants
+
+
+def _format_roots(roots):
+    """
+    Комплексный массив (n, k) -> списки корней в формате solve_quadratic.
+
+    Чистит от -0.0 и погрешностей: мнимая часть меньше ZERO_TOLERANCE
+    относительно модуля корня считается нулём, и такой корень выводится как float
+    """
+    real = np.where(np.abs(roots.real) <= ZERO_TOLERANCE, 0.0, roots.real)
+    imag = np.where(np.abs(roots.imag) <= ZERO_TOLERANCE * np.maximum(1.0, np.abs(roots)), 0.0, roots.imag)
+
+    order = np.lexsort((-imag, -real), axis=-1)
+    real = np.take_along_axis(real, order, axis=-1)
+    imag = np.take_along_axis(imag, order, axis=-1)
+    return [
+        [r if i == 0 else complex(r, i) for r, i in zip(row_real, row_imag)]
+        for row_real, row_imag in zip(real.tolist(), imag.tolist())
+    ]
+
+
+def solve_linear_batch(a, b):
+    """
+    Решает пачку линейных уравнений ax + b = 0.
+
+    Результат как у solve_quadratic с нулевым старшим коэффициентом:
+    [x], [] (нет решений) или ['Любое число']
+    """
+    a, b = _columns(a, b)
+    return solve_quadratic_batch(np.zeros_like(a), a, b)
+
+
+def _cubic_roots(b, c, d):
+    """
+    Корни приведённых кубических уравнений x³ + bx² + cx + d = 0, массив (n, 3).
+    """
+    with np.errstate(all='ignore'):
+        # x = t - b/3: t³ + pt + q = 0
+        shift = b / 3
+        p = c - b * shift
+        q = (2 * b * b * b / 27 - b * c / 3) + d
+        half_q = q / 2
+        disc = half_q * half_q + (p / 3) ** 3
+
+        # Три действительных корня (disc < 0, значит p < 0): тригонометрическая формула
+        radius = 2 * np.sqrt(-p / 3)
+        angle = np.arccos(np.clip(3 * q / (p * radius), -1.0, 1.0)) / 3
+        trig = radius[:, None] * np.cos(angle[:, None] - 2 * np.pi / 3 * np.arange(3))
+
+        # Один действительный корень и пара сопряжённых: формула Кардано.
+        # u берём с большим модулем, чтобы не вычитать близкие числа
+        u = np.cbrt(-half_q - np.copysign(np.sqrt(np.maximum(disc, 0.0)), q))
+        v = np.where(u == 0, 0.0, -p / (3 * u))
+        real = -(u + v) / 2
+        imag = np.sqrt(3) / 2 * (u - v)
+        cardano = np.stack([u + v + 0j, real + 1j * imag, real - 1j * imag], axis=1)
+
+        roots = np.where((disc < 0)[:, None], trig + 0j, cardano)
+    return roots - shift[:, None]
+
+
+def cubic_discriminant(a, b, c, d):
+    return 18 * a * b * c * d - 4 * b ** 3 * d + b * b * c * c - 4 * a * c ** 3 - 27 * a * a * d * d
+
+
+def quartic_discriminant(a, b, c, d, e):
+    return (
+        256 * a**3 * e**3 - 192 * a**2 * b * d * e**2 - 128 * a**2 * c**2 * e**2
+        + 144 * a**2 * c * d**2 * e - 27 * a**2 * d**4 + 144 * a * b**2 * c * e**2
+        - 6 * a * b**2 * d**2 * e - 80 * a * b * c**2 * d * e + 18 * a * b * c * d**3
+        + 16 * a * c**4 * e - 4 * a * c**3 * d**2 - 27 * b**4 * e**2 + 18 * b**3 * c * d * e
+        - 4 * b**3 * d**3 - 4 * b**2 * c**3 * e + b**2 * c**2 * d**2
+    )
+
+
+def _combine(count, lower, lower_results, higher, higher_results):
+    """
+    Собирает результаты двух подмножеств пачки (по маскам) в исходном порядке.
+    """
+    results = [None] * count
+    for index, result in zip(np.flatnonzero(lower).tolist(), lower_results):
+        results[index] = result
+    for index, result in zip(np.flatnonzero(higher).tolist(), higher_results):
+        results[index] = result
+    return results
+
+
+def solve_cubic_batch(a, b, c, d):
+    """
+    Решает пачку кубических уравнений ax³ + bx² + cx + d = 0.
+
+    Дискриминант - 18abcd - 4b³d + b²c² - 4ac³ - 27a²d²
+    """
+    a, b, c, d = _columns(a, b, c, d)
+    cubic = a != 0
+
+    lower = solve_quadratic_batch(b[~cubic], c[~cubic], d[~cubic]) if not cubic.all() else []
+
+    a, b, c, d = a[cubic], b[cubic], c[cubic], d[cubic]
+    with np.errstate(all='ignore'):
+        monic = np.stack([np.ones_like(a), b / a, c / a, d / a], axis=1)
+        roots = _refine(monic, _cubic_roots(monic[:, 1], monic[:, 2], monic[:, 3]))
+        discriminants = cubic_discriminant(a, b, c, d)
+    higher = list(zip(_format_roots(roots), discriminants.tolist()))
+
+    return _combine(len(cubic), ~cubic, lower, cubic, higher)
+
+
+def _quartic_roots(b, c, d, e):
+    """
+    Корни приведённых уравнений x⁴ + bx³ + cx² + dx + e = 0, массив (n, 4).
+    """
+    with np.errstate(all='ignore'):
+        # x = y - b/4: y⁴ + py² + qy + r = 0
+        shift = b / 4
+        p = c - 6 * shift * shift
+        q = d - 2 * c * shift + 8 * shift ** 3
+        q_scale = np.abs(d) + np.abs(2 * c * shift) + np.abs(8 * shift ** 3)
+        biquadratic_rows = np.abs(q) <= BIQUADRATIC_FACTOR * np.finfo(float).eps * q_scale
+        r = e - d * shift + c * shift * shift - 3 * shift ** 4
+
+        # Резольвента m³ + pm² + (p²/4 - r)m - q²/8 = 0 при q ≠ 0 имеет
+        # положительный корень - берём наибольший действительный
+        resolvent = _cubic_roots(p, p * p / 4 - r, -q * q / 8)
+        m = np.where(resolvent.imag == 0, resolvent.real, -np.inf).max(axis=1)
+        s = np.sqrt(2 * m) + 0j
+        ratio = 2 * q / s
+        first = np.sqrt(-(2 * p + 2 * m + ratio) + 0j)
+        second = np.sqrt(-(2 * p + 2 * m - ratio) + 0j)
+        ferrari = np.stack([s + first, s - first, -s + second, -s - second], axis=1) / 2
+
+        # q = 0 (с точностью округления) - биквадратное уравнение:
+        # z² + pz + r = 0, y = ±√z
+        root = np.sqrt(p * p - 4 * r + 0j)
+        z1, z2 = np.sqrt((-p + root) / 2), np.sqrt((-p - root) / 2)
+        biquadratic = np.stack([z1, -z1, z2, -z2], axis=1)
+
+        roots = np.where(biquadratic_rows[:, None], biquadratic, ferrari)
+    return roots - shift[:, None]
+
+
+def solve_quartic_batch(a, b, c, d, e):
+    """
+    Решает пачку уравнений четвёртой степени ax⁴ + bx³ + cx² + dx + e = 0.
+
+    Дискриминант считается по общей формуле (16 слагаемых)
+    """
+    a, b, c, d, e = _columns(a, b, c, d, e)
+    quartic = a != 0
+
+    lower = solve_cubic_batch(b[~quartic], c[~quartic], d[~quartic], e[~quartic]) if not quartic.all() else []
+
+    a, b, c, d, e = a[quartic], b[quartic], c[quartic], d[quartic], e[quartic]
+    with np.errstate(all='ignore'):
+        monic = np.stack([np.ones_like(a), b / a, c / a, d / a, e / a], axis=1)
+        roots = _refine(monic, _quartic_roots(*monic[:, 1:].T))
+        discriminants = quartic_discriminant(a, b, c, d, e)
+    higher = list(zip(_format_roots(roots), discriminants.tolist()))
+
+    return _combine(len(quartic), ~quartic, lower, quartic, higher)
+
+
+def solve_polynomial_batch(polynomials):
+    """
+    Решает пачку многочленов произвольной степени.
+
+    polynomials - список списков коэффициентов от старшего к свободному члену.
+    Многочлены степени 2 и ниже решаются solve_quadratic_batch (с его
+    дискриминантом). У многочленов степени 3 и 4 дискриминант - по тем же
+    формулам, что у solve_cubic_batch и solve_quartic_batch, у остальных -
+    по корням (polynomial_discriminant), то есть приближённый.
+    Бросает ValueError для пустого многочлена и степени больше MAX_DEGREE
+    """
+    results = [None] * len(polynomials)
+    groups = {}
+    for index, coefficients in enumerate(polynomials):
+        coefficients = np.asarray(coefficients, dtype=np.float64).ravel()
+        if len(coefficients) == 0:
+            raise ValueError("Empty polynomial")
+        # Старшие нули не меняют корней
+        nonzero = np.flatnonzero(coefficients)
+        coefficients = coefficients[nonzero[0]:] if len(nonzero) else coefficients[-1:]
+        if len(coefficients) - 1 > MAX_DEGREE:
+            raise ValueError(f"Polynomial degree is larger than {MAX_DEGREE}")
+        groups.setdefault(max(len(coefficients), 3), []).append((index, coefficients))
+
+    for size, group in groups.items():
+        indices = [index for index, _ in group]
+        rows = np.array([np.pad(coefficients, (size - len(coefficients), 0)) for _, coefficients in group])
+
+        if size == 3:
+            solved = solve_quadratic_batch(rows[:, 0], rows[:, 1], rows[:, 2])
+        else:
+            with np.errstate(all='ignore'):
+                monic = rows / rows[:, :1]
+            finite = np.isfinite(monic).all(axis=1)
+
+            # Сопровождающая матрица: первая строка - коэффициенты, под диагональю - единицы
+            degree = size - 1
+            companion = np.zeros((len(rows), degree, degree))
+            companion[:, 0, :] = -np.where(finite[:, None], monic[:, 1:], 0.0)
+            companion[:, np.arange(1, degree), np.arange(degree - 1)] = 1.0
+
+            roots = np.linalg.eigvals(companion).astype(np.complex128)
+            roots[~finite] = np.nan
+            monic = np.where(finite[:, None], monic, 0.0)
+            roots = _refine(monic, roots)
+            with np.errstate(all='ignore'):
+                if size == 4:
+                    discriminants = cubic_discriminant(*rows.T)
+                elif size == 5:
+                    discriminants = quartic_discriminant(*rows.T)
+                else:
+                    discriminants = polynomial_discriminant(rows[:, 0], roots)
+            discriminants[~finite] = np.nan
+            solved = list(zip(_format_roots(roots), discriminants.tolist()))
+
+        for index, result in zip(indices, solved):
+            results[index] = result
+
+    return results
@@ -0,0 +1,202 @@
+"""
+Профилирование работающего сервера.
+
+- SamplingProfiler - выборочный профилировщик: фоновый поток раз в interval
+  секунд снимает стеки всех потоков процесса (sys._current_frames) и считает
+  одинаковые стеки. Результат - свёрнутые стеки (collapsed stacks), одна
+  строка на стек, от корня к листу, которые понимают flamegraph.pl,
+  speedscope и inferno:
+
+      MainThread;server.py:run;server.py:serve;...;quadratic.py:solve_quadratic 42
+
+  В отличие от cProfile, видит все потоки пула и не замедляет запросы:
+  цена - один проход по стекам на выборку в отдельном потоке.
+- TraceTimer - замер этапов одного запроса для заголовка Server-Timing
+  (запрос с заголовком X-Calcserv-Trace: 1).
+- start_profile / stop_profile - профиль всего времени работы процесса
+  с записью в файл при завершении (run_server.py --profile).
+"""
+import atexit
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+
+# Заголовок запроса, включающий Server-Timing в ответе
+TRACE_HEADER = 'X-Calcserv-Trace'
+
+DEFAULT_INTERVAL = 0.005
+
+PROFILER_THREAD = 'profiler'
+
+# Наибольшая длительность сеанса профилирования по запросу, в секундах
+MAX_SECONDS = 300
+
+
+def frame_name(code):
+    # co_qualname (с именем класса) появился в Python 3.11
+    return f"{os.path.basename(code.co_filename)}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class SamplingProfiler:
+    """
+    Выборочный профилировщик всех потоков процесса.
+
+    interval - период выборок в секундах
+    """
+
+    def __init__(self, interval=DEFAULT_INTERVAL):
+        self.interval = interval
+        self.counts = Counter()
+        self.samples = 0
+        self.started = None
+        self.finished = None
+        self.deadline = None
+        self.thread = None
+        self.stopping = threading.Event()
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, seconds=None, interval=None):
+        """
+        Начинает новый сеанс (прошлые выборки сбрасываются); через seconds
+        секунд сеанс завершается сам.
+        """
+        if self.running:
+            raise RuntimeError("Profiler is already running")
+        if interval is not None:
+            self.interval = interval
+        self.counts = Counter()
+        self.samples = 0
+        self.started = time.monotonic()
+        self.finished = None
+        self.deadline = None if seconds is None else self.started + seconds
+        self.stopping.clear()
+        self.thread = threading.Thread(target=self.run, name=PROFILER_THREAD, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if self.thread is None:
+            return
+        self.stopping.set()
+        if self.thread is not threading.current_thread():
+            self.thread.join()
+
+    def run(self):
+        while not self.stopping.wait(self.interval):
+            if self.deadline is not None and time.monotonic() >= self.deadline:
+                break
+            self.sample()
+        self.finished = time.monotonic()
+
+    def sample(self):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            name = names.get(ident)
+            # Потоки профилировщиков (этого и профиля всего процесса) не показываем
+            if name == PROFILER_THREAD:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(frame_name(frame.f_code))
+                frame = frame.f_back
+            stack.append(name or f"thread-{ident}")
+            self.counts[';'.join(reversed(stack))] += 1
+        self.samples += 1
+
+    def collapsed(self):
+        """
+        Свёрнутые стеки: строки "кадр;кадр;...;кадр число", частые - первыми.
+        """
+        return ''.join(f"{stack} {count}\n" for stack, count in self.counts.most_common())
+
+    def report(self):
+        report = {"running": self.running, "samples": self.samples, "interval": self.interval}
+        if self.started is not None:
+            end = self.finished if self.finished is not None else time.monotonic()
+            report["seconds"] = end - self.started
+        if self.deadline is not None and self.running:
+            report["remaining"] = max(0.0, self.deadline - time.monotonic())
+        return report
+
+
+class TraceTimer:
+    """
+    Замер этапов одного запроса для заголовка Server-Timing.
+
+    timer - таймер метрик (StageTimer) того же запроса или None;
+    отметки передаются и ему
+    """
+
+    __slots__ = ('timer', 'started', 'last', 'stages')
+
+    def __init__(self, timer=None):
+        self.timer = timer
+        self.started = self.last = time.perf_counter()
+        self.stages = []
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        self.stages.append((stage, now - self.last))
+        self.last = now
+        if self.timer is not None:
+            self.timer.lap(stage)
+
+    def server_timing(self):
+        """
+        Строка заголовка Server-Timing (с \\r\\n), длительности в миллисекундах.
+        """
+        entries = [f"{stage};dur={seconds * 1000:.3f}" for stage, seconds in self.stages]
+        entries.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.3f}")
+        return f"Server-Timing: {', '.join(entries)}\r\n".encode('latin-1')
+
+
+# Профиль всего времени работы процесса (start_profile): профилировщик и файл
+_session = None
+
+
+def start_profile(path, interval=0.01):
+    """
+    Профилирует процесс до завершения и записывает свёрнутые стеки в path.
+
+    Процессы, порождённые fork (prefork), профилируются каждый в свой файл
+    path.<pid>.
+    """
+    global _session
+    stop_profile()
+    profiler = SamplingProfiler(interval)
+    profiler.start()
+    _session = (profiler, path)
+    return profiler
+
+
+def stop_profile():
+    """
+    Останавливает профиль процесса и записывает его в файл.
+    """
+    global _session
+    if _session is None:
+        return
+    profiler, path = _session
+    _session = None
+    profiler.stop()
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(profiler.collapsed())
+    print(f"Profile: {profiler.samples} samples written to {path}", file=sys.stderr)
+
+
+def _after_fork_in_child():
+    # Поток профилировщика не переживает fork: начинаем свой профиль
+    global _session
+    if _session is not None:
+        profiler, path = _session
+        _session = None
+        start_profile(f"{path}.{os.getpid()}", profiler.interval)
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+atexit.register(stop_profile)
@@ -3,10 +3,51 @@
 
 Содержит универсальный алгоритм решения уравнений вида ax² + bx + c = 0,
 включая обработку линейных случаев (a=0) и вычисление комплексных корней.
+
+NumPy нужен только векторизованному решателю и импортируется при первом
+вызове: одиночные запросы и холодный старт сервера обходятся без него.
 """
 import cmath
+import decimal
+import math
+from decimal import Decimal
 
 ResultType = str | float | complex
+
+# Виды решений в векторизованном решателе
+KIND_NONE = 0  # нет решений
+KIND_ANY = 1   # любое число
+KIND_ONE = 2   # один корень
+KIND_TWO = 3   # два корня
+
+# Корни и погрешности меньше этого значения считаются нулём
+ZERO_TOLERANCE = 1e-9
+
+# Точность (в десятичных знаках) для solve_quadratic_precise: произведение
+# двух float точно умещается в 34 знака, остальное - запас на вычитание
+# и извлечение корня
+PRECISE_DIGITS = 80
+
+
+def _clean(x: float) -> float:
+    """
+    Чистит от -0.0 и микро-ошибок.
+    """
+    return 0.0 if abs(x) <= ZERO_TOLERANCE else x
+
+
+def _root(real: float, imag: float) -> ResultType:
+    """
+    Корень в формате solve_quadratic: float, если мнимая часть нулевая.
+    """
+    real, imag = _clean(real), _clean(imag)
+    # Сюда попадет и обычное число (2.0), и чистый ноль (0.0)
+    if imag == 0:
+        return real
+    # Чисто мнимое (1j) или смешанное (1+2j) число
+    return complex(real, imag)
+
+
 def solve_quadratic(a: float, b: float, c: float) -> tuple[list[ResultType], float]:
     """
     Решает квадратное уравнение вида ax² + bx + c = 0.
@@ -42,25 +83,220 @@ def solve_quadratic(a: float, b: float, c: float) -> tuple[list[ResultType], flo
         # Один корень
         x = -b / (2*a)
         return [x], discriminant
-    
+
+    if 0 < discriminant < math.inf:
+        # Действительные корни без cmath. Формула (-b ± sqrt_d) / 2a теряет
+        # точность, когда b² ≫ 4ac: -b и sqrt_d почти равны и вычитаются.
+        # Поэтому считаем q = -(b + sign(b)·sqrt_d) / 2 (здесь слагаемые
+        # одного знака), и корни q/a и c/q
+        sqrt_d = math.sqrt(discriminant)
+        q = -(b + math.copysign(sqrt_d, b)) / 2
+        if math.copysign(1.0, b) < 0:
+            x1, x2 = q / a, c / q  # q = (-b + sqrt_d) / 2
+        else:
+            x1, x2 = c / q, q / a  # q = (-b - sqrt_d) / 2
+        return [_clean(x1), _clean(x2)], float(discriminant)
+
+    # Комплексные корни (а также NaN и бесконечный дискриминант)
     sqrt_d = cmath.sqrt(discriminant) # Квадратный корень дискриминанта
     x1 = (-b + sqrt_d) / (2 * a) # Первый корень
     x2 = (-b - sqrt_d) / (2 * a) # Второй корень
-    
-    roots = []
-    for root in [x1, x2]:
+
+    return [_root(x1.real, x1.imag), _root(x2.real, x2.imag)], float(discriminant)
+
+
+def precise_discriminant(a: float, b: float, c: float) -> float:
+    """
+    Дискриминант, вычисленный точно и округлённый до float один раз.
+
+    Для a = 0 возвращает 0.0, как solve_quadratic.
+    """
+    if a == 0:
+        return 0.0
+    if not all(math.isfinite(x) for x in (a, b, c)):
+        return float(b**2 - 4*a*c)
+
+    with decimal.localcontext(prec=PRECISE_DIGITS):
+        return float(Decimal(b) * Decimal(b) - 4 * Decimal(a) * Decimal(c))
+
+
+def solve_quadratic_precise(a: float, b: float, c: float) -> tuple[list[ResultType], float]:
+    """
+    Решает квадратное уравнение с повышенной точностью (режим для плохо
+    обусловленных уравнений, например когда b² ≈ 4ac).
+
+    Коэффициенты переводятся в Decimal без потерь, дискриминант и корни
+    считаются с PRECISE_DIGITS знаками и округляются до float один раз.
+    Результат в том же формате, что у solve_quadratic; дискриминант всегда
+    float, а при переполнении float вместо OverflowError получается inf.
+    Линейные уравнения и нечисловые значения (inf, NaN) решаются solve_quadratic.
+    """
+    if a == 0 or not all(math.isfinite(x) for x in (a, b, c)):
+        return solve_quadratic(a, b, c)
+
+    with decimal.localcontext(prec=PRECISE_DIGITS):
+        a, b, c = Decimal(a), Decimal(b), Decimal(c)
+        discriminant = b * b - 4 * a * c
+
+        if discriminant == 0:
+            return [_clean(float(-b / (2 * a)))], 0.0
+
+        if discriminant > 0:
+            # Та же устойчивая формула, что и в solve_quadratic
+            sqrt_d = discriminant.sqrt()
+            q = -(b + sqrt_d.copy_sign(b)) / 2
+            if b.is_signed():
+                x1, x2 = q / a, c / q
+            else:
+                x1, x2 = c / q, q / a
+            return [_clean(float(x1)), _clean(float(x2))], float(discriminant)
+
+        real = float(-b / (2 * a))
+        imag = float((-discriminant).sqrt() / (2 * a))
+        return [_root(real, imag), _root(real, -imag)], float(discriminant)
+
+
+def _cmath_sqrt_abs(x: 'np.ndarray') -> 'np.ndarray':
+    """
+    Модуль cmath.sqrt(x) для действительного массива x.
+
+    Повторяет масштабирование из реализации cmath.sqrt: около DBL_MIN
+    результат отличается от np.sqrt в последнем бите.
+    """
+    import numpy as np
+
+    ax = np.abs(x)
+    eighth = ax / 8.0
+    normal = 2.0 * np.sqrt(eighth + eighth)
+    scaled = np.ldexp(np.sqrt(2.0 * np.ldexp(ax, 53)), -27)
+    return np.where(ax < np.finfo(np.float64).tiny, scaled, normal)
+
+
+def _divide(real, imag, divisor, ratio):
+    """
+    Делит комплексный массив (real, imag) на действительный divisor.
+    """
+    return (real + imag * ratio) / divisor, (imag - real * ratio) / divisor
+
+
+def solve_quadratic_arrays(a, b, c) -> 'tuple[np.ndarray, np.ndarray, np.ndarray]':
+    """
+    Векторизованно решает массив квадратных уравнений ax² + bx + c = 0.
+
+    Все ветви solve_quadratic (a=0, D=0, действительные и комплексные корни)
+    выбираются масками массивов, без циклов Python.
+
+    Args:
+        a, b, c: массивы (или списки) коэффициентов одинаковой длины
+
+    Returns:
+        tuple: (kinds, roots, discriminants)
+              - kinds: вид решения для каждого уравнения (KIND_*)
+              - roots: комплексный массив формы (n, 2) с корнями
+              - discriminants: массив дискриминантов
+    """
+    import numpy as np
+
+    a, b, c = np.broadcast_arrays(
+        np.asarray(a, dtype=np.float64).ravel(),
+        np.asarray(b, dtype=np.float64).ravel(),
+        np.asarray(c, dtype=np.float64).ravel(),
+    )
+
+    with np.errstate(all="ignore"):
+        linear = a == 0
+        # float_power вызывает pow() из libm, как b**2 в scalar-версии
+        # (b*b округляется иначе в последнем бите)
+        discriminant = np.where(linear, 0.0, np.float_power(b, 2.0) - 4*a*c)
+
+        single = ~linear & (discriminant == 0)
+        double = ~linear & ~single  # сюда попадает и NaN, как в scalar-версии
+        # Действительные корни считаются устойчивой формулой, как в scalar-версии
+        real = double & (discriminant > 0) & (discriminant < np.inf)
+
+        # Корень из дискриминанта как комплексное число (sqrt_re, sqrt_im)
+        sqrt_d = _cmath_sqrt_abs(discriminant)
+        negative = discriminant < 0
+        sqrt_re = np.where(negative, 0.0, sqrt_d)
+        sqrt_im = np.where(negative, sqrt_d, 0.0)
+
+        # Делим по алгоритму Смита, как complex / float в CPython:
+        # так совпадают и округление, и NaN при бесконечностях
+        two_a = 2 * a
+        ratio = 0.0 / two_a
+        re1, im1 = _divide(-b + sqrt_re, 0.0 + sqrt_im, two_a, ratio)
+        re2, im2 = _divide(-b - sqrt_re, 0.0 - sqrt_im, two_a, ratio)
+
+        # q = -(b + sign(b)·sqrt_d) / 2, корни q/a и c/q
+        q = -(b + np.copysign(np.sqrt(discriminant), b)) / 2
+        negative_b = np.signbit(b)
+        re1 = np.where(real, np.where(negative_b, q / a, c / q), re1)
+        re2 = np.where(real, np.where(negative_b, c / q, q / a), re2)
+        im1 = np.where(real, 0.0, im1)
+        im2 = np.where(real, 0.0, im2)
+
         # Чистим от -0.0 и микро-ошибок
-        r = 0.0 if cmath.isclose(root.real, 0, abs_tol=1e-9) else root.real
-        i = 0.0 if cmath.isclose(root.imag, 0, abs_tol=1e-9) else root.imag
-
-        if i == 0:
-            # Сюда попадет и обычное число (2.0), и чистый ноль (0.0)
-            roots.append(r)
-        elif r == 0:
-            # Сюда попадет чисто мнимое число (1j)
-            roots.append(complex(0.0, i))
-        else:
-            # Сюда попадет смешанное число (1+2j)
-            roots.append(complex(r, i))
+        re1, im1, re2, im2 = (np.where(np.abs(x) <= ZERO_TOLERANCE, 0.0, x) for x in (re1, im1, re2, im2))
+
+        single_root = np.where(linear, -c / b, -b / two_a)
+
+    kinds = np.full(a.shape, KIND_TWO, dtype=np.int8)
+    kinds[single | (linear & (b != 0))] = KIND_ONE
+    kinds[linear & (b == 0)] = KIND_NONE
+    kinds[linear & (b == 0) & (c == 0)] = KIND_ANY
+
+    roots = np.zeros((a.shape[0], 2), dtype=np.complex128)
+    one = kinds == KIND_ONE
+    roots.real[one, 0] = single_root[one]
+    roots.real[double, 0] = re1[double]
+    roots.real[double, 1] = re2[double]
+    roots.imag[double, 0] = im1[double]
+    roots.imag[double, 1] = im2[double]
+
+    return kinds, roots, discriminant
+
+
+def solve_quadratic_batch(a, b, c, precise=False) -> list[tuple[list[ResultType], float]]:
+    """
+    Решает пачку квадратных уравнений векторизованно.
+
+    Результат совпадает поэлементно с [solve_quadratic(*abc) for abc in ...],
+    включая очистку -0.0 и погрешностей меньше 1e-9. Там, где scalar-версия
+    бросает OverflowError на b**2, здесь дискриминант равен inf.
 
-    return roots, float(discriminant)
\ No newline at end of file
+    Args:
+        a, b, c: последовательности коэффициентов одинаковой длины
+        precise: решать каждое уравнение solve_quadratic_precise (без векторизации)
+
+    Returns:
+        list: список кортежей (корни, дискриминант) для каждого уравнения
+    """
+    if precise:
+        return [solve_quadratic_precise(*abc) for abc in zip(a, b, c)]
+
+    kinds, roots, discriminants = solve_quadratic_arrays(a, b, c)
+    return unpack_solutions(kinds, roots, discriminants)
+
+
+def unpack_solutions(kinds, roots, discriminants) -> list[tuple[list[ResultType], float]]:
+    """
+    Преобразует массивы solve_quadratic_arrays в формат solve_quadratic.
+    """
+    # Корень без мнимой части отдаём как float, как и scalar-версия
+    columns = (roots.real[:, 0], roots.imag[:, 0], roots.real[:, 1], roots.imag[:, 1])
+    results = []
+    for kind, r1, i1, r2, i2, discriminant in zip(
+        kinds.tolist(), *(column.tolist() for column in columns), discriminants.tolist()
+    ):
+        if kind == KIND_TWO:
+            results.append((
+                [r1 if i1 == 0 else complex(r1, i1), r2 if i2 == 0 else complex(r2, i2)],
+                discriminant,
+            ))
+        elif kind == KIND_ONE:
+            results.append(([r1], discriminant))
+        elif kind == KIND_ANY:
+            results.append((["Любое число"], discriminant))
+        else:
+            results.append(([], discriminant))
+    return results
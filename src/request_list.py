@@ -0,0 +1,80 @@
+"""
+Список обычных запросов в одном теле: POST /calculate?quadratic с телом
+
+    [{"params": {"a": 1, "b": -5, "c": 6}}, {"params": {"a": 1, "b": 2}}, ...]
+
+Ответ - список в формате create_response в том же порядке. Некорректный
+элемент не превращает весь запрос в 400: вместо результата для него
+возвращается ошибка в формате error_response.
+
+Одинаковые тройки внутри списка решаются один раз. Уникальные тройки
+решаются векторизованно (solve_quadratic_batch), а очень большие списки -
+в пуле решателей с общей памятью (solver_pool.py, ListSolver.pool).
+"""
+from quadratic import solve_quadratic_batch, unpack_solutions
+from cache import coefficients_key
+
+
+# Наибольшее число запросов в списке (больше - 413)
+DEFAULT_MAX_ITEMS = 10000
+
+# С какого числа разных троек решать список в пуле. Порог свой, а не
+# SolverPool.min_items: пачки бывают длиннее списков, а список длиннее
+# max_items отклоняется раньше, так что порог выше max_items не сработает
+DEFAULT_MIN_ITEMS = 5000
+
+
+class ListSolver:
+    """
+    Решает уникальные тройки списка запросов.
+
+    max_items - наибольшее число запросов в списке
+    pool - пул решателей (SolverPool) для больших списков или None
+    min_items - с какого числа разных троек решать в пуле
+    """
+
+    def __init__(self, max_items=DEFAULT_MAX_ITEMS, pool=None, min_items=DEFAULT_MIN_ITEMS):
+        self.max_items = max_items
+        self.pool = pool
+        self.min_items = min_items
+
+    def configure(self, max_items=DEFAULT_MAX_ITEMS, pool=None, min_items=DEFAULT_MIN_ITEMS):
+        self.max_items = max_items
+        self.pool = pool
+        self.min_items = min_items
+
+    def solve(self, a, b, c, precise=False):
+        """
+        Решает столбцы коэффициентов, большие - в пуле решателей.
+
+        Возвращает список (корни, дискриминант)
+        """
+        if precise or self.pool is None or len(a) < self.min_items:
+            return solve_quadratic_batch(a, b, c, precise)
+        return unpack_solutions(*self.pool.solve_arrays(a, b, c))
+
+
+def solve_request_list(items, solver, precise=False):
+    """
+    Решает список запросов из parse_request_list.
+
+    items - (a, b, c) или ошибка для каждого запроса.
+    Возвращает для каждого запроса (корни, дискриминант) или ту же ошибку;
+    у одинаковых троек - один и тот же объект результата
+    """
+    positions = {}
+    a, b, c = [], [], []
+    for item in items:
+        if isinstance(item, tuple):
+            key = coefficients_key(*item)
+            if key not in positions:
+                positions[key] = len(a)
+                a.append(item[0])
+                b.append(item[1])
+                c.append(item[2])
+
+    solved = solver.solve(a, b, c, precise) if a else []
+    return [
+        solved[positions[coefficients_key(*item)]] if isinstance(item, tuple) else item
+        for item in items
+    ]
@@ -0,0 +1,201 @@
+"""
+Сериализация ответов без json.dumps.
+
+Схема ответа фиксирована (create_response):
+
+    {"result": {"roots": [...], "discriminant": ..., "message": "..."}, "error": ...}
+
+поэтому байты ответа собираются прямо из готовых кусков шаблона: сообщения
+"Успех! ..." закодированы в UTF-8 заранее, числа форматируются float.__repr__
+(как у json), а не встречавшиеся раньше значения - через кэш форматирования.
+По умолчанию результат совпадает с create_response(...).encode('utf-8') байт
+в байт.
+
+Комплексные корни по умолчанию - строки str(root), как у create_response
+("(1+2j)", "1j"). С complex_format='object' корень - объект, который клиент
+разбирает без регулярных выражений:
+
+    {"re": 1.0, "im": 2.0}
+
+Значения других типов (например, bool или целые numpy) кодируются общим
+путём json_parser, с теми же ошибками.
+"""
+import json
+import logging
+from math import copysign
+from json.encoder import encode_basestring
+
+from json_parser import build_response, build_error
+
+
+logger = logging.getLogger(__name__)
+
+COMPLEX_FORMATS = ('string', 'object')
+
+ANY_NUMBER = "Любое число"
+
+# Части шаблона ответа
+_RESULT = b'{"result": {"roots": ['
+_DISCRIMINANT = b'], "discriminant": '
+_MESSAGE = b', "message": '
+_NO_ERROR = b'}, "error": null}'
+_ERROR = b'}, "error": '
+_SEPARATOR = b', '
+
+
+def _string(text):
+    # Как json.dumps(text, ensure_ascii=False)
+    return encode_basestring(text).encode('utf-8')
+
+
+# Сообщение по числу корней (как в build_response)
+_MESSAGES = {
+    0: _string("Успех! Нет действительных корней"),
+    1: _string("Успех! Один корень"),
+    2: _string("Успех! Два корня"),
+}
+_ANY_MESSAGE = _string("Успех! Бесконечное число решений")
+_ANY_ROOTS = _string(ANY_NUMBER)
+
+# Ответ об ошибке (build_error) до текста ошибки
+_ERROR_RESULT = _RESULT + _DISCRIMINANT + b'0.0' + _MESSAGE + _string("Ошибка") + _ERROR
+
+# Отформатированные числа: одни и те же корни и дискриминанты (целые,
+# 0.0, 1.0, ...) повторяются из ответа в ответ
+_FLOATS = {
+    float('inf'): b'Infinity',
+    float('-inf'): b'-Infinity',
+}
+_MAX_CACHED_FLOATS = 4096
+
+
+def _float(value):
+    text = _FLOATS.get(value)
+    if text is not None:
+        return text
+    if value != value:
+        # nan не равен себе и в кэше не найдётся
+        return b'NaN'
+    if value == 0:
+        # 0.0 и -0.0 - один ключ словаря, а пишутся по-разному: не кэшируем
+        return b'-0.0' if copysign(1.0, value) < 0 else b'0.0'
+    text = float.__repr__(value).encode('ascii')
+    if len(_FLOATS) < _MAX_CACHED_FLOATS:
+        _FLOATS[value] = text
+    return text
+
+
+def _number(value):
+    if isinstance(value, float):
+        return _float(value)
+    if isinstance(value, int) and not isinstance(value, bool):
+        return int.__repr__(value).encode('ascii')
+    raise TypeError(f"Object of type {type(value).__name__} is not a number")
+
+
+def _root(value, complex_format):
+    if type(value) is float:
+        return _float(value)
+    if isinstance(value, complex):
+        if complex_format == 'object':
+            return b'{"re": ' + _float(value.real) + b', "im": ' + _float(value.imag) + b'}'
+        # str(complex) - только ASCII без кавычек и обратных косых
+        return b'"' + str(value).encode('ascii') + b'"'
+    return _number(value)
+
+
+def _encode_result(roots, discriminant, error, complex_format):
+    if roots == [ANY_NUMBER]:
+        roots_part, message = _ANY_ROOTS, _ANY_MESSAGE
+    else:
+        roots_part = _SEPARATOR.join([_root(root, complex_format) for root in roots])
+        message = _MESSAGES.get(len(roots))
+        if message is None:
+            # Уравнения высших степеней (polynomial.py)
+            message = _string(f"Успех! Корней: {len(roots)}")
+
+    tail = _NO_ERROR if error is None else _ERROR + _string(error) + b'}'
+    return b''.join((_RESULT, roots_part, _DISCRIMINANT, _number(discriminant), _MESSAGE, message, tail))
+
+
+def _encode_generic(data):
+    # Общий путь (json.dumps) для значений, которых нет в шаблоне
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+def encode_result(roots, discriminant, error=None, complex_format='string'):
+    """
+    Ответ на одно уравнение в json (байты UTF-8), как create_response.
+    """
+    try:
+        return _encode_result(roots, discriminant, error, complex_format)
+    except TypeError:
+        pass
+    try:
+        return _encode_generic(build_response(roots, discriminant, error, complex_format))
+    except (TypeError, ValueError) as err:
+        logger.error(f"{type(err).__name__}: {err}")
+        return encode_error(f"Ошибка сериализации: {err}")
+
+
+def encode_error(error_msg):
+    """
+    Ответ об ошибке в json (байты UTF-8), как error_response.
+    """
+    return _ERROR_RESULT + _string(error_msg) + b'}'
+
+
+def encode_batch(results, complex_format='string'):
+    """
+    Пакетный ответ в json (байты UTF-8), как create_batch_response.
+
+    results - список кортежей (корни, дискриминант)
+    """
+    try:
+        return b'[' + _SEPARATOR.join([
+            _encode_result(roots, discriminant, None, complex_format) for roots, discriminant in results
+        ]) + b']'
+    except TypeError:
+        pass
+    try:
+        return _encode_generic([
+            build_response(roots, discriminant, complex_format=complex_format) for roots, discriminant in results
+        ])
+    except (TypeError, ValueError) as err:
+        logger.error(f"{type(err).__name__}: {err}")
+        return encode_error(f"Ошибка сериализации: {err}")
+
+
+def encode_list(results, complex_format='string'):
+    """
+    Ответ на список запросов в json (байты UTF-8), как create_list_response.
+
+    results - для каждого запроса (корни, дискриминант) или ошибка;
+    один и тот же объект результата кодируется один раз
+    """
+    encoded = {}
+    entries = []
+    try:
+        for result in results:
+            entry = encoded.get(id(result))
+            if entry is None:
+                if isinstance(result, tuple):
+                    entry = _encode_result(*result, None, complex_format)
+                else:
+                    entry = encode_error(str(result))
+                encoded[id(result)] = entry
+            entries.append(entry)
+    except TypeError:
+        pass
+    else:
+        return b'[' + _SEPARATOR.join(entries) + b']'
+
+    try:
+        return _encode_generic([
+            build_response(*result, complex_format=complex_format) if isinstance(result, tuple)
+            else build_error(str(result))
+            for result in results
+        ])
+    except (TypeError, ValueError) as err:
+        logger.error(f"{type(err).__name__}: {err}")
+        return encode_error(f"Ошибка сериализации: {err}")
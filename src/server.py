@@ -1,104 +1,1097 @@
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import HTTPServer, ThreadingHTTPServer, BaseHTTPRequestHandler
+from http.server import DEFAULT_ERROR_MESSAGE, DEFAULT_ERROR_CONTENT_TYPE
+from http import HTTPStatus
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+from urllib.parse import parse_qs
+import atexit
+import threading
+import logging
+import html
+import socket
+import json
+import signal
+import time
 import sys
 import os
 
 # Получаем корневую папку проекта
 PROJECT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
 UI_DIR = os.path.join(PROJECT_ROOT, 'ui')  # Папка с фронтендом
-SRC_DIR = os.path.join(PROJECT_ROOT, 'src')  # Папка с Python кодом
 
-# Добавляем src в путь Python
-sys.path.insert(0, SRC_DIR)
+# Модули из src/ импортируются напрямую: src должна быть в sys.path
+# (run_server.py добавляет её сам, при запуске src/server.py она там и так)
+from quadratic import (
+    solve_quadratic_arrays, solve_quadratic_batch, solve_quadratic_precise, precise_discriminant, unpack_solutions,
+)
+from json_parser import parse_request, parse_batch_request, parse_equation_request, parse_request_list
+from response_encoder import encode_result, encode_batch, encode_list, COMPLEX_FORMATS
+from solvers import SOLVERS
+from cache import SolutionCache, ResponseCache, coefficients_key
+from coalesce import SingleFlight
+from request_list import ListSolver, solve_request_list
+from solver_pool import SolverPool, DEFAULT_CHUNK_SIZE, DEFAULT_MIN_ITEMS
+from bulk import iter_solved_chunks
+from streaming import BodyError, ChunkedWriter, request_body, iter_lines
+from static import StaticFiles
+from metrics import Metrics, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from admission import InFlightLimiter, ClientRateLimiter, RETRY_AFTER
+from structured_log import log_access, stop_logging
+from warmup import Warmup
+from profiler import (
+    SamplingProfiler, TraceTimer, TRACE_HEADER, MAX_SECONDS as MAX_PROFILE_SECONDS, stop_profile,
+)
+from binary_protocol import (
+    CONTENT_TYPE as BINARY_CONTENT_TYPE, media_type, accepts_binary,
+    decode_request, encode_arrays, encode_solutions,
+)
 
-from quadratic import solve_quadratic
-from json_parser import parse_request, create_response
+
+logger = logging.getLogger('calcserv.server')
+
+# Кэш решений для одиночных запросов (размер задаётся в run_server.py)
+solution_cache = SolutionCache()
+
+# Кэш готовых ответов по тройке (a, b, c): повторный запрос не доходит
+# до сериализации
+response_cache = ResponseCache()
+
+# Одинаковые одновременные запросы решаются и сериализуются один раз
+coalescer = SingleFlight()
+
+# Списки запросов в одном теле (размер - в run_server.py)
+list_solver = ListSolver()
+
+# Пул решателей с общей памятью для больших пачек (configure_solver_pool)
+solver_pool = None
+
+# Ограничение частоты запросов от одного клиента (настраивается в run_server.py)
+rate_limiter = ClientRateLimiter()
+
+# Максимальный размер тела запроса (кроме потокового маршрута)
+MAX_BODY_SIZE = 1024 * 1024
+
+# Перезапуск процессов prefork: процесс, упавший раньше WORKER_STARTUP_TIME
+# секунд после запуска, считается не запустившимся; перед его перезапуском
+# пауза RESPAWN_DELAY, удваивающаяся до MAX_RESPAWN_DELAY, а после
+# MAX_STARTUP_FAILURES таких падений подряд сервер останавливается
+WORKER_STARTUP_TIME = 5.0
+RESPAWN_DELAY = 0.1
+MAX_RESPAWN_DELAY = 5.0
+MAX_STARTUP_FAILURES = 5
+
+# Режим повышенной точности (use_precise_solver)
+precise = False
+
+# Вид комплексных корней в ответах json (use_complex_format)
+complex_format = 'string'
+
+# Метрики процесса (GET /metrics); замеры этапов включаются в run_server.py
+metrics = Metrics()
+
+# Профилирование по запросу (enable_profiling): GET /debug/profile и
+# Server-Timing для запросов с заголовком X-Calcserv-Trace: 1
+profiling = False
+profiler = SamplingProfiler()
+
+
+def use_precise_solver():
+    """
+    Включает режим повышенной точности (solve_quadratic_precise) для всех
+    маршрутов. Кэши очищаются, чтобы не отдавать ответы быстрого режима,
+    таблица решений (посчитанная быстрым решателем) и хранилище решений
+    быстрого режима отключаются.
+    """
+    global precise
+    precise = True
+    solution_cache.solver = solve_quadratic_precise
+    solution_cache.discriminant = precise_discriminant
+    solution_cache.table = None
+    if solution_cache.store is not None and not solution_cache.store.precise:
+        solution_cache.store = None
+    solution_cache.clear()
+    response_cache.clear()
+    coalescer.clear()
+
+
+def configure_solver_pool(workers, chunk_size=DEFAULT_CHUNK_SIZE, min_items=DEFAULT_MIN_ITEMS):
+    """
+    Решать пачки не меньше min_items уравнений в workers процессах
+    (solver_pool.py); workers=0 - в процессе сервера. Списки запросов идут
+    в тот же пул со своим порогом (list_solver.min_items).
+
+    Процессы запускаются при первой большой пачке: в режиме prefork у
+    каждого процесса сервера - свои.
+    """
+    global solver_pool
+    close_solver_pool()
+    if workers > 0:
+        solver_pool = SolverPool(workers, chunk_size, min_items=min_items)
+    list_solver.pool = solver_pool
+
+
+def close_solver_pool():
+    global solver_pool
+    if solver_pool is not None:
+        solver_pool.close()
+        solver_pool = None
+    list_solver.pool = None
+
+
+atexit.register(close_solver_pool)
+
+
+def solve_arrays(a, b, c):
+    """
+    solve_quadratic_arrays, для больших пачек - в пуле решателей.
+    """
+    if solver_pool is not None and solver_pool.used_for(len(a)):
+        return solver_pool.solve_arrays(a, b, c)
+    return solve_quadratic_arrays(a, b, c)
+
+
+def use_complex_format(name):
+    """
+    Вид комплексных корней в ответах json: 'string' ("(1+2j)", по умолчанию)
+    или 'object' ({"re": 1.0, "im": 2.0}). Готовые ответы прежнего вида
+    выбрасываются из кэша.
+    """
+    global complex_format
+    if name not in COMPLEX_FORMATS:
+        raise ValueError(f"Unknown complex format: {name}")
+    complex_format = name
+    response_cache.clear()
+    coalescer.clear()
+
+
+class RouteError(Exception):
+    """
+    Ошибка, о которой обработчик маршрута сообщает своим кодом ответа
+    (а не 400, как при None).
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def encode_response(content_type, content, extra_headers=()):
+    """
+    Кодирует тело ответа вместе с заголовками (кроме строки статуса,
+    Server и Date), чтобы отправить ответ одной записью в сокет.
+    """
+    lines = [f"Content-Type: {content_type}", f"Content-Length: {len(content)}"]
+    lines.extend(f"{name}: {value}" for name, value in extra_headers)
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + content
+
+
+def encode_json_response(response):
+    """
+    Кодирует json ответа (строку или байты UTF-8) с заголовками для API.
+    """
+    if isinstance(response, str):
+        response = response.encode('utf-8')
+    return encode_response('application/json', response, [('Access-Control-Allow-Origin', '*')])
+
+
+def error_page(status, message, extra_headers=()):
+    """
+    Ответ об ошибке в том же формате, что и BaseHTTPRequestHandler.send_error.
+
+    Возвращает (код ответа, закодированные заголовки и тело)
+    """
+    status = HTTPStatus(status)
+    content = DEFAULT_ERROR_MESSAGE % {
+        'code': status.value,
+        'message': html.escape(message, quote=False),
+        'explain': html.escape(status.description, quote=False),
+    }
+    return status.value, encode_response(
+        DEFAULT_ERROR_CONTENT_TYPE, content.encode('utf-8', 'replace'), extra_headers,
+    )
+
+
+class HttpDate:
+    """
+    Значение заголовка Date, пересчитывается не чаще раза в секунду.
+    """
+
+    def __init__(self):
+        self.second = None
+        self.value = None
+
+    def __call__(self):
+        now = int(time.time())
+        if now != self.second:
+            self.value = formatdate(now, usegmt=True)
+            self.second = now
+        return self.value
+
+
+http_date = HttpDate()
+
+
+def calculate_quadratic(body, timer=None):
+    """
+    Решает одно уравнение из тела запроса.
+
+    timer - StageTimer для замера этапов (None - без замеров)
+
+    Возвращает закодированный ответ (encode_json_response) или None,
+    если запрос некорректный
+    """
+    if body.lstrip()[:1] in (b'[', '['):
+        return calculate_quadratic_list(body, timer)
+
+    # Парсим коэффиценты из json
+    a, b, c = parse_request(body)
+    if timer is not None:
+        timer.lap('parse')
+
+    if a is None or b is None or c is None:
+        return None
+
+    key = coefficients_key(a, b, c)
+    response = response_cache.get(key)
+    if response is not None:
+        return response
+
+    def compute():
+        # Используем функцию из quadratic.py через кэш
+        roots, discriminant = solution_cache.solve(a, b, c)
+        if timer is not None:
+            timer.lap('solve')
+
+        # Собираем ответ в формате json по шаблону (response_encoder.py)
+        response = encode_json_response(encode_result(roots, discriminant, complex_format=complex_format))
+        if timer is not None:
+            timer.lap('serialize')
+        response_cache.put(key, response)
+        return response
+
+    # Ключ - точная тройка: у пропорциональных троек дискриминанты разные
+    response, shared = coalescer.do(key, compute)
+    if shared and timer is not None:
+        timer.lap('coalesce')
+    return response
+
+
+def calculate_quadratic_list(body, timer=None):
+    """
+    Решает список обычных запросов (request_list.py).
+
+    Возвращает закодированный ответ (список) или None, если тело - не список;
+    для слишком длинного списка бросает RouteError (413)
+    """
+    items = parse_request_list(body)
+    if timer is not None:
+        timer.lap('parse')
+
+    if items is None:
+        return None
+    if len(items) > list_solver.max_items:
+        raise RouteError(413, f"Request list has {len(items)} items, at most {list_solver.max_items} are allowed")
+
+    results = solve_request_list(items, list_solver, precise)
+    if timer is not None:
+        timer.lap('solve')
+
+    response = encode_json_response(encode_list(results, complex_format))
+    if timer is not None:
+        timer.lap('serialize')
+    return response
+
+
+def calculate_quadratic_batch(body, timer=None):
+    """
+    Решает пачку уравнений из тела запроса одним векторизованным вызовом.
+
+    Возвращает закодированный ответ (список) или None, если запрос некорректный
+    """
+    a, b, c = parse_batch_request(body)
+    if timer is not None:
+        timer.lap('parse')
+
+    if a is None or b is None or c is None:
+        return None
+
+    if precise:
+        results = solve_quadratic_batch(a, b, c, precise=True)
+    else:
+        results = unpack_solutions(*solve_arrays(a, b, c))
+    if timer is not None:
+        timer.lap('solve')
+
+    response = encode_json_response(encode_batch(results, complex_format))
+    if timer is not None:
+        timer.lap('serialize')
+    return response
+
+
+def calculate_quadratic_binary(body, timer=None):
+    """
+    Решает пачку уравнений в двоичном формате (binary_protocol).
+
+    Возвращает закодированный ответ или None, если длина тела не кратна
+    размеру тройки коэффициентов
+    """
+    coefficients = decode_request(body)
+    if timer is not None:
+        timer.lap('parse')
+
+    if coefficients is None:
+        return None
+
+    if precise:
+        results = solve_quadratic_batch(*coefficients, precise=True)
+        if timer is not None:
+            timer.lap('solve')
+        content = encode_solutions(results)
+    else:
+        kinds, roots, discriminants = solve_arrays(*coefficients)
+        if timer is not None:
+            timer.lap('solve')
+        content = encode_arrays(kinds, roots, discriminants)
+
+    response = encode_response(BINARY_CONTENT_TYPE, content, [('Access-Control-Allow-Origin', '*')])
+    if timer is not None:
+        timer.lap('serialize')
+    return response
+
+
+def equation_route(solver, batch=False):
+    """
+    Обработчик POST /calculate?<вид> (или &batch) для вида уравнения из
+    реестра solvers.py.
+
+    Возвращает функцию (тело, timer) -> закодированный ответ или None,
+    если запрос некорректный
+    """
+    def calculate(body, timer=None):
+        columns = parse_equation_request(body, solver.coefficients, batch, solver.vector)
+        if timer is not None:
+            timer.lap('parse')
+
+        if columns is None:
+            return None
+
+        try:
+            results = solver.solve_batch(*columns) if batch else [solver.solve(*columns)]
+        except ValueError:
+            # Например, слишком большая степень многочлена
+            return None
+        if timer is not None:
+            timer.lap('solve')
+
+        if batch:
+            response = encode_json_response(encode_batch(results, complex_format))
+        else:
+            response = encode_json_response(encode_result(*results[0], complex_format=complex_format))
+        if timer is not None:
+            timer.lap('serialize')
+        return response
+
+    return calculate
+
+
+# Потоковый пакетный маршрут: NDJSON в запросе, chunked NDJSON в ответе
+STREAM_PATH = '/calculate?quadratic&stream'
+
+# Сколько строк решать за раз в потоковом режиме
+STREAM_CHUNK_SIZE = 1024
+
+
+# Маршруты POST запросов: по маршруту на каждый вид уравнения из реестра,
+# у квадратных - свои обработчики (кэши, режим повышенной точности)
+POST_ROUTES = {}
+for _name, _solver in SOLVERS.items():
+    POST_ROUTES[f'/calculate?{_name}'] = equation_route(_solver)
+    POST_ROUTES[f'/calculate?{_name}&batch'] = equation_route(_solver, batch=True)
+POST_ROUTES.update({
+    '/calculate?quadratic': calculate_quadratic,
+    '/calculate?quadratic&batch': calculate_quadratic_batch,
+})
+
+
+# Маршруты POST запросов с телом application/x-calcserv
+BINARY_ROUTES = {
+    '/calculate?quadratic': calculate_quadratic_binary,
+    '/calculate?quadratic&batch': calculate_quadratic_binary,
+}
+
+
+NOT_FOUND_MESSAGE = f"Use POST /calculate?<{'|'.join(SOLVERS)}>"
+
+
+def post_route(path, content_type=None, accept=None):
+    """
+    Выбирает обработчик POST запроса по пути и формату тела (Content-Type).
+
+    Двоичный запрос получает двоичный ответ, поэтому Accept должен его допускать.
+    Возвращает (200, обработчик) или (код ошибки, текст ошибки)
+    """
+    if media_type(content_type) == BINARY_CONTENT_TYPE:
+        calculate = BINARY_ROUTES.get(path)
+        if calculate is not None and not accepts_binary(accept):
+            return 406, f"Only {BINARY_CONTENT_TYPE} responses are available for {BINARY_CONTENT_TYPE} requests"
+    else:
+        calculate = POST_ROUTES.get(path)
+
+    if calculate is None:
+        return 404, NOT_FOUND_MESSAGE
+    return 200, calculate
+
+
+def all_cache_stats():
+    """
+    Статистика кэшей решений и ответов (и таблицы решений и постоянного
+    хранилища, если они есть).
+    """
+    stats = {
+        "solutions": solution_cache.stats(),
+        "responses": response_cache.stats(),
+    }
+    if solution_cache.table is not None:
+        stats["lookup"] = solution_cache.table.stats()
+    if solution_cache.store is not None:
+        stats["store"] = solution_cache.store.stats()
+    return stats
+
+
+def cache_stats():
+    """
+    Статистика кэшей (объединения запросов и пула решателей) в формате json.
+    """
+    stats = all_cache_stats()
+    stats["coalescing"] = coalescer.stats()
+    if solver_pool is not None:
+        stats["pool"] = solver_pool.stats()
+    return encode_json_response(json.dumps(stats))
+
+
+def prometheus_metrics():
+    """
+    Метрики сервера и кэшей в текстовом формате Prometheus.
+    """
+    content = metrics.render(all_cache_stats(), coalescer.stats())
+    return encode_response(METRICS_CONTENT_TYPE, content.encode('utf-8'))
+
+
+def healthz(query=None):
+    """
+    Готовность сервера: 200, когда прогрев завершён, иначе 503.
+    Тело - состояние шагов прогрева.
+    """
+    return 200 if warmup.ready else 503, encode_json_response(json.dumps(warmup.report()))
+
+
+def debug_profile(query):
+    """
+    Профилирование по запросу (profiler.py).
+
+    ?seconds=N[&interval=мс] - начать сеанс на N секунд (202);
+    без параметров - свёрнутые стеки последнего сеанса (200, text/plain)
+    или состояние идущего сеанса (202)
+    """
+    if 'seconds' in query:
+        try:
+            seconds = float(query['seconds'][0])
+            interval = float(query['interval'][0]) / 1000 if 'interval' in query else None
+        except ValueError:
+            return error_page(400, "seconds and interval must be numbers")
+        if not 0 < seconds <= MAX_PROFILE_SECONDS or (interval is not None and not 0 < interval <= 1):
+            return error_page(400, f"seconds must be in (0, {MAX_PROFILE_SECONDS}], interval in (0, 1000] ms")
+        if profiler.running:
+            return error_page(409, "Profiler is already running")
+        profiler.start(seconds, interval)
+        return 202, encode_json_response(json.dumps(profiler.report()))
+
+    if profiler.running:
+        return 202, encode_json_response(json.dumps(profiler.report()))
+    if profiler.started is None:
+        return error_page(404, "No profile yet: start one with ?seconds=N")
+    return 200, encode_response('text/plain; charset=utf-8', profiler.collapsed().encode('utf-8'))
+
+
+# Служебные маршруты GET запросов: путь без строки запроса -> функция,
+# которая получает параметры (parse_qs) и возвращает код ответа и закодированный ответ
+GET_ROUTES = {
+    '/stats/cache': lambda query: (200, cache_stats()),
+    '/metrics': lambda query: (200, prometheus_metrics()),
+    '/healthz': healthz,
+}
+
+# Служебные маршруты профилирования (добавляются enable_profiling)
+PROFILING_ROUTES = {
+    '/debug/profile': debug_profile,
+}
+
+
+def enable_profiling():
+    """
+    Включает GET /debug/profile и Server-Timing по заголовку X-Calcserv-Trace.
+    """
+    global profiling
+    profiling = True
+    GET_ROUTES.update(PROFILING_ROUTES)
+
+
+def get_route(path):
+    """
+    Выбирает служебный маршрут GET запроса.
+
+    Возвращает функцию без аргументов (с уже разобранными параметрами) или None
+    """
+    path, _, query = path.partition('?')
+    route = GET_ROUTES.get(path)
+    if route is None:
+        return None
+    return lambda: route(parse_qs(query))
+
+
+def trace_timer(timer, header):
+    """
+    Таймер запроса: TraceTimer, если запрошен Server-Timing (header - значение
+    заголовка X-Calcserv-Trace), иначе timer как есть.
+    """
+    if profiling and header == '1':
+        return TraceTimer(timer)
+    return timer
+
+
+def with_server_timing(timer, response):
+    """
+    Добавляет к закодированному ответу заголовок Server-Timing, если запрос трассируется.
+    """
+    if type(timer) is TraceTimer:
+        return timer.server_timing() + response
+    return response
+
+
+# Статические файлы: путь запроса -> (файл в папке ui, Content-Type)
+STATIC_FILES = {
+    '/': ('index.html', 'text/html'),
+    '/styles.css': ('styles.css', 'text/css'),
+    '/script.js': ('script.js', 'application/javascript'),
+}
+
+
+# Файлы фронтенда держатся в памяти: загружаются при прогреве или первом запросе
+static_files = StaticFiles(UI_DIR, STATIC_FILES)
+
+
+def warm_numpy():
+    """
+    Импортирует NumPy и прогоняет векторизованный и двоичный пути.
+    """
+    encode_arrays(*solve_quadratic_arrays(*decode_request(bytes(24))))
+
+
+def warm_solvers():
+    """
+    Импортирует модули всех решателей из реестра.
+    """
+    for solver in SOLVERS.values():
+        if solver.vector:
+            solver.solve([1.0, 1.0, 1.0, 1.0])
+        else:
+            solver.solve(*[1.0] * len(solver.coefficients))
+
+
+# Прогрев после старта (warmup.py); run_server.py добавляет свои шаги
+warmup = Warmup()
+warmup.add('static', static_files.load_all)
+warmup.add('numpy', warm_numpy)
+warmup.add('solvers', warm_solvers)
+
+
+def start_warmup(mode, background=True):
+    """
+    Прогрев в режиме mode: eager - сразу, в текущем потоке; background -
+    в фоновом потоке (если background, то есть сокет уже открыт);
+    off - без прогрева, всё загружается при первом использовании.
+    """
+    if mode == 'off':
+        warmup.skip()
+    elif mode == 'eager':
+        if not warmup.ready:
+            warmup.run()
+    elif mode == 'background':
+        if background and not warmup.ready and warmup.thread is None:
+            warmup.start()
+    else:
+        raise ValueError(f"Unknown warmup mode: {mode}")
+
+
+def send_buffers(sock, buffers):
+    """
+    Отправляет несколько буферов одним системным вызовом sendmsg, без
+    склеивания (и копирования) заголовков с телом.
+    """
+    if not hasattr(sock, 'sendmsg'):
+        for buffer in buffers:
+            sock.sendall(buffer)
+        return
+
+    buffers = [memoryview(buffer) for buffer in buffers if buffer]
+    while buffers:
+        sent = sock.sendmsg(buffers)
+        # Убираем отправленное: sendmsg может отправить не всё
+        while buffers and sent >= len(buffers[0]):
+            sent -= len(buffers[0])
+            buffers.pop(0)
+        if buffers and sent:
+            buffers[0] = buffers[0][sent:]
 
 
 class QuadraticHandler(BaseHTTPRequestHandler):
-    
+
+    # Таймаут чтения из сокета в секундах: медленный клиент не держит поток вечно
+    timeout = 10.0
+
+    # Максимальный размер тела запроса (413 для большего)
+    max_body_size = MAX_BODY_SIZE
+
+    def setup(self):
+        super().setup()
+        metrics.connection_opened()
+
+    def finish(self):
+        try:
+            super().finish()
+        finally:
+            metrics.connection_closed()
+
+    def log_request(self, code='-', size='-'):
+        # Через log_request проходят все ответы, включая send_error
+        if code == '-':
+            return
+        metrics.count_status(int(code))
+        log_access(
+            self.client_address[0], self.command, self.path, int(code),
+            size if isinstance(size, int) else None, getattr(self, 'started', None),
+        )
+
+    def log_message(self, format, *args):
+        # Вместо строки в stderr на каждый вызов - запись в журнал (structured_log.py)
+        logger.warning(format, *args, extra={"fields": {"client": self.client_address[0]}})
+
     def do_GET(self):
+        self.started = time.perf_counter()
+        metrics.request_started()
+        try:
+            if self.admit():
+                self.handle_get()
+        finally:
+            metrics.request_finished()
+
+    def do_POST(self):
+        self.started = time.perf_counter()
+        metrics.request_started()
+        try:
+            if self.admit():
+                self.handle_post()
+        finally:
+            metrics.request_finished()
+
+    def admit(self):
+        """
+        Проверяет частоту запросов клиента, при превышении отвечает 429.
+        """
+        retry_after = rate_limiter.acquire(self.client_address[0])
+        if not retry_after:
+            return True
+        self.send_error_page(429, "Too many requests", [('Retry-After', retry_after)])
+        return False
+
+    def handle_get(self):
         """
         Обработка GET запросов - отдаём HTML, CSS и JS файлы
         """
-        # Определяем, что отправляем в браузер (html css js)
-        if self.path == '/':
-            filename = 'index.html'
-            content_type = 'text/html'
-        elif self.path == '/styles.css':
-            filename = 'styles.css'
-            content_type = 'text/css'
-        elif self.path == '/script.js':
-            filename = 'script.js'
-            content_type = 'application/javascript'
-        else:
-            self.send_error(404, "Not found")
+        route = get_route(self.path)
+        if route is not None:
+            self.send_encoded(*route())
             return
-        
-        # Путь к файлам внутри папки ui
-        full_file_path = os.path.join(UI_DIR, filename)
-        
-        # Если любой файл в папке ui не найден-ошибка 404
-        if not os.path.exists(full_file_path):
-            self.send_error(404, f"{filename} not found")
+
+        status, asset = static_files.lookup(self.path)
+
+        if status != 200:
+            self.send_error(status, asset)
             return
-        
-        # Читаем файлы в бинарном режиме и отправляем
-        try:
-            with open(full_file_path, 'rb') as file:
-                file_content = file.read()
-            
-            self.send_response(200)
-            self.send_header('Content-Type', content_type)
-            self.end_headers()
-            self.wfile.write(file_content)
-
-        # Обработка ошибок   
-        except FileNotFoundError:
-            self.send_error(404, f"{filename} not found")
-        except PermissionError:
-            self.send_error(403, f"No access to {filename}")
-        except Exception as error:
-            self.send_error(500, f"Server error: {str(error)}")
-    
 
-    def do_POST(self):
+        status, headers, content = asset.respond(
+            self.headers.get('If-None-Match'), self.headers.get('Accept-Encoding'),
+        )
+
+        self.log_request(status, len(content))
+        head = '%s %d %s\r\nServer: %s\r\nDate: %s\r\n%s\r\n' % (
+            self.protocol_version, status, self.responses[status][0],
+            self.version_string(), http_date(),
+            ''.join(f"{name}: {value}\r\n" for name, value in headers),
+        )
+        send_buffers(self.connection, [head.encode('latin-1'), content])
+
+    def handle_post(self):
         """
         Обработка POST запросов
         """
         try:
-            if self.path != '/calculate?quadratic':
-                self.send_error(404, "Use POST /calculate?quadratic")
+            if self.path == STREAM_PATH:
+                self.stream_quadratic()
                 return
-            
+
+            status, calculate = post_route(self.path, self.headers.get('Content-Type'), self.headers.get('Accept'))
+            if status != 200:
+                self.send_error(status, calculate)
+                return
+
+            timer = trace_timer(metrics.timer(), self.headers.get(TRACE_HEADER))
+
             # Читаем запрос
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
-            
-            # Парсим коэффиценты из json
-            a, b, c = parse_request(body)
-            
-            if a is None or b is None or c is None:
+            try:
+                content_length = int(self.headers.get('Content-Length', 0))
+            except ValueError:
+                content_length = -1
+            if content_length < 0:
+                self.send_error(400, "Bad Content-Length")
+                return
+            if content_length > self.max_body_size:
+                self.send_error(413, f"Request body is larger than {self.max_body_size} bytes")
+                return
+
+            body = self.rfile.read(content_length)
+            if timer is not None:
+                timer.lap('read')
+
+            response = calculate(body, timer)
+
+            if response is None:
                 self.send_error(400, "Invalid request")
                 return
-            
-            # Используем функцию из quadratic.py
-            roots, discriminant = solve_quadratic(a, b, c)
-            
-            # Создаем ответ в формате json при помощи функции из парсера
-            response = create_response(roots, discriminant)
-            
+
             # Отправляем ответ
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(response.encode('utf-8'))
-            
+            self.send_json(with_server_timing(timer, response))
+            if timer is not None:
+                timer.lap('write')
+
+        except RouteError as error:
+            self.send_error(error.status, str(error))
+
+        except TimeoutError:
+            self.send_error(408, "Request body timed out")
+
         except Exception as e:
             self.send_error(500, f"Server error: {str(e)}")
 
+    def stream_quadratic(self):
+        """
+        Потоковое решение пакета: тело читается по частям (NDJSON, одна строка -
+        один запрос), ответы уходят кусками (Transfer-Encoding: chunked) по мере
+        решения. Память сервера не зависит от размера пакета.
+        """
+        try:
+            lines = iter_lines(request_body(self.rfile, self.headers))
+        except BodyError as error:
+            self.send_error(400, str(error))
+            return
+
+        # chunked есть только в HTTP/1.1; клиенту HTTP/1.0 конец ответа
+        # обозначает закрытие соединения
+        chunked = self.request_version == 'HTTP/1.1'
+        headers = [
+            ('Content-Type', 'application/x-ndjson'),
+            ('Access-Control-Allow-Origin', '*'),
+            ('Connection', 'close'),
+        ]
+        if chunked:
+            headers.append(('Transfer-Encoding', 'chunked'))
+
+        self.close_connection = True
+        self.log_request(200)
+        self.wfile.write(b'%s 200 OK\r\nServer: %s\r\nDate: %s\r\n%s\r\n' % (
+            (self.request_version if chunked else self.protocol_version).encode('latin-1'),
+            self.version_string().encode('latin-1'),
+            http_date().encode('latin-1'),
+            ''.join(f"{name}: {value}\r\n" for name, value in headers).encode('latin-1'),
+        ))
+
+        writer = ChunkedWriter(self.wfile) if chunked else self.wfile
+        try:
+            for responses, _ in iter_solved_chunks(lines, STREAM_CHUNK_SIZE, precise, complex_format):
+                writer.write(('\n'.join(responses) + '\n').encode('utf-8'))
+        except (BodyError, TimeoutError) as error:
+            # Ответ уже начат: обрываем его без завершающего куска,
+            # чтобы клиент увидел ошибку
+            self.log_error("Stream aborted: %s", error)
+            return
+        except Exception as error:
+            # Ошибки отдельных строк уходят в поток ответами об ошибке;
+            # сюда попадает только неожиданное. send_error здесь нельзя:
+            # заголовки уже отправлены, второй ответ испортил бы поток
+            self.log_error("Stream aborted: %s: %s", type(error).__name__, error)
+            return
+
+        if chunked:
+            writer.close()
+
+    def send_json(self, response):
+        """
+        Отправляет закодированный ответ (encode_json_response) одной записью
+        """
+        self.send_encoded(200, response)
+
+    def send_error_page(self, status, message, extra_headers=()):
+        """
+        Как send_error, но с дополнительными заголовками (например Retry-After).
+        """
+        self.close_connection = True
+        self.send_encoded(*error_page(status, message, [('Connection', 'close'), *extra_headers]))
+
+    def send_encoded(self, status, response):
+        """
+        Отправляет закодированные заголовки и тело (encode_response) одной записью
+        """
+        self.log_request(status)
+        self.wfile.write(b'%s %d %s\r\nServer: %s\r\nDate: %s\r\n%s' % (
+            self.protocol_version.encode('latin-1'),
+            status,
+            self.responses[status][0].encode('latin-1'),
+            self.version_string().encode('latin-1'),
+            http_date().encode('latin-1'),
+            response,
+        ))
+
+
+def busy_response():
+    """
+    Ответ 503 для соединения, которое сервер не может принять в обработку.
+    """
+    _, response = error_page(503, "Server is busy", [('Connection', 'close'), ('Retry-After', RETRY_AFTER)])
+    return b'HTTP/1.0 503 Service Unavailable\r\nServer: %s\r\nDate: %s\r\n%s' % (
+        f"{QuadraticHandler.server_version} {QuadraticHandler.sys_version}".encode('latin-1'),
+        http_date().encode('latin-1'),
+        response,
+    )
+
+
+class ThreadPoolHTTPServer(ThreadingHTTPServer):
+    """
+    HTTP сервер с ограниченным пулом потоков.
+
+    Без max_in_flight, пока все потоки заняты, сервер не принимает новые
+    соединения, и они ждут в очереди сокета (backlog). С max_in_flight
+    сервер принимает до max_in_flight соединений (в обработке и в очереди
+    пула), а остальным сразу отвечает 503 с Retry-After.
+    """
+
+    def __init__(self, server_address, handler_class, threads=8, backlog=128, max_in_flight=0):
+        self.request_queue_size = backlog
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='calcserv')
+        self.slots = threading.BoundedSemaphore(threads)
+        self.in_flight = InFlightLimiter(max_in_flight)
+        super().__init__(server_address, handler_class)
+
+    def process_request(self, request, client_address):
+        if self.in_flight.limit:
+            if not self.in_flight.acquire():
+                self.reject(request)
+                return
+            release = self.in_flight.release
+        else:
+            # Ждём свободный поток, не забирая лишние соединения из backlog
+            self.slots.acquire()
+            release = self.slots.release
+
+        try:
+            self.executor.submit(self.process_request_thread, request, client_address, release)
+        except RuntimeError:
+            # Пул уже остановлен
+            release()
+            self.shutdown_request(request)
+
+    def process_request_thread(self, request, client_address, release):
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            release()
+
+    def reject(self, request):
+        """
+        Отвечает 503 без передачи соединения в пул и закрывает его.
+        """
+        metrics.count_status(503)
+        try:
+            request.setblocking(False)
+            try:
+                # Забираем уже пришедший запрос: закрытие сокета с непрочитанными
+                # данными отправило бы клиенту RST вместо ответа
+                request.recv(65536)
+            except OSError:
+                pass
+            request.send(busy_response())
+        except OSError:
+            pass
+        self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        # Дожидаемся запросов, которые уже обрабатываются
+        self.executor.shutdown(wait=True)
+
+
+class ReusePortHTTPServer(ThreadPoolHTTPServer):
+    """
+    Сервер для pre-fork режима: каждый процесс слушает свой сокет
+    на общем порту (SO_REUSEPORT), ядро распределяет соединения между ними.
+    """
+
+    def server_bind(self):
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+
+def create_server(host, port, mode='threads', threads=8, backlog=128, max_in_flight=0):
+    """
+    Создаёт HTTP сервер для выбранного режима.
+
+    Режимы:
+        single - один поток, как стандартный HTTPServer
+        threads - пул потоков
+        prefork - пул потоков в каждом из процессов с общим портом
+
+    max_in_flight - сколько соединений принимать в обработку и очередь пула
+    (0 - ждать свободный поток в очереди сокета), не действует в режиме single
+    """
+    if mode == 'single':
+        return HTTPServer((host, port), QuadraticHandler)
+    if mode == 'threads':
+        return ThreadPoolHTTPServer((host, port), QuadraticHandler, threads, backlog, max_in_flight)
+    if mode == 'prefork':
+        return ReusePortHTTPServer((host, port), QuadraticHandler, threads, backlog, max_in_flight)
+    raise ValueError(f"Unknown server mode: {mode}")
+
+
+def serve(server):
+    """
+    Обслуживает запросы до SIGTERM/SIGINT, затем корректно завершается:
+    новые соединения не принимаются, начатые запросы дорабатываются.
+    """
+    def stop(signum, frame):
+        # shutdown() ждёт выхода из serve_forever, поэтому вызываем его из другого потока
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def run_prefork(host, port, workers, threads=8, backlog=128, max_in_flight=0, warmup_mode='background'):
+    """
+    Запускает workers процессов, каждый со своим сервером на общем порту.
+
+    При warmup_mode='eager' прогрев выполняется в родителе до fork, и
+    процессы получают уже загруженные модули; при 'background' каждый
+    процесс прогревается сам после открытия сокета.
+
+    Упавший процесс перезапускается, не запустившийся - с нарастающей паузой;
+    после MAX_STARTUP_FAILURES неудачных запусков подряд процессы
+    останавливаются, и родитель выходит с кодом 1. По SIGTERM/SIGINT
+    процессам рассылается SIGTERM, и родитель ждёт их завершения.
+    """
+    # pid -> время запуска
+    children = {}
+    stopping = False
+    failures = 0
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            # Обработчики родителя рассылают SIGTERM по его списку процессов:
+            # до serve() процесс завершается по сигналу как обычно
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            code = 0
+            try:
+                server = create_server(host, port, 'prefork', threads, backlog, max_in_flight)
+                start_warmup(warmup_mode)
+                serve(server)
+            except Exception as error:
+                print(f"Worker {os.getpid()} failed: {error}", file=sys.stderr)
+                code = 1
+            finally:
+                # os._exit не вызывает atexit: дописываем журнал и профиль
+                # и останавливаем решатели сами
+                close_solver_pool()
+                stop_profile()
+                stop_logging()
+                os._exit(code)
+        children[pid] = time.monotonic()
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            os.kill(pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for _ in range(workers):
+        spawn()
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        started = children.pop(pid, None)
+        if stopping or os.waitstatus_to_exitcode(status) == 0:
+            continue
+
+        if started is not None and time.monotonic() - started < WORKER_STARTUP_TIME:
+            failures += 1
+        else:
+            failures = 0
+        if failures >= MAX_STARTUP_FAILURES:
+            print(f"Worker {pid} failed to start {failures} times in a row, stopping", file=sys.stderr)
+            stop(None, None)
+            continue
+
+        print(f"Worker {pid} exited unexpectedly, restarting", file=sys.stderr)
+        if failures:
+            time.sleep(min(RESPAWN_DELAY * 2 ** (failures - 1), MAX_RESPAWN_DELAY))
+        if not stopping:
+            spawn()
+
+    if failures >= MAX_STARTUP_FAILURES:
+        sys.exit(1)
+
+
+def run(host='localhost', port=8000, mode='threads', workers=None, threads=8, backlog=128, max_in_flight=0,
+        warmup_mode='background'):
+    """
+    Запускает сервер в выбранном режиме.
+
+    workers - число процессов в режиме prefork (по умолчанию по числу ядер)
+    warmup_mode - 'background', 'eager' или 'off' (см. start_warmup)
+    """
+    if warmup_mode == 'eager':
+        start_warmup('eager')
+    print(f"Server: http://{host}:{port} ({mode})")
+
+    if mode == 'prefork':
+        run_prefork(host, port, workers or os.cpu_count() or 1, threads, backlog, max_in_flight, warmup_mode)
+    else:
+        server = create_server(host, port, mode, threads, backlog, max_in_flight)
+        start_warmup(warmup_mode)
+        serve(server)
+
 
 if __name__ == '__main__':
-    server = HTTPServer(('localhost', 8000), QuadraticHandler)
-    print("Server: http://localhost:8000")
-    server.serve_forever()
\ No newline at end of file
+    run()
@@ -0,0 +1,287 @@
+"""
+Пул процессов для решения больших пачек через общую память.
+
+Векторизованное решение большой пачки держит GIL, и остальные соединения
+процесса ждут. SolverPool отдаёт такие пачки постоянным процессам-решателям,
+не передавая сами коэффициенты через pickle: все процессы отображают один
+сегмент multiprocessing.shared_memory, разбитый на слоты по chunk_size троек.
+
+Слот - входные столбцы a, b, c и выходные массивы в формате
+solve_quadratic_arrays (kinds, roots, discriminants):
+
+    | a | b | c | discriminants | roots (2 комплексных) | kinds |
+      8   8   8         8                  32               1     байт на тройку
+
+Поток запроса копирует кусок пачки в свободный слот и кладёт в очередь
+задач только номер слота и число троек. Решатель считает кусок и пишет
+результат в тот же слот, в очередь ответов уходит снова только номер.
+Свободные слоты выдаются по кругу (FIFO), поэтому сегмент работает как
+кольцевой буфер на workers * depth кусков.
+
+    pool = SolverPool(workers=4)
+    kinds, roots, discriminants = pool.solve_arrays(a, b, c)
+"""
+import multiprocessing
+import queue
+import threading
+from multiprocessing import shared_memory
+
+from quadratic import solve_quadratic_arrays
+
+
+DEFAULT_CHUNK_SIZE = 65536
+
+# Сколько кусков на решатель может быть в работе одновременно
+DEFAULT_DEPTH = 2
+
+# С какого размера пачки решать в пуле (меньшие быстрее решить на месте)
+DEFAULT_MIN_ITEMS = 20000
+
+# Байт на тройку в слоте: a, b, c, дискриминант, два комплексных корня, вид
+BYTES_PER_ITEM = 8 * 3 + 8 + 16 * 2 + 1
+
+
+def slot_size(chunk_size):
+    # Слоты выровнены по 64 байта (строка кэша), массивы внутри - по 8 и 16
+    return -(-chunk_size * BYTES_PER_ITEM // 64) * 64
+
+
+def slot_views(buffer, slot, chunk_size):
+    """
+    Массивы слота поверх буфера общей памяти (без копирования):
+    (a, b, c, kinds, roots, discriminants).
+    """
+    import numpy as np
+
+    offset = slot * slot_size(chunk_size)
+    a, b, c, discriminants = (
+        np.ndarray(chunk_size, dtype=np.float64, buffer=buffer, offset=offset + index * 8 * chunk_size)
+        for index in range(4)
+    )
+    roots = np.ndarray((chunk_size, 2), dtype=np.complex128, buffer=buffer, offset=offset + 32 * chunk_size)
+    kinds = np.ndarray(chunk_size, dtype=np.int8, buffer=buffer, offset=offset + 64 * chunk_size)
+    return a, b, c, kinds, roots, discriminants
+
+
+def attach(name):
+    """
+    Подключается к сегменту общей памяти, которым владеет родитель.
+    """
+    try:
+        # Python 3.13+: не регистрировать сегмент в resource_tracker решателя
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        # Раньше регистрация повторная, но безвредная: решатели forkserver
+        # и spawn пользуются resource_tracker родителя, а сегмент удаляет
+        # close() родителя
+        return shared_memory.SharedMemory(name)
+
+
+def worker_main(name, slots, chunk_size, tasks, done):
+    """
+    Цикл процесса-решателя: (слот, число троек) из tasks -> решение в слот ->
+    (слот, ошибка или None) в done. None в tasks завершает процесс.
+    """
+    memory = attach(name)
+    views = [slot_views(memory.buf, slot, chunk_size) for slot in range(slots)]
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        slot, count = task
+        a, b, c, kinds, roots, discriminants = views[slot]
+        try:
+            kinds[:count], roots[:count], discriminants[:count] = solve_quadratic_arrays(
+                a[:count], b[:count], c[:count],
+            )
+        except Exception as error:
+            done.put((slot, f"{type(error).__name__}: {error}"))
+        else:
+            done.put((slot, None))
+
+
+class SolverPool:
+    """
+    Постоянные процессы-решатели с общей памятью.
+
+    workers - число процессов
+    chunk_size - троек в одном куске (слоте)
+    depth - слотов на процесс
+    min_items - с какого размера пачки её стоит отдавать в пул (used_for)
+    """
+
+    def __init__(self, workers, chunk_size=DEFAULT_CHUNK_SIZE, depth=DEFAULT_DEPTH, min_items=DEFAULT_MIN_ITEMS):
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.slots = workers * depth
+        self.min_items = min_items
+        self.lock = threading.Lock()
+        self.memory = None
+        self.processes = []
+        self.chunks = 0
+        self.batches = 0
+
+    def used_for(self, count):
+        return count >= self.min_items
+
+    def start(self):
+        """
+        Создаёт сегмент общей памяти и запускает решатели (при первой пачке
+        это делает solve_arrays).
+        """
+        with self.lock:
+            if self.memory is not None:
+                return
+            # forkserver, а не fork: сервер многопоточный, и копировать его
+            # в решатели опасно
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+            self.memory = shared_memory.SharedMemory(create=True, size=self.slots * slot_size(self.chunk_size))
+            self.views = [slot_views(self.memory.buf, slot, self.chunk_size) for slot in range(self.slots)]
+            self.tasks = context.SimpleQueue()
+            self.done = context.SimpleQueue()
+            self.free = queue.SimpleQueue()
+            for slot in range(self.slots):
+                self.free.put(slot)
+            # слот -> [Event, ошибка] ожидающего его потока
+            self.waiting = {}
+
+            self.processes = [
+                context.Process(
+                    target=worker_main, name=f'solver-{index}', daemon=True,
+                    args=(self.memory.name, self.slots, self.chunk_size, self.tasks, self.done),
+                )
+                for index in range(self.workers)
+            ]
+            for process in self.processes:
+                process.start()
+
+            self.collector = threading.Thread(
+                target=self.collect, args=(self.done, self.waiting), name='solver-pool', daemon=True,
+            )
+            self.collector.start()
+
+    def collect(self, done, waiting):
+        # Ответы решателей -> события ожидающих потоков
+        while True:
+            message = done.get()
+            if message is None:
+                return
+            slot, error = message
+            waiter = waiting.pop(slot)
+            waiter[1] = error
+            waiter[0].set()
+
+    def wait(self, waiter):
+        while not waiter[0].wait(1.0):
+            if self.memory is None or not all(process.is_alive() for process in self.processes):
+                self.close()
+                raise RuntimeError("Solver process exited unexpectedly")
+        if waiter[1] is not None:
+            raise RuntimeError(f"Solver failed: {waiter[1]}")
+
+    def solve_arrays(self, a, b, c):
+        """
+        Решает пачку в процессах пула, результат - как у solve_quadratic_arrays.
+        """
+        import numpy as np
+
+        if self.memory is None:
+            self.start()
+        # Если пул перезапустят, слоты этой пачки к новому не относятся
+        views, free, tasks, waiting = self.views, self.free, self.tasks, self.waiting
+
+        a, b, c = np.broadcast_arrays(
+            np.asarray(a, dtype=np.float64).ravel(),
+            np.asarray(b, dtype=np.float64).ravel(),
+            np.asarray(c, dtype=np.float64).ravel(),
+        )
+        count = len(a)
+        kinds = np.empty(count, dtype=np.int8)
+        roots = np.empty((count, 2), dtype=np.complex128)
+        discriminants = np.empty(count)
+
+        # Куски в работе: (слот, начало, конец, ожидание), по порядку отправки
+        in_flight = []
+
+        def finish():
+            slot, start, end, waiter = in_flight.pop(0)
+            self.wait(waiter)
+            _, _, _, slot_kinds, slot_roots, slot_discriminants = views[slot]
+            kinds[start:end] = slot_kinds[:end - start]
+            roots[start:end] = slot_roots[:end - start]
+            discriminants[start:end] = slot_discriminants[:end - start]
+            free.put(slot)
+
+        try:
+            for start in range(0, count, self.chunk_size):
+                # Пока держим слоты, не ждём свободный: сначала дорабатываем
+                # свой старейший кусок, иначе потоки могут ждать друг друга
+                while True:
+                    try:
+                        slot = free.get_nowait() if in_flight else free.get()
+                        break
+                    except queue.Empty:
+                        finish()
+
+                end = min(start + self.chunk_size, count)
+                slot_a, slot_b, slot_c = views[slot][:3]
+                slot_a[:end - start] = a[start:end]
+                slot_b[:end - start] = b[start:end]
+                slot_c[:end - start] = c[start:end]
+                waiter = waiting[slot] = [threading.Event(), None]
+                tasks.put((slot, end - start))
+                in_flight.append((slot, start, end, waiter))
+                self.chunks += 1
+
+            while in_flight:
+                finish()
+        except BaseException:
+            # Слоты, которые ещё считаются, вернутся в пул после ответа решателя
+            for slot, _, _, waiter in in_flight:
+                threading.Thread(target=self.reclaim, args=(free, slot, waiter), daemon=True).start()
+            raise
+
+        self.batches += 1
+        return kinds, roots, discriminants
+
+    def reclaim(self, free, slot, waiter):
+        waiter[0].wait()
+        free.put(slot)
+
+    def close(self):
+        """
+        Останавливает решатели и освобождает общую память.
+        """
+        with self.lock:
+            if self.memory is None:
+                return
+            for _ in self.processes:
+                self.tasks.put(None)
+            for process in self.processes:
+                process.join(5)
+                if process.is_alive():
+                    process.kill()
+            self.done.put(None)
+            self.collector.join(5)
+            self.processes = []
+            self.views = None
+            memory, self.memory = self.memory, None
+            try:
+                memory.close()
+            except BufferError:
+                # Массивы слотов ещё держит поток запроса: память освободится
+                # вместе с ними, имя сегмента удаляем сразу
+                pass
+            memory.unlink()
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "chunk_size": self.chunk_size,
+            "slots": self.slots,
+            "running": self.memory is not None,
+            "batches": self.batches,
+            "chunks": self.chunks,
+        }
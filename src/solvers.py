@@ -0,0 +1,74 @@
+"""
+Реестр решателей уравнений: вид уравнения -> коэффициенты и пакетный решатель.
+
+Сервер строит по реестру таблицу маршрутов POST /calculate?<вид> и
+/calculate?<вид>&batch, поэтому новый вид уравнения - это одна запись
+register(). Все решатели пакетные (векторизованные) и возвращают список
+(корни, дискриминант), который сериализует json_parser.
+
+Модули решателей (и NumPy) импортируются при первом запросе своего вида.
+"""
+import importlib
+
+
+class Solver:
+    """
+    Вид уравнения.
+
+    name - имя в маршруте (/calculate?<name>)
+    equation - запись уравнения для документации и сообщений
+    coefficients - имена коэффициентов в params запроса
+    solve_batch - решатель: столбцы коэффициентов -> список (корни, дискриминант)
+    vector - коэффициенты передаются одним списком (многочлен любой степени)
+    """
+
+    def __init__(self, name, equation, coefficients, solve_batch, vector=False):
+        self.name = name
+        self.equation = equation
+        self.coefficients = coefficients
+        self.solve_batch = solve_batch
+        self.vector = vector
+
+    def solve(self, *coefficients):
+        """
+        Решает одно уравнение: (корни, дискриминант).
+        """
+        return self.solve_batch(*([value] for value in coefficients))[0]
+
+
+def lazy(module, name):
+    """
+    Решатель, модуль которого импортируется при первом вызове.
+    """
+    solve_batch = None
+
+    def call(*columns):
+        nonlocal solve_batch
+        if solve_batch is None:
+            solve_batch = getattr(importlib.import_module(module), name)
+        return solve_batch(*columns)
+
+    call.__name__ = name
+    return call
+
+
+SOLVERS = {}
+
+
+def register(solver):
+    """
+    Добавляет вид уравнения в реестр.
+    """
+    if solver.name in SOLVERS:
+        raise ValueError(f"Solver {solver.name!r} is already registered")
+    SOLVERS[solver.name] = solver
+    return solver
+
+
+register(Solver('linear', 'ax + b = 0', ('a', 'b'), lazy('polynomial', 'solve_linear_batch')))
+register(Solver('quadratic', 'ax² + bx + c = 0', ('a', 'b', 'c'), lazy('quadratic', 'solve_quadratic_batch')))
+register(Solver('cubic', 'ax³ + bx² + cx + d = 0', ('a', 'b', 'c', 'd'), lazy('polynomial', 'solve_cubic_batch')))
+register(Solver('quartic', 'ax⁴ + bx³ + cx² + dx + e = 0', ('a', 'b', 'c', 'd', 'e'),
+                lazy('polynomial', 'solve_quartic_batch')))
+register(Solver('polynomial', 'a₀xⁿ + ... + aₙ = 0', ('coefficients',),
+                lazy('polynomial', 'solve_polynomial_batch'), vector=True))
@@ -0,0 +1,222 @@
+"""
+Кэш статических файлов фронтенда в памяти.
+
+Файлы из ui/ читаются один раз при старте и перечитываются, только если
+изменилось время модификации (проверка не чаще раза в check_interval секунд).
+Для каждого файла заранее готовятся сжатые варианты (gzip и, если установлен
+пакет brotli, br) и строгие ETag, так что запрос If-None-Match с актуальным
+ETag получает 304 без тела.
+
+Модули сжатия импортируются при первой загрузке файла, а load_all() сервер
+вызывает при прогреве (warmup.py), уже принимая соединения.
+"""
+import functools
+import hashlib
+import os
+import threading
+import time
+from email.utils import formatdate
+
+
+# Cache-Control по умолчанию: html всегда перепроверяется по ETag,
+# стили и скрипты можно брать из кэша браузера несколько минут
+DEFAULT_CACHE_CONTROL = {
+    'text/html': 'no-cache',
+}
+FALLBACK_CACHE_CONTROL = 'public, max-age=300'
+
+
+@functools.cache
+def _brotli():
+    try:
+        import brotli
+    except ImportError:  # brotli - необязательная зависимость
+        return None
+    return brotli
+
+
+def parse_accept_encoding(header):
+    """
+    Разбирает Accept-Encoding.
+
+    Возвращает множество допустимых кодировок (q > 0)
+    """
+    accepted = set()
+    for item in (header or '').split(','):
+        coding, _, params = item.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(coding)
+    return accepted
+
+
+def parse_etags(header):
+    """
+    Разбирает If-None-Match в множество ETag (без признака W/).
+    """
+    tags = set()
+    for tag in (header or '').split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag:
+            tags.add(tag)
+    return tags
+
+
+class StaticAsset:
+    """
+    Файл в памяти вместе с заранее сжатыми вариантами.
+
+    variants: кодировка -> (тело, ETag). Вариант сохраняется, только
+    если он меньше исходного файла.
+    """
+
+    def __init__(self, content_type, content, mtime, cache_control=None):
+        self.content_type = content_type
+        self.mtime = mtime
+        self.last_modified = formatdate(mtime, usegmt=True)
+        self.cache_control = cache_control or DEFAULT_CACHE_CONTROL.get(content_type, FALLBACK_CACHE_CONTROL)
+
+        digest = hashlib.sha256(content).hexdigest()[:32]
+        self.variants = {'identity': (content, f'"{digest}"')}
+
+        import gzip
+
+        compressed = gzip.compress(content, compresslevel=9, mtime=0)
+        if len(compressed) < len(content):
+            self.variants['gzip'] = (compressed, f'"{digest}-gzip"')
+
+        brotli = _brotli()
+        if brotli is not None:
+            compressed = brotli.compress(content)
+            if len(compressed) < len(content):
+                self.variants['br'] = (compressed, f'"{digest}-br"')
+
+        self.etags = {etag for _, etag in self.variants.values()}
+
+    def choose_encoding(self, accept_encoding):
+        accepted = parse_accept_encoding(accept_encoding)
+        for encoding in ('br', 'gzip'):
+            if encoding in self.variants and (encoding in accepted or '*' in accepted):
+                return encoding
+        return 'identity'
+
+    def respond(self, if_none_match=None, accept_encoding=None):
+        """
+        Готовит ответ с учётом If-None-Match и Accept-Encoding.
+
+        Возвращает (код ответа, список заголовков, тело)
+        """
+        encoding = self.choose_encoding(accept_encoding)
+        content, etag = self.variants[encoding]
+
+        headers = [
+            ('ETag', etag),
+            ('Last-Modified', self.last_modified),
+            ('Cache-Control', self.cache_control),
+            ('Vary', 'Accept-Encoding'),
+        ]
+
+        tags = parse_etags(if_none_match)
+        if '*' in tags or tags & self.etags:
+            return 304, headers, b''
+
+        headers.append(('Content-Type', self.content_type))
+        headers.append(('Content-Length', str(len(content))))
+        if encoding != 'identity':
+            headers.append(('Content-Encoding', encoding))
+        return 200, headers, content
+
+
+class StaticFiles:
+    """
+    Набор статических файлов, обслуживаемых из памяти.
+
+    routes: путь запроса -> (имя файла в root, Content-Type)
+    check_interval: как часто (в секундах) проверять время модификации файла,
+    None - не перечитывать файлы после загрузки
+    """
+
+    def __init__(self, root, routes, check_interval=1.0):
+        self.root = root
+        self.routes = routes
+        self.check_interval = check_interval
+        # путь запроса -> StaticAsset или (код ошибки, текст ошибки)
+        self.entries = {}
+        self.checked = {}
+        self.lock = threading.Lock()
+
+    def load_all(self):
+        """
+        Загружает все файлы (при старте сервера).
+        """
+        for path in self.routes:
+            self.load(path)
+
+    def load(self, path):
+        filename, content_type = self.routes[path]
+        full_file_path = os.path.join(self.root, filename)
+
+        try:
+            mtime = os.stat(full_file_path).st_mtime
+            with open(full_file_path, 'rb') as file:
+                entry = StaticAsset(content_type, file.read(), mtime)
+        except FileNotFoundError:
+            entry = (404, f"{filename} not found")
+        except PermissionError:
+            entry = (403, f"No access to {filename}")
+        except Exception as error:
+            entry = (500, f"Server error: {str(error)}")
+
+        self.entries[path] = entry
+        self.checked[path] = time.monotonic()
+        return entry
+
+    def refresh(self, path):
+        """
+        Перечитывает файл, если он изменился (или раньше не загрузился).
+        """
+        entry = self.entries.get(path)
+        if not isinstance(entry, StaticAsset):
+            return self.load(path)
+
+        filename, _ = self.routes[path]
+        try:
+            mtime = os.stat(os.path.join(self.root, filename)).st_mtime
+        except OSError:
+            return self.load(path)
+
+        self.checked[path] = time.monotonic()
+        if mtime != entry.mtime:
+            return self.load(path)
+        return entry
+
+    def lookup(self, path):
+        """
+        Возвращает (200, StaticAsset) или (код ошибки, текст ошибки).
+        """
+        if path not in self.routes:
+            return 404, "Not found"
+
+        entry = self.entries.get(path)
+        if entry is None or (
+            self.check_interval is not None
+            and time.monotonic() - self.checked.get(path, 0) >= self.check_interval
+        ):
+            with self.lock:
+                entry = self.refresh(path)
+
+        if isinstance(entry, StaticAsset):
+            return 200, entry
+        return entry
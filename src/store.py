@@ -0,0 +1,461 @@
+"""
+Постоянное хранилище решений на диске, общее для процессов сервера.
+
+Кэш в памяти (cache.py) теряется при перезапуске и у каждого процесса
+prefork свой. Хранилище - файл, который все процессы открывают сами и
+читают одновременно; после перезапуска оно сразу «тёплое».
+
+Два варианта:
+
+- MmapStore - хэш-таблица с открытой адресацией в файле, отображённом в
+  память (mmap). Ключ - биты тройки float64 (coefficients_key), значение -
+  вид решения и два корня. Размер таблицы фиксирован (capacity слотов);
+  запись ищет место среди PROBES слотов подряд и при необходимости
+  вытесняет самую старую из них. Чтение не берёт блокировок: каждый слот
+  защищён контрольной суммой, и недописанный слот читается как промах.
+  Запись из разных процессов упорядочена блокировкой файла (lockf).
+- SqliteStore - то же в SQLite (WAL), для случаев, когда mmap неудобен.
+  Число записей ограничено max_entries, лишние удаляются по возрасту.
+
+Корни быстрого решателя и режима повышенной точности (solve_quadratic_precise)
+различаются, а ключ у них общий, поэтому хранилище помнит, каким решателем
+заполнено (precise): открыть его в другом режиме нельзя (ValueError).
+
+Хранилище заполняется на лету (SolutionCache) или заранее из журнала
+запросов:
+
+    python src/store.py populate solutions.store requests.ndjson
+    python src/store.py populate --precise precise.store requests.ndjson
+    python src/store.py stats solutions.store
+"""
+import argparse
+import fcntl
+import mmap
+import os
+import sqlite3
+import struct
+import sys
+import threading
+import time
+import zlib
+
+from quadratic import solve_quadratic, solve_quadratic_precise, KIND_NONE, KIND_ANY, KIND_ONE, KIND_TWO
+from cache import normalize_coefficients, coefficients_key
+from json_parser import parse_request
+
+
+# Заголовок файла: сигнатура, версия, число слотов, счётчик записей,
+# решатель (0 - быстрый, 1 - повышенной точности)
+HEADER = struct.Struct('<8sIIII8x')
+MAGIC = b'CALCSTOR'
+VERSION = 1
+COUNTER = struct.Struct('<I')
+COUNTER_OFFSET = 16
+
+# Слот: ключ (три float64), вид решения, возраст записи, два корня (re, im),
+# контрольная сумма первых CHECKED байтов
+SLOT = struct.Struct('<24sB3xI4dI4x')
+CHECKED = SLOT.size - 8
+_checksum = struct.Struct('<I')
+
+# Корни в SQLite храним байтами: столбец REAL теряет знак -0.0 и NaN
+_roots = struct.Struct('<4d')
+
+# Сколько слотов подряд просматривать при поиске и записи
+PROBES = 8
+
+DEFAULT_CAPACITY = 1 << 20
+
+ANY_NUMBER = "Любое число"
+
+
+def _check_solver(path, stored, precise):
+    if stored != precise:
+        solver = "precise" if stored else "fast"
+        raise ValueError(f"{path} holds solutions of the {solver} solver")
+
+
+def pack_roots(roots):
+    """
+    Корни в формате solve_quadratic -> (вид решения, re1, im1, re2, im2).
+    """
+    if roots == [ANY_NUMBER]:
+        return KIND_ANY, 0.0, 0.0, 0.0, 0.0
+    kind = (KIND_NONE, KIND_ONE, KIND_TWO)[len(roots)]
+    first, second = (complex(root) for root in (list(roots) + [0.0, 0.0])[:2])
+    return kind, first.real, first.imag, second.real, second.imag
+
+
+def unpack_roots(kind, re1, im1, re2, im2):
+    """
+    Обратное к pack_roots: корень без мнимой части - float, как в solve_quadratic.
+    """
+    if kind == KIND_TWO:
+        return [re1 if im1 == 0 else complex(re1, im1), re2 if im2 == 0 else complex(re2, im2)]
+    if kind == KIND_ONE:
+        return [re1]
+    if kind == KIND_ANY:
+        return [ANY_NUMBER]
+    return []
+
+
+class MmapStore:
+    """
+    Хэш-таблица решений в файле, отображённом в память.
+
+    capacity - число слотов (используется только при создании файла,
+    у существующего файла размер берётся из заголовка)
+    precise - решения режима повышенной точности
+    """
+
+    def __init__(self, path, capacity=DEFAULT_CAPACITY, precise=False):
+        self.path = path
+        self.precise = precise
+        self.lock = threading.Lock()
+        self.hits = self.misses = self.writes = self.evictions = 0
+
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            with self.file_lock():
+                if os.fstat(self.fd).st_size == 0:
+                    capacity = max(int(capacity), PROBES)
+                    os.ftruncate(self.fd, HEADER.size + capacity * SLOT.size)
+                    os.pwrite(self.fd, HEADER.pack(MAGIC, VERSION, capacity, 0, int(precise)), 0)
+
+                magic, version, capacity, _, solver = HEADER.unpack(os.pread(self.fd, HEADER.size, 0))
+                if magic != MAGIC or version != VERSION:
+                    raise ValueError(f"{path} is not a solution store")
+                _check_solver(path, bool(solver), precise)
+                if os.fstat(self.fd).st_size < HEADER.size + capacity * SLOT.size:
+                    raise ValueError(f"{path} is truncated")
+
+            self.capacity = capacity
+            self.map = mmap.mmap(self.fd, HEADER.size + capacity * SLOT.size)
+        except Exception:
+            os.close(self.fd)
+            raise
+
+    def file_lock(self):
+        return _FileLock(self.fd)
+
+    def slots(self, key):
+        start = zlib.crc32(key) % self.capacity
+        for probe in range(PROBES):
+            yield HEADER.size + (start + probe) % self.capacity * SLOT.size
+
+    def read_slot(self, offset):
+        """
+        Возвращает поля слота или None, если слот пуст или дописывается.
+        """
+        data = self.map[offset:offset + SLOT.size]
+        if zlib.crc32(data[:CHECKED]) != _checksum.unpack_from(data, CHECKED)[0]:
+            return None
+        return SLOT.unpack(data)
+
+    def get(self, key):
+        """
+        Возвращает корни или None (промах).
+        """
+        for offset in self.slots(key):
+            fields = self.read_slot(offset)
+            if fields is not None and fields[0] == key:
+                # Счётчики общие для потоков сервера: только под self.lock
+                with self.lock:
+                    self.hits += 1
+                return unpack_roots(fields[1], *fields[3:7])
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, roots):
+        kind, re1, im1, re2, im2 = pack_roots(roots)
+
+        with self.lock, self.file_lock():
+            counter = (COUNTER.unpack_from(self.map, COUNTER_OFFSET)[0] + 1) & 0xffffffff
+
+            # Свободный слот или слот с тем же ключом, иначе самый старый
+            target, oldest_age, evicting = None, -1, False
+            for offset in self.slots(key):
+                fields = self.read_slot(offset)
+                if fields is None or fields[0] == key:
+                    target, evicting = offset, False
+                    break
+                age = (counter - fields[2]) & 0xffffffff
+                if age > oldest_age:
+                    target, oldest_age, evicting = offset, age, True
+
+            data = bytearray(SLOT.pack(key, kind, counter, re1, im1, re2, im2, 0))
+            _checksum.pack_into(data, CHECKED, zlib.crc32(data[:CHECKED]))
+            # Сначала портим контрольную сумму, чтобы читатель не увидел
+            # старую сумму вместе с частично записанными новыми полями
+            self.map[target + CHECKED:target + CHECKED + 4] = b'\0\0\0\0'
+            self.map[target:target + SLOT.size] = bytes(data)
+            COUNTER.pack_into(self.map, COUNTER_OFFSET, counter)
+
+            self.writes += 1
+            self.evictions += evicting
+
+    def count(self):
+        """
+        Число занятых слотов (полный просмотр файла).
+        """
+        return sum(
+            self.read_slot(HEADER.size + index * SLOT.size) is not None
+            for index in range(self.capacity)
+        )
+
+    def stats(self):
+        with self.lock:
+            hits, misses, writes, evictions = self.hits, self.misses, self.writes, self.evictions
+        lookups = hits + misses
+        return {
+            "backend": "mmap",
+            "precise": self.precise,
+            "capacity": self.capacity,
+            "bytes": len(self.map),
+            "hits": hits,
+            "misses": misses,
+            "writes": writes,
+            "evictions": evictions,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        self.map.close()
+        os.close(self.fd)
+
+
+class _FileLock:
+    """
+    Блокировка файла на запись (lockf): работает между процессами, в том
+    числе между процессами prefork, которые унаследовали дескриптор.
+    """
+
+    def __init__(self, fd):
+        self.fd = fd
+
+    def __enter__(self):
+        fcntl.lockf(self.fd, fcntl.LOCK_EX)
+
+    def __exit__(self, *exc_info):
+        fcntl.lockf(self.fd, fcntl.LOCK_UN)
+
+
+class SqliteStore:
+    """
+    Хранилище решений в SQLite.
+
+    max_entries - предел числа записей; при превышении удаляются самые
+    старые (проверка раз в PRUNE_EVERY записей)
+    precise - решения режима повышенной точности
+    """
+
+    PRUNE_EVERY = 1000
+
+    def __init__(self, path, max_entries=DEFAULT_CAPACITY, precise=False):
+        self.path = path
+        self.precise = precise
+        self.max_entries = max_entries
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.hits = self.misses = self.writes = self.evictions = 0
+
+        # Схему создаём отдельным соединением: соединения не должны
+        # переживать fork, поэтому рабочие открываются лениво в каждом потоке
+        connection = sqlite3.connect(path, timeout=30)
+        try:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS solutions ('
+                'key BLOB PRIMARY KEY, kind INTEGER, roots BLOB, stamp REAL)'
+            )
+            connection.execute('CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value INTEGER)')
+            # Решатель записывает первый открывший хранилище
+            connection.execute("INSERT OR IGNORE INTO settings VALUES ('precise', ?)", (int(precise),))
+            connection.commit()
+            solver, = connection.execute("SELECT value FROM settings WHERE name = 'precise'").fetchone()
+            _check_solver(path, bool(solver), precise)
+        finally:
+            connection.close()
+
+    def connection(self):
+        connection = getattr(self.local, 'connection', None)
+        if connection is None or self.local.pid != os.getpid():
+            connection = self.local.connection = sqlite3.connect(self.path, timeout=30)
+            self.local.pid = os.getpid()
+        return connection
+
+    def get(self, key):
+        row = self.connection().execute(
+            'SELECT kind, roots FROM solutions WHERE key = ?', (key,),
+        ).fetchone()
+        with self.lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return unpack_roots(row[0], *_roots.unpack(row[1]))
+
+    def put(self, key, roots):
+        connection = self.connection()
+        kind, *values = pack_roots(roots)
+        with connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?)',
+                (key, kind, _roots.pack(*values), time.time()),
+            )
+
+        with self.lock:
+            self.writes += 1
+            prune = self.writes % self.PRUNE_EVERY == 0
+        if prune:
+            self.prune()
+
+    def prune(self):
+        connection = self.connection()
+        with connection:
+            deleted = connection.execute(
+                'DELETE FROM solutions WHERE key IN ('
+                'SELECT key FROM solutions ORDER BY stamp DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,),
+            ).rowcount
+        with self.lock:
+            self.evictions += max(deleted, 0)
+
+    def count(self):
+        return self.connection().execute('SELECT COUNT(*) FROM solutions').fetchone()[0]
+
+    def stats(self):
+        with self.lock:
+            hits, misses, writes, evictions = self.hits, self.misses, self.writes, self.evictions
+        lookups = hits + misses
+        return {
+            "backend": "sqlite",
+            "precise": self.precise,
+            "capacity": self.max_entries,
+            "bytes": os.path.getsize(self.path),
+            "hits": hits,
+            "misses": misses,
+            "writes": writes,
+            "evictions": evictions,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        connection = getattr(self.local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self.local.connection = None
+
+
+SQLITE_SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+
+
+def open_store(path, capacity=DEFAULT_CAPACITY, backend='auto', precise=False):
+    """
+    Открывает (или создаёт) хранилище.
+
+    backend: mmap, sqlite или auto - sqlite для файлов .db/.sqlite/.sqlite3
+    precise - решения режима повышенной точности; хранилище другого режима
+    не открывается (ValueError)
+    """
+    if backend == 'auto':
+        backend = 'sqlite' if path.lower().endswith(SQLITE_SUFFIXES) else 'mmap'
+    if backend == 'sqlite':
+        return SqliteStore(path, capacity, precise)
+    if backend == 'mmap':
+        return MmapStore(path, capacity, precise)
+    raise ValueError(f"Unknown store backend: {backend}")
+
+
+def populate(store, lines):
+    """
+    Заполняет хранилище решениями запросов из журнала (строки в формате
+    parse_request) решателем режима хранилища (store.precise).
+    Некорректные строки пропускаются.
+
+    Возвращает (число строк, число новых записей)
+    """
+    solver = solve_quadratic_precise if store.precise else solve_quadratic
+    seen = set()
+    total = added = 0
+
+    for line in lines:
+        if not line.strip():
+            continue
+        total += 1
+        try:
+            a, b, c = parse_request(line)
+        except (OverflowError, ValueError):
+            # Огромное целое не переводится во float - такая же некорректная строка
+            continue
+        if a is None:
+            continue
+
+        normalized = normalize_coefficients(a, b, c)
+        key = coefficients_key(*normalized)
+        if key in seen:
+            continue
+        seen.add(key)
+        if store.get(key) is not None:
+            continue
+
+        try:
+            roots, _ = solver(*normalized)
+        except (OverflowError, ZeroDivisionError):
+            continue
+        store.put(key, roots)
+        added += 1
+
+    return total, added
+
+
+def main(argv=None):
+    import logging
+    # parse_request пишет в лог каждую некорректную строку журнала
+    logging.disable(logging.ERROR)
+
+    parser = argparse.ArgumentParser(description="Постоянное хранилище решений CalcServ")
+    parser.add_argument('--backend', choices=['auto', 'mmap', 'sqlite'], default='auto',
+                        help="формат хранилища (auto - sqlite для .db/.sqlite)")
+    parser.add_argument('--capacity', type=int, default=DEFAULT_CAPACITY,
+                        help="число слотов (mmap) или записей (sqlite) нового хранилища")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    populate_parser = commands.add_parser('populate', help="заполнить из журналов запросов (NDJSON)")
+    populate_parser.add_argument('store', help="файл хранилища")
+    populate_parser.add_argument('logs', nargs='*', default=['-'], help="журналы запросов (по умолчанию stdin)")
+    populate_parser.add_argument('--precise', action='store_true', help="решать в режиме повышенной точности")
+
+    stats_parser = commands.add_parser('stats', help="показать размер хранилища")
+    stats_parser.add_argument('store', help="файл хранилища")
+    stats_parser.add_argument('--precise', action='store_true', help="хранилище режима повышенной точности")
+
+    args = parser.parse_args(argv)
+    store = open_store(args.store, args.capacity, args.backend, args.precise)
+    try:
+        if args.command == 'populate':
+            started = time.perf_counter()
+            total = added = 0
+            for log in args.logs:
+                if log == '-':
+                    counts = populate(store, sys.stdin.buffer)
+                else:
+                    with open(log, 'rb') as file:
+                        counts = populate(store, file)
+                total += counts[0]
+                added += counts[1]
+            elapsed = time.perf_counter() - started
+            print(f"Строк: {total}, новых записей: {added}, вытеснено: {store.evictions}, {elapsed:.3f} с",
+                  file=sys.stderr)
+        else:
+            stats = store.stats()
+            stats["entries"] = store.count()
+            for name, value in stats.items():
+                print(f"{name}: {value}")
+    finally:
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Потоковое чтение тела запроса и chunked-ответ для больших пакетов.
+
+Тело запроса читается из сокета по частям (по Content-Length или в
+Transfer-Encoding: chunked) и сразу режется на строки NDJSON, так что сервер
+не держит в памяти ни всё тело, ни весь ответ.
+"""
+
+# Сколько байтов читать из сокета за раз
+READ_BLOCK = 64 * 1024
+
+# Максимальная длина одной строки NDJSON
+MAX_LINE = 1024 * 1024
+
+# Максимальная длина строки с размером куска в chunked-теле
+MAX_CHUNK_HEADER = 1024
+
+
+class BodyError(Exception):
+    """Некорректное или оборванное тело запроса"""
+
+
+def read_content_length(rfile, length):
+    """
+    Читает тело известной длины блоками.
+    """
+    while length > 0:
+        data = rfile.read(min(READ_BLOCK, length))
+        if not data:
+            raise BodyError("Request body ended early")
+        length -= len(data)
+        yield data
+
+
+def read_chunked(rfile):
+    """
+    Читает тело в формате Transfer-Encoding: chunked блоками.
+    """
+    while True:
+        line = rfile.readline(MAX_CHUNK_HEADER + 1)
+        if not line.endswith(b'\n'):
+            raise BodyError("Bad chunk header")
+        try:
+            # Расширения куска (после ';') не используем
+            size = int(line.split(b';', 1)[0].strip(), 16)
+        except ValueError:
+            raise BodyError("Bad chunk size")
+        if size < 0:
+            raise BodyError("Bad chunk size")
+
+        if size == 0:
+            # Пропускаем trailer-заголовки до пустой строки
+            while True:
+                line = rfile.readline(MAX_CHUNK_HEADER + 1)
+                if line in (b'\r\n', b'\n'):
+                    return
+                if not line.endswith(b'\n'):
+                    raise BodyError("Bad chunk trailer")
+
+        yield from read_content_length(rfile, size)
+
+        if rfile.readline(3) not in (b'\r\n', b'\n'):
+            raise BodyError("Missing chunk terminator")
+
+
+def request_body(rfile, headers):
+    """
+    Выбирает способ чтения тела по заголовкам запроса.
+
+    Возвращает генератор блоков байтов
+    """
+    transfer_encoding = headers.get('Transfer-Encoding', '').lower()
+    if transfer_encoding:
+        if transfer_encoding != 'chunked':
+            raise BodyError(f"Unsupported Transfer-Encoding: {transfer_encoding}")
+        return read_chunked(rfile)
+
+    content_length = headers.get('Content-Length')
+    if content_length is None:
+        raise BodyError("Content-Length or Transfer-Encoding: chunked required")
+    try:
+        length = int(content_length)
+    except ValueError:
+        raise BodyError("Bad Content-Length")
+    if length < 0:
+        raise BodyError("Bad Content-Length")
+    return read_content_length(rfile, length)
+
+
+def iter_lines(blocks):
+    """
+    Собирает строки из блоков байтов (перевод строки в строки не входит).
+    """
+    pending = b''
+    for block in blocks:
+        pending += block
+        if b'\n' not in block:
+            if len(pending) > MAX_LINE:
+                raise BodyError("Request line too long")
+            continue
+        *lines, pending = pending.split(b'\n')
+        yield from lines
+    if pending:
+        yield pending
+
+
+class ChunkedWriter:
+    """
+    Пишет ответ в формате Transfer-Encoding: chunked.
+    """
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+
+    def write(self, data):
+        # Пустой кусок означал бы конец ответа
+        if data:
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+
+    def close(self):
+        self.wfile.write(b'0\r\n\r\n')
@@ -0,0 +1,231 @@
+"""
+Структурированный журнал доступа и ошибок (JSON lines) с записью в фоне.
+
+Поток запроса только кладёт запись в очередь (QueueHandler); форматирование
+и запись в файл делает отдельный поток (QueueListener), который пишет
+пачками: всё, что накопилось в очереди, уходит одной записью.
+
+Строки журнала доступа об успешных ответах можно прореживать (sample),
+ответы 4xx/5xx и ошибки пишутся всегда. Пока setup_logging не вызван,
+журнал доступа выключен и стоит одну проверку уровня.
+
+    {"time": "2026-01-01T12:00:00.123Z", "level": "INFO", "logger": "calcserv.access",
+     "message": "POST /calculate?quadratic 200", "client": "127.0.0.1",
+     "method": "POST", "path": "/calculate?quadratic", "status": 200, "bytes": 98,
+     "duration_ms": 0.41}
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import time
+
+
+ACCESS_LOGGER = 'calcserv.access'
+access_logger = logging.getLogger(ACCESS_LOGGER)
+
+# Сколько строк копить в буфере, прежде чем записать их, даже если очередь не пуста
+BATCH_SIZE = 256
+
+# Доля строк журнала доступа об успешных ответах, которые попадают в журнал
+_sample = 1.0
+
+# Текущий фоновый писатель (setup_logging)
+_writer = None
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Запись журнала -> одна строка JSON.
+
+    Поля из extra={"fields": {...}} добавляются к записи как есть.
+    """
+
+    def format(self, record):
+        entry = {
+            "time": time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(record.created))
+                    + '.%03dZ' % record.msecs,
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        fields = getattr(record, 'fields', None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class BatchHandler(logging.Handler):
+    """
+    Копит отформатированные строки и пишет их в stream пачкой: при flush()
+    (когда очередь опустела) или когда набралось batch_size строк.
+    """
+
+    def __init__(self, stream, batch_size=BATCH_SIZE):
+        super().__init__()
+        self.stream = stream
+        self.batch_size = batch_size
+        self.buffer = []
+
+    def emit(self, record):
+        try:
+            self.buffer.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+            return
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        lines, self.buffer = self.buffer, []
+        with self.lock:
+            self.stream.write('\n'.join(lines) + '\n')
+            self.stream.flush()
+
+
+class BatchQueueListener(logging.handlers.QueueListener):
+    """
+    QueueListener, который сбрасывает буферы обработчиков, когда очередь
+    опустела: при высокой нагрузке строки уходят пачками, при низкой -
+    без задержки.
+    """
+
+    def dequeue(self, block):
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            for handler in self.handlers:
+                handler.flush()
+            return self.queue.get(block)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler без форматирования в потоке запроса: очередь не покидает
+    процесс, поэтому запись можно передать как есть.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class LogWriter:
+    """
+    Очередь, фоновый поток и обработчик корневого логгера.
+    """
+
+    def __init__(self, stream, batch_size=BATCH_SIZE, level=logging.INFO, close_stream=False):
+        self.handler = BatchHandler(stream, batch_size)
+        self.handler.setFormatter(JsonLinesFormatter())
+        self.close_stream = close_stream
+        self.level = level
+        self.queue_handler = None
+        self.listener = None
+        # Обработчики и уровень корневого логгера до start(), для stop()
+        self.previous = None
+
+    def start(self):
+        log_queue = queue.SimpleQueue()
+        self.queue_handler = _QueueHandler(log_queue)
+        self.listener = BatchQueueListener(log_queue, self.handler)
+
+        root = logging.getLogger()
+        if self.previous is None:
+            self.previous = root.handlers, root.level
+        root.handlers = [self.queue_handler]
+        root.setLevel(self.level)
+        self.listener.start()
+
+    def after_fork(self):
+        # Поток записи не переживает fork: в дочернем процессе заводим
+        # свою очередь и поток, а чужие несброшенные строки отбрасываем
+        self.handler.buffer = []
+        self.start()
+
+    def stop(self):
+        if self.listener is None:
+            return
+        root = logging.getLogger()
+        if root.handlers == [self.queue_handler]:
+            root.handlers, level = self.previous
+            root.setLevel(level)
+        self.listener.stop()
+        self.handler.flush()
+        self.listener = None
+        if self.close_stream:
+            self.handler.stream.close()
+
+
+def setup_logging(path='-', sample=1.0, batch_size=BATCH_SIZE, level=logging.INFO):
+    """
+    Направляет все логгеры в журнал JSON lines с фоновой записью.
+
+    path - файл журнала (дописывается) или '-' для stderr
+    sample - доля строк об успешных ответах в журнале доступа (0..1)
+    """
+    global _writer, _sample
+    stop_logging()
+    _sample = sample
+
+    if path == '-':
+        _writer = LogWriter(sys.stderr, batch_size, level)
+    else:
+        _writer = LogWriter(open(path, 'a', encoding='utf-8'), batch_size, level, close_stream=True)
+    _writer.start()
+    return _writer
+
+
+def stop_logging():
+    """
+    Дописывает накопленные строки и останавливает фоновый поток.
+    """
+    global _writer
+    if _writer is not None:
+        _writer.stop()
+        _writer = None
+
+
+def disable_logging():
+    """
+    Журнал не ведётся: записи всех логгеров отбрасываются. Без обработчиков
+    предупреждения (например, send_error через log_message) ушли бы в stderr
+    через logging.lastResort.
+    """
+    stop_logging()
+    logging.getLogger().handlers = [logging.NullHandler()]
+
+
+def _after_fork_in_child():
+    if _writer is not None:
+        _writer.after_fork()
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+atexit.register(stop_logging)
+
+
+def log_access(client, method, path, status, size, started=None):
+    """
+    Строка журнала доступа. Уровень зависит от статуса: INFO для успешных
+    ответов (прореживаются по sample), WARNING для 4xx, ERROR для 5xx.
+
+    started - time.perf_counter() в начале обработки запроса
+    """
+    level = logging.INFO if status < 400 else logging.WARNING if status < 500 else logging.ERROR
+    if not access_logger.isEnabledFor(level):
+        return
+    if level == logging.INFO and _sample < 1.0 and random.random() >= _sample:
+        return
+
+    fields = {"client": client, "method": method, "path": path, "status": status, "bytes": size}
+    if started is not None:
+        fields["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    access_logger.log(level, "%s %s %d", method, path, status, extra={"fields": fields})
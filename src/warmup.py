@@ -0,0 +1,94 @@
+"""
+Прогрев сервера после старта.
+
+Тяжёлые модули (NumPy, сжатие) импортируются при первом использовании, а
+статические файлы и таблицы загружаются при первом запросе. Чтобы первый
+пользовательский запрос не платил за всё это, сервер прогревается по шагам:
+до открытия сокета (eager) или в фоновом потоке, когда сокет уже принимает
+соединения (background). Состояние прогрева отдаёт GET /healthz.
+"""
+import threading
+import time
+
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class Warmup:
+    """
+    Список шагов прогрева: имя -> функция без аргументов.
+
+    Шаги выполняются по порядку; ошибка шага записывается в отчёт и не
+    останавливает остальные. Сервер готов (ready), когда все шаги
+    завершились или прогрев отключён.
+    """
+
+    def __init__(self):
+        self.steps = {}
+        self.state = {}
+        self.errors = {}
+        self.seconds = {}
+        self.started = None
+        self.finished = None
+        self.thread = None
+        self.done = threading.Event()
+
+    def add(self, name, function):
+        self.steps[name] = function
+        self.state[name] = PENDING
+        self.done.clear()
+
+    def run(self):
+        """
+        Выполняет шаги в текущем потоке.
+        """
+        self.started = time.monotonic()
+        for name, function in list(self.steps.items()):
+            self.state[name] = RUNNING
+            step_started = time.perf_counter()
+            try:
+                function()
+            except Exception as error:
+                self.state[name] = FAILED
+                self.errors[name] = f"{type(error).__name__}: {error}"
+            else:
+                self.state[name] = DONE
+            self.seconds[name] = time.perf_counter() - step_started
+        self.finished = time.monotonic()
+        self.done.set()
+
+    def start(self):
+        """
+        Запускает шаги в фоновом потоке.
+        """
+        self.thread = threading.Thread(target=self.run, name='warmup', daemon=True)
+        self.thread.start()
+        return self.thread
+
+    def skip(self):
+        """
+        Отключает прогрев: всё загрузится при первом использовании.
+        """
+        self.steps.clear()
+        self.state.clear()
+        self.done.set()
+
+    @property
+    def ready(self):
+        return self.done.is_set()
+
+    def report(self):
+        steps = {}
+        for name, state in self.state.items():
+            step = {"state": state, "seconds": self.seconds.get(name)}
+            if name in self.errors:
+                step["error"] = self.errors[name]
+            steps[name] = step
+
+        report = {"ready": self.ready, "steps": steps}
+        if self.started is not None and self.finished is not None:
+            report["seconds"] = self.finished - self.started
+        return report
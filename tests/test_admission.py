@@ -0,0 +1,146 @@
+"""
+Тесты для контроля нагрузки admission.py и его использования в server.py
+"""
+import os
+import socket
+import sys
+import threading
+import time
+import unittest
+import logging
+from unittest import mock
+
+# Отключаем логирование в тестах
+logging.disable(logging.CRITICAL)
+
+# Добавляем путь к src для импорта (модули сервера импортируют друг друга напрямую)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Импортируем
+import server
+from admission import InFlightLimiter, ClientRateLimiter
+
+
+class TestInFlightLimiter(unittest.TestCase):
+    """Тесты для InFlightLimiter"""
+
+    def test_limit(self):
+        limiter = InFlightLimiter(2)
+
+        self.assertTrue(limiter.acquire())
+        self.assertTrue(limiter.acquire())
+        self.assertFalse(limiter.acquire())
+
+        limiter.release()
+        self.assertTrue(limiter.acquire())
+
+    def test_unlimited(self):
+        limiter = InFlightLimiter(0)
+        self.assertTrue(all(limiter.acquire() for _ in range(1000)))
+
+
+class TestClientRateLimiter(unittest.TestCase):
+    """Тесты для ClientRateLimiter"""
+
+    def test_disabled_by_default(self):
+        limiter = ClientRateLimiter()
+        self.assertTrue(all(limiter.acquire('a') == 0 for _ in range(1000)))
+
+    def test_burst_then_retry_after(self):
+        now = [100.0]
+        limiter = ClientRateLimiter(rate=2.0, burst=3)
+
+        with mock.patch('admission.time.monotonic', lambda: now[0]):
+            self.assertEqual([limiter.acquire('a') for _ in range(3)], [0, 0, 0])
+            self.assertEqual(limiter.acquire('a'), 1)
+            # Другой клиент не затронут
+            self.assertEqual(limiter.acquire('b'), 0)
+
+            # За полсекунды накапливается один токен
+            now[0] += 0.5
+            self.assertEqual(limiter.acquire('a'), 0)
+            self.assertEqual(limiter.acquire('a'), 1)
+
+    def test_retry_after_rounds_up(self):
+        now = [0.0]
+        limiter = ClientRateLimiter(rate=0.25, burst=1)
+
+        with mock.patch('admission.time.monotonic', lambda: now[0]):
+            self.assertEqual(limiter.acquire('a'), 0)
+            self.assertEqual(limiter.acquire('a'), 4)
+
+    def test_max_clients(self):
+        limiter = ClientRateLimiter(rate=1.0, max_clients=2)
+        for client in ('a', 'b', 'c'):
+            limiter.acquire(client)
+
+        self.assertEqual(list(limiter.buckets), ['b', 'c'])
+
+
+class TestThreadPoolServerLimits(unittest.TestCase):
+    """Ограничения QuadraticHandler и ThreadPoolHTTPServer на настоящем сокете"""
+
+    def setUp(self):
+        self.httpd = server.ThreadPoolHTTPServer(('127.0.0.1', 0), server.QuadraticHandler, threads=1, max_in_flight=2)
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def request(self, data):
+        with socket.create_connection(('127.0.0.1', self.port), timeout=5) as sock:
+            sock.sendall(data)
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    return b''.join(chunks)
+                chunks.append(chunk)
+
+    def test_body_too_large(self):
+        response = self.request(
+            b'POST /calculate?quadratic HTTP/1.0\r\nContent-Length: %d\r\n\r\n' % (server.MAX_BODY_SIZE + 1)
+        )
+        self.assertTrue(response.startswith(b'HTTP/1.0 413'))
+
+    def test_bad_content_length(self):
+        response = self.request(b'POST /calculate?quadratic HTTP/1.0\r\nContent-Length: x\r\n\r\n')
+        self.assertTrue(response.startswith(b'HTTP/1.0 400'))
+
+    def test_read_timeout(self):
+        with mock.patch.object(server.QuadraticHandler, 'timeout', 0.2):
+            # Тело короче Content-Length и соединение не закрыто
+            response = self.request(b'POST /calculate?quadratic HTTP/1.0\r\nContent-Length: 10\r\n\r\n{')
+        self.assertTrue(response.startswith(b'HTTP/1.0 408'))
+
+    def test_busy_server_returns_503(self):
+        # Два молчащих соединения занимают поток и место в очереди
+        with mock.patch.object(server.QuadraticHandler, 'timeout', 2.0):
+            slow = [socket.create_connection(('127.0.0.1', self.port), timeout=5) for _ in range(2)]
+            try:
+                time.sleep(0.2)
+                response = self.request(b'GET / HTTP/1.0\r\n\r\n')
+            finally:
+                for sock in slow:
+                    sock.close()
+
+        self.assertTrue(response.startswith(b'HTTP/1.0 503'))
+        self.assertIn(b'Retry-After: 1\r\n', response)
+
+    def test_rate_limit_returns_429(self):
+        server.rate_limiter.configure(1.0, 1)
+        try:
+            first = self.request(b'GET /stats/cache HTTP/1.0\r\n\r\n')
+            second = self.request(b'GET /stats/cache HTTP/1.0\r\n\r\n')
+        finally:
+            server.rate_limiter.configure(0.0)
+
+        self.assertTrue(first.startswith(b'HTTP/1.0 200'))
+        self.assertTrue(second.startswith(b'HTTP/1.0 429'))
+        self.assertIn(b'Retry-After: 1\r\n', second)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,280 @@
+"""
+Тесты для асинхронного сервера async_server.py
+"""
+
+import unittest
+import asyncio
+import json
+import sys
+import os
+import logging
+import threading
+import time
+from unittest import mock
+
+# Отключаем логирование в тестах
+logging.disable(logging.CRITICAL)
+
+# Добавляем путь к src для импорта (модули сервера импортируют друг друга напрямую)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Импортируем
+import async_server
+from async_server import AsyncQuadraticServer, BadRequest, parse_head, is_keep_alive, route, INLINE_BODY_SIZE
+import server
+from binary_protocol import encode_request, iter_records
+from quadratic import KIND_TWO, KIND_NONE
+
+
+class TestParseHead(unittest.TestCase):
+    """Тесты для функции parse_head"""
+
+    def test_valid_head(self):
+        head = b'POST /calculate?quadratic HTTP/1.1\r\nHost: x\r\nContent-Length: 10\r\n\r\n'
+        method, path, version, headers = parse_head(head)
+
+        self.assertEqual(method, 'POST')
+        self.assertEqual(path, '/calculate?quadratic')
+        self.assertEqual(version, 'HTTP/1.1')
+        self.assertEqual(headers, {'host': 'x', 'content-length': '10'})
+
+    def test_bad_request_line(self):
+        with self.assertRaises(BadRequest):
+            parse_head(b'GET /\r\n\r\n')
+
+    def test_unsupported_version(self):
+        with self.assertRaises(BadRequest):
+            parse_head(b'GET / HTTP/2.0\r\n\r\n')
+
+    def test_bad_header(self):
+        with self.assertRaises(BadRequest):
+            parse_head(b'GET / HTTP/1.1\r\nno colon\r\n\r\n')
+
+
+class TestKeepAlive(unittest.TestCase):
+    """Тесты для функции is_keep_alive"""
+
+    def test_http11_default(self):
+        self.assertTrue(is_keep_alive('HTTP/1.1', {}))
+        self.assertFalse(is_keep_alive('HTTP/1.1', {'connection': 'close'}))
+
+    def test_http10_default(self):
+        self.assertFalse(is_keep_alive('HTTP/1.0', {}))
+        self.assertTrue(is_keep_alive('HTTP/1.0', {'connection': 'Keep-Alive'}))
+
+
+class TestRoute(unittest.TestCase):
+    """Тесты для функции route"""
+
+    def test_calculate(self):
+        status, response = route('POST', '/calculate?quadratic', b'{"params": {"a": 1, "b": -5, "c": 6}}')
+        headers, content = response.split(b'\r\n\r\n', 1)
+
+        self.assertEqual(status, 200)
+        self.assertIn(b'Content-Type: application/json', headers)
+        self.assertIn(b'Content-Length: %d' % len(content), headers)
+        self.assertEqual(json.loads(content)["result"]["roots"], [3.0, 2.0])
+
+    def test_binary(self):
+        body = encode_request([(1, -5, 6), (0, 0, 1)])
+        status, response = route('POST', '/calculate?quadratic', body, {'content-type': 'application/x-calcserv'})
+        headers, content = response.split(b'\r\n\r\n', 1)
+
+        self.assertEqual(status, 200)
+        self.assertIn(b'Content-Type: application/x-calcserv', headers)
+        self.assertEqual([record[0] for record in iter_records(content)], [KIND_TWO, KIND_NONE])
+
+    def test_binary_not_acceptable(self):
+        headers = {'content-type': 'application/x-calcserv', 'accept': 'application/json'}
+        self.assertEqual(route('POST', '/calculate?quadratic', b'', headers)[0], 406)
+        self.assertEqual(route('POST', '/calculate?quadratic', b'x', {'content-type': 'application/x-calcserv'})[0], 400)
+
+    def test_invalid_request(self):
+        self.assertEqual(route('POST', '/calculate?quadratic', b'{}')[0], 400)
+
+    def test_huge_integer_is_bad_request(self):
+        huge = b'1' + b'0' * 400
+        self.assertEqual(route('POST', '/calculate?quadratic&batch',
+                               b'{"params": {"a": [%s], "b": [0], "c": [0]}}' % huge)[0], 400)
+        self.assertEqual(route('POST', '/calculate?cubic',
+                               b'{"params": {"a": %s, "b": 0, "c": 0, "d": 1}}' % huge)[0], 400)
+        self.assertEqual(route('POST', '/calculate?polynomial',
+                               b'{"params": {"coefficients": [1, %s]}}' % huge)[0], 400)
+
+    def test_unknown_routes(self):
+        self.assertEqual(route('POST', '/calculate?trigonometric', b'')[0], 404)
+        self.assertEqual(route('GET', '/nope', b'')[0], 404)
+        self.assertEqual(route('DELETE', '/', b'')[0], 501)
+
+    def test_equation_kinds(self):
+        status, response = route('POST', '/calculate?cubic', b'{"params": {"a": 1, "b": -6, "c": 11, "d": -6}}')
+        self.assertEqual(status, 200)
+        result = json.loads(response.split(b'\r\n\r\n', 1)[1])["result"]
+        self.assertEqual([round(root, 9) for root in result["roots"]], [3.0, 2.0, 1.0])
+        self.assertEqual(result["message"], "Успех! Корней: 3")
+
+        status, response = route('POST', '/calculate?polynomial&batch',
+                                 b'{"params": {"coefficients": [[1, 0, -4], [1, 0, 0, 0, -1]]}}')
+        self.assertEqual(status, 200)
+        results = json.loads(response.split(b'\r\n\r\n', 1)[1])
+        self.assertEqual(results[0]["result"]["roots"], [2.0, -2.0])
+        self.assertEqual(len(results[1]["result"]["roots"]), 4)
+
+        self.assertEqual(route('POST', '/calculate?linear', b'{"params": {"a": 1}}')[0], 400)
+        self.assertEqual(route('POST', '/calculate?polynomial', b'{"params": {"coefficients": []}}')[0], 400)
+
+    def test_metrics(self):
+        status, response = route('GET', '/metrics', b'')
+        headers, content = response.split(b'\r\n\r\n', 1)
+
+        self.assertEqual(status, 200)
+        self.assertIn(b'Content-Type: text/plain; version=0.0.4', headers)
+        self.assertIn(b'calcserv_requests_in_flight', content)
+        self.assertIn(b'calcserv_cache_hits_total{cache="solutions"}', content)
+
+    def test_static(self):
+        status, response = route('GET', '/', b'')
+
+        self.assertEqual(status, 200)
+        self.assertIn(b'Content-Type: text/html\r\n', response)
+        self.assertIn(b'<html', response)
+
+    def test_static_not_modified(self):
+        _, response = route('GET', '/script.js', b'')
+        etag = [line for line in response.split(b'\r\n') if line.startswith(b'ETag: ')][0][6:]
+
+        status, response = route('GET', '/script.js', b'', {'if-none-match': etag.decode()})
+
+        self.assertEqual(status, 304)
+        self.assertTrue(response.endswith(b'\r\n\r\n'))
+
+
+class TestConnection(unittest.TestCase):
+    """Тесты keep-alive и конвейерных запросов на настоящем сокете"""
+
+    def exchange(self, payload, idle_timeout=1.0, **limits):
+        async def scenario():
+            handler = AsyncQuadraticServer(idle_timeout, **limits)
+            server = await asyncio.start_server(handler.handle_connection, '127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(payload)
+            await writer.drain()
+            data = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+
+            server.close()
+            await handler.drain()
+            await server.wait_closed()
+            return data
+
+        return asyncio.run(scenario())
+
+    def test_pipelined_requests(self):
+        body = b'{"params": {"a": 1, "b": -5, "c": 6}}'
+        request = b'POST /calculate?quadratic HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s' % (len(body), body)
+        data = self.exchange(request * 3 + b'GET /nope HTTP/1.1\r\nConnection: close\r\n\r\n')
+
+        self.assertEqual(data.count(b'HTTP/1.1 200 OK'), 3)
+        self.assertEqual(data.count(b'Connection: keep-alive'), 3)
+        self.assertIn(b'HTTP/1.1 404', data)
+        self.assertLess(data.index(b'HTTP/1.1 200'), data.index(b'HTTP/1.1 404'))
+
+    def test_idle_timeout_closes_connection(self):
+        # Клиент не закрывает соединение: сервер должен закрыть его сам
+        data = self.exchange(b'GET / HTTP/1.1\r\n\r\n', idle_timeout=0.2)
+
+        self.assertTrue(data.startswith(b'HTTP/1.1 200 OK'))
+
+    def test_bad_request_closes_connection(self):
+        data = self.exchange(b'garbage\r\n\r\nGET / HTTP/1.1\r\n\r\n')
+
+        self.assertTrue(data.startswith(b'HTTP/1.1 400'))
+        self.assertEqual(data.count(b'HTTP/1.1'), 1)
+
+    def test_body_too_large(self):
+        data = self.exchange(b'POST /calculate?quadratic HTTP/1.1\r\nContent-Length: 11\r\n\r\n', max_body_size=10)
+
+        self.assertTrue(data.startswith(b'HTTP/1.1 413'))
+
+    def test_rate_limit(self):
+        server.rate_limiter.configure(1.0, 2)
+        try:
+            data = self.exchange(b'GET /stats/cache HTTP/1.1\r\n\r\n' * 3 + b'GET / HTTP/1.1\r\nConnection: close\r\n\r\n')
+        finally:
+            server.rate_limiter.configure(0.0)
+
+        self.assertEqual(data.count(b'HTTP/1.1 200 OK'), 2)
+        self.assertEqual(data.count(b'HTTP/1.1 429'), 2)
+        self.assertIn(b'Retry-After: 1\r\n', data)
+
+    def test_max_connections(self):
+        async def scenario():
+            handler = AsyncQuadraticServer(1.0, max_connections=1)
+            server_ = await asyncio.start_server(handler.handle_connection, '127.0.0.1', 0)
+            port = server_.sockets[0].getsockname()[1]
+
+            # Первое соединение открыто и простаивает
+            _, first = await asyncio.open_connection('127.0.0.1', port)
+            await asyncio.sleep(0.1)
+
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b'GET / HTTP/1.1\r\n\r\n')
+            data = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+            first.close()
+
+            server_.close()
+            await handler.drain()
+            await server_.wait_closed()
+            return data
+
+        data = asyncio.run(scenario())
+        self.assertTrue(data.startswith(b'HTTP/1.1 503'))
+        self.assertIn(b'Retry-After: 1\r\n', data)
+
+    def test_slow_solve_does_not_block_loop(self):
+        # Долгое решение большого тела идёт в потоке исполнителя
+        started = threading.Event()
+
+        def slow_calculate(body, timer):
+            started.set()
+            time.sleep(0.5)
+            return b'Content-Length: 2\r\n\r\nok'
+
+        async def scenario():
+            handler = AsyncQuadraticServer(1.0)
+            server_ = await asyncio.start_server(handler.handle_connection, '127.0.0.1', 0)
+            port = server_.sockets[0].getsockname()[1]
+
+            body = b'x' * (INLINE_BODY_SIZE + 1)
+            slow_reader, slow_writer = await asyncio.open_connection('127.0.0.1', port)
+            slow_writer.write(b'POST /calculate?quadratic HTTP/1.1\r\nConnection: close\r\n'
+                              b'Content-Length: %d\r\n\r\n%s' % (len(body), body))
+            await slow_writer.drain()
+            await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b'GET /stats/cache HTTP/1.1\r\nConnection: close\r\n\r\n')
+            fast = await asyncio.wait_for(reader.read(), 5)
+            fast_done = time.monotonic()
+            slow = await asyncio.wait_for(slow_reader.read(), 5)
+            slow_done = time.monotonic()
+            writer.close()
+            slow_writer.close()
+
+            server_.close()
+            await handler.drain()
+            await server_.wait_closed()
+            return fast, slow, slow_done - fast_done
+
+        with mock.patch.object(async_server, 'post_route', return_value=(200, slow_calculate)):
+            fast, slow, gap = asyncio.run(scenario())
+
+        self.assertTrue(fast.startswith(b'HTTP/1.1 200'))
+        self.assertTrue(slow.startswith(b'HTTP/1.1 200') and slow.endswith(b'ok'))
+        self.assertGreater(gap, 0.2)
+
+
+if __name__ == '__main__':
+    unittest.main()
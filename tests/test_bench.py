@@ -0,0 +1,71 @@
+"""
+Тесты для вспомогательных функций бенчмарков (benchmarks/)
+"""
+import os
+import random
+import sys
+
+# Добавляем пути к src и benchmarks для импорта
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+# Импортируем
+from bench import compare, make_equations, measure, serializer_speedups
+from load import percentile
+from quadratic import solve_quadratic
+
+
+def test_compare_flags_regressions():
+    baseline = {
+        "solve": {"best_ns": 100.0, "median_ns": 100.0},
+        "http": {"requests_per_sec": 1000.0, "p99_ms": 2.0},
+        "removed": {"best_ns": 1.0},
+    }
+    current = {
+        "solve": {"best_ns": 150.0, "median_ns": 500.0},
+        "http": {"requests_per_sec": 700.0, "p99_ms": 2.1},
+        "added": {"best_ns": 1.0},
+    }
+
+    rows = {(name, metric): (change, regressed) for name, metric, _, _, change, regressed
+            in compare(current, baseline, threshold=0.10)}
+
+    # median_ns не сравнивается, новые и удалённые бенчмарки пропускаются
+    assert set(rows) == {("solve", "best_ns"), ("http", "requests_per_sec"), ("http", "p99_ms")}
+    assert rows[("solve", "best_ns")] == (0.5, True)
+    # Меньше запросов в секунду - хуже
+    assert rows[("http", "requests_per_sec")][1] is True
+    assert rows[("http", "p99_ms")][1] is False
+
+
+def test_percentile():
+    values = list(range(1, 1001))
+    assert percentile(values, 0.5) == 500
+    assert percentile(values, 0.99) == 990
+    assert percentile(values, 0.999) == 999
+    assert percentile([], 0.5) == 0.0
+
+
+def test_make_equations_kinds():
+    rng = random.Random(0)
+    for a, b, c in make_equations('complex', 50, rng):
+        assert b * b - 4 * a * c < 0
+    for a, b, c in make_equations('degenerate', 50, rng):
+        assert solve_quadratic(a, b, c)[1] == 0
+    for a, _, _ in make_equations('linear', 50, rng):
+        assert a == 0
+
+
+def test_measure():
+    result = measure(abs, [(-1,), (2,)], repeat=2, min_time=0.001)
+    assert result["operations"] % 2 == 0
+    assert 0 < result["best_ns"] <= result["median_ns"]
+
+
+def test_serializer_speedups():
+    results = {
+        "create_response.real": {"best_ns": 300.0},
+        "encode_result.real": {"best_ns": 100.0},
+        "batch_serialize.json_dumps": {"best_ns": 50.0},
+        "batch_serialize.encoder": {"best_ns": 25.0},
+    }
+    assert serializer_speedups(results) == {"real": 3.0, "batch": 2.0}
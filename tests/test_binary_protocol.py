@@ -0,0 +1,96 @@
+"""
+Тесты для двоичного протокола binary_protocol.py
+"""
+import math
+import os
+import random
+import sys
+import pytest
+
+# Добавляем путь к src для импорта (модули сервера импортируют друг друга напрямую)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Импортируем
+from binary_protocol import (
+    RECORD, accepts_binary, decode_request, encode_arrays, encode_request, encode_solutions,
+    iter_records, media_type,
+)
+from quadratic import solve_quadratic_arrays, solve_quadratic_batch, KIND_NONE, KIND_ANY, KIND_ONE, KIND_TWO
+
+
+def solve(triples):
+    kinds, roots, discriminants = solve_quadratic_arrays(*decode_request(encode_request(triples)))
+    return list(iter_records(encode_arrays(kinds, roots, discriminants)))
+
+
+def test_record_layout():
+    assert RECORD.size == 48
+
+
+def test_roundtrip():
+    records = solve([(1, -5, 6), (1, 0, 1), (1, 2, 1), (0, 0, 0), (0, 0, 5), (0, 2, -4)])
+
+    assert records == [
+        (KIND_TWO, 3 + 0j, 2 + 0j, 1.0),
+        (KIND_TWO, 1j, -1j, -4.0),
+        (KIND_ONE, -1 + 0j, 0j, 0.0),
+        (KIND_ANY, 0j, 0j, 0.0),
+        (KIND_NONE, 0j, 0j, 0.0),
+        (KIND_ONE, 2 + 0j, 0j, 0.0),
+    ]
+
+
+def test_decode_is_zero_copy():
+    body = encode_request([(1.0, 2.0, 3.0), (4.0, 5.0, 6.0)])
+    a, b, c = decode_request(body)
+
+    assert a.tolist() == [1.0, 4.0]
+    assert c.tolist() == [3.0, 6.0]
+    assert not a.flags.owndata
+
+
+@pytest.mark.parametrize("body", [b'x', b'\0' * 25])
+def test_decode_bad_length(body):
+    assert decode_request(body) is None
+
+
+def test_empty_request():
+    assert solve([]) == []
+
+
+def test_encode_solutions_matches_arrays():
+    rng = random.Random(7)
+    triples = [
+        tuple(float(rng.choice([0, rng.randint(-5, 5), rng.uniform(-10, 10)])) for _ in range(3))
+        for _ in range(500)
+    ]
+    a, b, c = zip(*triples)
+
+    from_arrays = encode_arrays(*solve_quadratic_arrays(a, b, c))
+    from_list = encode_solutions(solve_quadratic_batch(a, b, c))
+
+    assert from_arrays == from_list
+
+
+def test_nan_survives():
+    [(kind, first, second, discriminant)] = solve([(1.0, math.nan, 1.0)])
+    assert kind == KIND_TWO
+    assert math.isnan(discriminant)
+    assert math.isnan(first.real)
+
+
+@pytest.mark.parametrize("accept, expected", [
+    (None, True),
+    ("", True),
+    ("application/x-calcserv", True),
+    ("application/json, */*;q=0.1", True),
+    ("application/*", True),
+    ("application/json", False),
+    ("application/x-calcserv;q=0", False),
+])
+def test_accepts_binary(accept, expected):
+    assert accepts_binary(accept) is expected
+
+
+def test_media_type():
+    assert media_type("Application/X-Calcserv; version=1") == "application/x-calcserv"
+    assert media_type(None) == ""
@@ -0,0 +1,99 @@
+"""
+Тесты для потокового режима bulk.py
+"""
+import io
+import json
+import sys
+import os
+import logging
+
+# Отключаем логирование в тестах
+logging.disable(logging.CRITICAL)
+
+# Добавляем путь к src для импорта (модули сервера импортируют друг друга напрямую)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Импортируем
+from bulk import solve_stream, main
+from json_parser import create_response
+from quadratic import solve_quadratic
+
+
+REQUESTS = [
+    (1, -5, 6),
+    (1, 0, 1),
+    (1, 2, 1),
+    (0, 0, 0),
+    (0, 0, 5),
+    (0, 3, 4),
+    (2.5, -1, 0.25),
+]
+
+
+def request_line(a, b, c):
+    return json.dumps({"params": {"a": a, "b": b, "c": c}})
+
+
+def test_matches_create_response():
+    """Каждая строка ответа совпадает с create_response(solve_quadratic(...))."""
+    lines = [request_line(*abc).encode('utf-8') + b'\n' for abc in REQUESTS]
+    output = io.StringIO()
+
+    total, errors = solve_stream(lines, output, chunk_size=3)
+
+    assert (total, errors) == (len(REQUESTS), 0)
+    # parse_request отдаёт коэффициенты как float
+    expected = [create_response(*solve_quadratic(*map(float, abc))) for abc in REQUESTS]
+    assert output.getvalue().splitlines() == expected
+
+
+def test_errors_inline():
+    """Некорректные строки не останавливают поток, пустые пропускаются."""
+    lines = [
+        request_line(1, -5, 6),
+        'не json',
+        '',
+        '{"params": {"a": 1}}',
+        request_line(1, 2, 1),
+    ]
+    output = io.StringIO()
+
+    total, errors = solve_stream(lines, output, chunk_size=2)
+    responses = [json.loads(line) for line in output.getvalue().splitlines()]
+
+    assert (total, errors) == (4, 2)
+    assert responses[0]["result"]["roots"] == [3.0, 2.0]
+    assert responses[1]["error"] is not None
+    assert responses[2]["error"] is not None
+    assert responses[3]["result"]["roots"] == [-1.0]
+
+
+def test_huge_integer_is_line_error(tmp_path, capsys):
+    """Огромное целое - ошибка одной строки, а не всего запуска."""
+    path = tmp_path / "requests.ndjson"
+    huge = '{"params": {"a": 1%s, "b": 0, "c": 0}}' % ('0' * 400)
+    path.write_text('\n'.join([request_line(1, -5, 6), huge, request_line(1, 2, 1)]) + '\n', encoding='utf-8')
+
+    main([str(path)])
+    responses = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+    assert len(responses) == 3
+    assert responses[0]["result"]["roots"] == [3.0, 2.0]
+    assert responses[1]["error"] is not None
+    assert responses[2]["result"]["roots"] == [-1.0]
+
+
+def test_empty_input():
+    output = io.StringIO()
+    assert solve_stream([], output) == (0, 0)
+    assert output.getvalue() == ''
+
+
+def test_cli_reads_file(tmp_path, capsys):
+    path = tmp_path / "requests.ndjson"
+    path.write_text('\n'.join(request_line(*abc) for abc in REQUESTS) + '\n', encoding='utf-8')
+
+    main([str(path), '--chunk-size', '2'])
+    captured = capsys.readouterr()
+
+    assert len(captured.out.splitlines()) == len(REQUESTS)
+    assert "строк/с" in captured.err
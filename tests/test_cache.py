@@ -0,0 +1,168 @@
+"""
+Тесты для кэша решений cache.py
+"""
+import sys
+import os
+import pytest
+
+# Добавляем путь к src для импорта (модули сервера импортируют друг друга напрямую)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Импортируем
+from cache import SolutionCache, ResponseCache, normalize_coefficients, coefficients_key
+from quadratic import solve_quadratic
+
+
+@pytest.mark.parametrize("coefficients, expected", [
+    ((4, -20, 24), (1.0, -5.0, 6.0)),    # Общий множитель 2**k
+    ((-2, 4, -6), (-1.0, 2.0, -3.0)),    # Знак сохраняется
+    ((24, 174, -12), (12.0, 87.0, -6.0)),  # Нечётный множитель остаётся
+    ((3, -15, 18), (3.0, -15.0, 18.0)),
+    ((0, 4, 8), (0.0, 1.0, 2.0)),        # Линейное уравнение
+    ((0, 0, 0), (0.0, 0.0, 0.0)),        # Любое число
+    ((1.5, 3, 6), (1.5, 3.0, 6.0)),      # Дробные коэффициенты как есть
+    ((1, -5, 6), (1.0, -5.0, 6.0)),      # Уже несократимая тройка
+], ids=[
+    "Common_Factor",
+    "Sign_Kept",
+    "Odd_Factor_Kept",
+    "Odd_Common_Factor",
+    "Linear",
+    "Zero",
+    "Fraction",
+    "Irreducible",
+])
+def test_normalize_coefficients(coefficients, expected):
+    assert normalize_coefficients(*coefficients) == expected
+
+
+def test_scaled_equations_share_entry():
+    """(2,-10,12) и (1,-5,6) используют одну запись, но дискриминанты свои."""
+    cache = SolutionCache(maxsize=10)
+
+    roots1, d1 = cache.solve(1, -5, 6)
+    roots2, d2 = cache.solve(2, -10, 12)
+
+    assert roots1 == roots2 == [3.0, 2.0]
+    assert d1 == 1.0
+    assert d2 == 4.0
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["size"] == 1
+
+
+def test_scaled_triples_match_solver():
+    """Ответ кэша для кратных троек совпадает с solve_quadratic на исходных коэффициентах."""
+    cache = SolutionCache(maxsize=100000)
+    # Порядок важен: сначала решается несократимая тройка, потом кратные
+    for a, b, c in [(2, 29, -2), (24, 174, -12), (12, 87, -6), (6, 87, -6)]:
+        for scale in (1, 2, 3, 5, 6, 8, 12, 64):
+            triple = (float(a * scale), float(b * scale), float(c * scale))
+            assert cache.solve(*triple) == solve_quadratic(*triple), triple
+
+    for a in range(1, 13):
+        for b in range(-40, 41, 3):
+            for c in range(-12, 13):
+                assert cache.solve(a, b, c) == solve_quadratic(a, b, c), (a, b, c)
+
+
+@pytest.mark.parametrize("a, b, c", [
+    (1, 5, 6),
+    (3, 0, 3),
+    (4, 4, 1),
+    (0, 0, 0),
+    (0, 0, 5),
+    (0, 6, 4),
+    (1.5, -2.5, 0.75),
+])
+def test_results_match_solver(a, b, c):
+    """Кэшированный ответ совпадает с solve_quadratic (и при повторе тоже)."""
+    cache = SolutionCache(maxsize=10)
+    expected_roots, expected_d = solve_quadratic(a, b, c)
+
+    for _ in range(2):
+        roots, d = cache.solve(a, b, c)
+        assert roots == expected_roots
+        assert d == expected_d
+
+
+def test_lru_eviction():
+    cache = SolutionCache(maxsize=2)
+
+    cache.solve(1, 1, 1)
+    cache.solve(1, 2, 1)
+    cache.solve(1, 1, 1)     # (1,1,1) становится самым свежим
+    cache.solve(1, 3, 1)     # вытесняет (1,2,1)
+
+    assert cache.stats()["evictions"] == 1
+    assert coefficients_key(1, 1, 1) in cache.entries
+    assert coefficients_key(1, 2, 1) not in cache.entries
+
+
+def test_resize_and_disable():
+    cache = SolutionCache(maxsize=3)
+    for b in range(3):
+        cache.solve(1, b, 1)
+
+    cache.resize(1)
+    assert cache.stats()["size"] == 1
+    assert cache.stats()["evictions"] == 2
+
+    cache.resize(0)
+    assert cache.solve(1, -5, 6) == ([3.0, 2.0], 1.0)
+    assert cache.stats()["size"] == 0
+
+
+def test_returned_roots_are_copies():
+    cache = SolutionCache(maxsize=2)
+    roots, _ = cache.solve(1, -5, 6)
+    roots.append(100.0)
+
+    assert cache.solve(1, -5, 6)[0] == [3.0, 2.0]
+
+
+def test_signed_zero_is_part_of_key():
+    """От знака нуля зависит знак корня: 0x + 3x + 0 = 0 и c = -0.0 различаются."""
+    cache = SolutionCache(maxsize=10)
+
+    assert coefficients_key(0.0, 3.0, 0.0) != coefficients_key(0.0, 3.0, -0.0)
+    assert str(cache.solve(0, 3, 0.0)[0]) == str(solve_quadratic(0, 3, 0.0)[0])
+    assert str(cache.solve(0, 3, -0.0)[0]) == str(solve_quadratic(0, 3, -0.0)[0])
+
+
+def test_response_cache_hit():
+    cache = ResponseCache(max_bytes=10_000)
+    key = coefficients_key(1, -5, 6)
+
+    assert cache.get(key) is None
+    cache.put(key, b'response')
+
+    assert cache.get(key) == b'response'
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["bytes"] > len(b'response')
+
+
+def test_response_cache_byte_budget():
+    """Вытеснение по суммарному размеру, а не по числу записей."""
+    value = b'x' * 1000
+    one_entry = ResponseCache().weigh(coefficients_key(0, 0, 0), value)
+    cache = ResponseCache(max_bytes=one_entry * 2)
+
+    for c in range(3):
+        cache.put(coefficients_key(1, 1, c), value)
+
+    assert cache.stats()["size"] == 2
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] <= cache.stats()["max_bytes"]
+    assert cache.get(coefficients_key(1, 1, 0)) is None
+
+    # Запись больше всего бюджета не сохраняется
+    cache.put(coefficients_key(2, 2, 2), b'x' * one_entry * 3)
+    assert cache.get(coefficients_key(2, 2, 2)) is None
+
+
+def test_response_cache_disabled():
+    cache = ResponseCache(max_bytes=0)
+    cache.put(coefficients_key(1, 1, 1), b'response')
+
+    assert cache.get(coefficients_key(1, 1, 1)) is None
@@ -0,0 +1,136 @@
+"""
+Тесты для объединения одинаковых запросов coalesce.py
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import pytest
+
+# Добавляем путь к src для импорта (модули сервера импортируют друг друга напрямую)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Импортируем
+from coalesce import SingleFlight
+from metrics import Metrics
+import server
+
+logging.disable(logging.CRITICAL)
+
+
+def run_concurrently(count, target):
+    results = [None] * count
+
+    def worker(index):
+        try:
+            results[index] = target()
+        except Exception as error:
+            results[index] = error
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def wait_for_waiters(coalescer, count, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while coalescer.shared < count:
+        assert time.monotonic() < deadline, "waiters did not join"
+        time.sleep(0.001)
+
+
+def test_concurrent_calls_share_one_computation():
+    coalescer = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return b'response'
+
+    threads, results = run_concurrently(8, lambda: coalescer.do('key', compute))
+    wait_for_waiters(coalescer, 7)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False] + [True] * 7
+    assert {value for value, _ in results} == {b'response'}
+
+    stats = coalescer.stats()
+    assert stats["leaders"] == 1
+    assert stats["shared"] == 7
+    assert stats["in_flight"] == 0
+    assert stats["share_rate"] == pytest.approx(7 / 8)
+
+
+def test_sequential_calls_compute_again():
+    # Ключ живёт только пока идёт вычисление
+    coalescer = SingleFlight()
+    assert coalescer.do('key', lambda: 1) == (1, False)
+    assert coalescer.do('key', lambda: 2) == (2, False)
+    assert coalescer.stats()["leaders"] == 2
+
+
+def test_error_is_shared():
+    coalescer = SingleFlight()
+    release = threading.Event()
+
+    def compute():
+        release.wait(5)
+        raise ValueError("broken")
+
+    threads, results = run_concurrently(3, lambda: coalescer.do('key', compute))
+    wait_for_waiters(coalescer, 2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert coalescer.stats()["errors"] == 1
+    assert coalescer.stats()["in_flight"] == 0
+
+
+def test_disabled():
+    coalescer = SingleFlight(enabled=False)
+    assert coalescer.do('key', lambda: 1) == (1, False)
+    assert coalescer.stats()["leaders"] == 0
+
+
+def test_calculate_quadratic_coalesces(monkeypatch):
+    monkeypatch.setattr(server, 'coalescer', SingleFlight())
+    server.response_cache.clear()
+    server.solution_cache.clear()
+
+    release = threading.Event()
+    solve = server.solution_cache.solve
+    calls = []
+
+    def slow_solve(a, b, c):
+        calls.append((a, b, c))
+        release.wait(5)
+        return solve(a, b, c)
+
+    monkeypatch.setattr(server.solution_cache, 'solve', slow_solve)
+    body = b'{"params": {"a": 1, "b": -7, "c": 12}}'
+    threads, results = run_concurrently(4, lambda: server.calculate_quadratic(body))
+    wait_for_waiters(server.coalescer, 3)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == [(1.0, -7.0, 12.0)]
+    assert len({id(result) for result in results}) == 1
+    assert json.loads(results[0].split(b'\r\n\r\n', 1)[1])["result"]["roots"] == [4.0, 3.0]
+    server.response_cache.clear()
+
+
+def test_metrics():
+    text = Metrics().render(coalescing={"leaders": 3, "shared": 5, "in_flight": 1})
+    assert 'calcserv_coalesce_leaders_total 3' in text
+    assert 'calcserv_coalesce_shared_total 5' in text
+    assert 'calcserv_coalesce_in_flight 1' in text
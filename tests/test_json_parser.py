@@ -7,6 +7,7 @@ import sys
 import os
 import json
 import logging
+from unittest import mock
 
 # Отключаем логирование в тестах
 logging.disable(logging.CRITICAL)
@@ -14,7 +15,11 @@ logging.disable(logging.CRITICAL)
 # Добавляем путь к src для импорта
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 # Импортируем
-from src.json_parser import parse_request, create_response, error_response
+from src import json_parser
+from src.json_parser import (
+    parse_request, create_response, error_response, parse_batch_request, create_batch_response,
+    LogRateLimiter, _parse_canonical, parse_equation_request,
+)
 
 
 class TestParseRequest(unittest.TestCase):
@@ -89,6 +94,96 @@ class TestParseRequest(unittest.TestCase):
         self.assertEqual(c, 6.0)
 
 
+class TestParseRequestFastPath(unittest.TestCase):
+    """Быстрый путь parse_request совпадает с разбором через json.loads"""
+
+    def slow_parse(self, json_string):
+        with mock.patch.object(json_parser, '_parse_canonical', return_value=None):
+            return parse_request(json_string)
+
+    def assert_same(self, json_string):
+        fast = parse_request(json_string)
+        slow = self.slow_parse(json_string)
+        # repr различает -0.0 и 0.0
+        self.assertEqual(repr(fast), repr(slow), json_string)
+
+    def test_canonical_numbers(self):
+        for a, b, c in [
+            ('1', '-5', '6'),
+            ('1.5', '-2.5', '0.75'),
+            ('-0', '-0.0', '0'),
+            ('1e400', '-1E-400', '2.5e+3'),
+            ('123456789012345678901234567890', '0.1', '-7'),
+        ]:
+            json_string = '{"params": {"a": %s, "b": %s, "c": %s}}' % (a, b, c)
+            self.assertIsNotNone(_parse_canonical(json_string))
+            self.assert_same(json_string)
+            self.assert_same(json_string.encode('utf-8'))
+
+    def test_whitespace(self):
+        json_string = b'\n { "params" :{"a":1,\t"b" : 2 ,"c":3}\r\n}  '
+        self.assertEqual(_parse_canonical(json_string), (1.0, 2.0, 3.0))
+        self.assert_same(json_string)
+
+    def test_non_canonical_falls_back(self):
+        for json_string in [
+            '{"params": {"b": -5, "a": 1, "c": 6}}',       # другой порядок
+            '{"params": {"a": "1", "b": -5, "c": 6}}',     # строка
+            '{"params": {"a": 1, "b": -5, "c": 6, "d": 1}}',  # лишнее поле
+            '{"params": {"a": 1, "b": -5}}',               # нет коэффициента
+            '{"params": {"a": 01, "b": -5, "c": 6}}',      # не JSON число
+            '{"params": {"a": NaN, "b": -5, "c": 6}}',     # NaN разбирает только json
+            '{"params": {"a": 1, "b": -5, "c": 6}} x',     # мусор в конце
+            '\ufeff{"params": {"a": 1, "b": -5, "c": 6}}',  # BOM
+        ]:
+            self.assertIsNone(_parse_canonical(json_string), json_string)
+            self.assert_same(json_string)
+
+    def test_huge_integer_keeps_error(self):
+        # json превращает огромное целое в int, и float() бросает OverflowError
+        json_string = '{"params": {"a": 1%s, "b": 0, "c": 0}}' % ('0' * 400)
+        self.assertIsNone(_parse_canonical(json_string))
+        with self.assertRaises(OverflowError):
+            parse_request(json_string)
+
+    def test_invalid_utf8(self):
+        self.assertEqual(parse_request(b'{"params": {"a": "\xff", "b": 1, "c": 1}}'), (None, None, None))
+
+
+class TestLogRateLimiter(unittest.TestCase):
+    """Тесты ограничения частоты сообщений об ошибках"""
+
+    def setUp(self):
+        logging.disable(logging.NOTSET)
+
+    def tearDown(self):
+        logging.disable(logging.CRITICAL)
+
+    def test_limits_per_category(self):
+        limiter = LogRateLimiter(rate=0.0, burst=2)
+
+        with self.assertLogs(json_parser.logger, logging.WARNING) as logs:
+            for _ in range(5):
+                limiter(logging.WARNING, "json", "Ошибка %s", "json")
+            limiter(logging.WARNING, "type", "Ошибка %s", "type")
+
+        self.assertEqual(len(logs.records), 3)
+        self.assertEqual(limiter.buckets["json"][2], 3)
+
+    def test_reports_suppressed_count(self):
+        limiter = LogRateLimiter(rate=0.0, burst=1)
+
+        with self.assertLogs(json_parser.logger, logging.WARNING) as logs:
+            for _ in range(4):
+                limiter(logging.WARNING, "json", "Ошибка")
+            # Появился токен - следующее сообщение сообщит о пропущенных
+            limiter.buckets["json"][0] = 1.0
+            limiter(logging.WARNING, "json", "Ошибка")
+
+        self.assertEqual(len(logs.records), 2)
+        self.assertIn("3", logs.records[1].getMessage())
+
+
 class TestCreateResponse(unittest.TestCase):
     """Тесты для функции create_response"""
     
@@ -215,6 +310,98 @@ class TestErrorResponse(unittest.TestCase):
         self.assertEqual(data["error"], error_msg)
 
 
+class TestParseBatchRequest(unittest.TestCase):
+    """Тесты для функции parse_batch_request"""
+
+    def test_valid_batch(self):
+        json_str = '{"params": {"a": [1, 2], "b": [-5, "4"], "c": [6, 2.5]}}'
+        a, b, c = parse_batch_request(json_str)
+
+        self.assertEqual(a, [1.0, 2.0])
+        self.assertEqual(b, [-5.0, 4.0])
+        self.assertEqual(c, [6.0, 2.5])
+
+    def test_empty_batch(self):
+        self.assertEqual(parse_batch_request('{"params": {"a": [], "b": [], "c": []}}'), ([], [], []))
+
+    def test_different_lengths(self):
+        json_str = '{"params": {"a": [1, 2], "b": [-5], "c": [6, 2]}}'
+        self.assertEqual(parse_batch_request(json_str), (None, None, None))
+
+    def test_scalar_coefficients(self):
+        json_str = '{"params": {"a": 1, "b": -5, "c": 6}}'
+        self.assertEqual(parse_batch_request(json_str), (None, None, None))
+
+    def test_non_numeric_item(self):
+        json_str = '{"params": {"a": [1, null], "b": [-5, 1], "c": [6, 2]}}'
+        self.assertEqual(parse_batch_request(json_str), (None, None, None))
+
+    def test_missing_coefficient(self):
+        self.assertEqual(parse_batch_request('{"params": {"a": [1], "b": [2]}}'), (None, None, None))
+
+    def test_invalid_json(self):
+        self.assertEqual(parse_batch_request('[1, 2'), (None, None, None))
+        self.assertEqual(parse_batch_request('[1, 2]'), (None, None, None))
+
+    def test_huge_integer(self):
+        # float() от огромного целого бросает OverflowError - это ошибка запроса
+        json_str = '{"params": {"a": [1%s], "b": [0], "c": [0]}}' % ('0' * 400)
+        self.assertEqual(parse_batch_request(json_str), (None, None, None))
+
+
+class TestParseEquationRequest(unittest.TestCase):
+    """Тесты для функции parse_equation_request"""
+
+    def test_single(self):
+        body = '{"params": {"a": 1, "b": 2, "c": 3, "d": "4"}}'
+        self.assertEqual(parse_equation_request(body, ("a", "b", "c", "d")), [1.0, 2.0, 3.0, 4.0])
+
+    def test_batch(self):
+        body = b'{"params": {"a": [1, 2], "b": [3, 4]}}'
+        self.assertEqual(parse_equation_request(body, ("a", "b"), batch=True), [[1.0, 2.0], [3.0, 4.0]])
+
+    def test_vector(self):
+        body = '{"params": {"coefficients": [1, 0, -1]}}'
+        self.assertEqual(parse_equation_request(body, ("coefficients",), vector=True), [[1.0, 0.0, -1.0]])
+
+    def test_vector_batch(self):
+        body = '{"params": {"coefficients": [[1, 0, -1], [1, 2]]}}'
+        self.assertEqual(
+            parse_equation_request(body, ("coefficients",), batch=True, vector=True),
+            [[[1.0, 0.0, -1.0], [1.0, 2.0]]],
+        )
+
+    def test_invalid(self):
+        self.assertIsNone(parse_equation_request('{"params": {"a": 1}}', ("a", "b")))
+        self.assertIsNone(parse_equation_request('{"params": {"a": [1], "b": [1, 2]}}', ("a", "b"), batch=True))
+        self.assertIsNone(parse_equation_request('{"params": {"a": [1], "b": 2}}', ("a", "b"), batch=True))
+        self.assertIsNone(parse_equation_request('{"params": {"coefficients": 1}}', ("coefficients",), vector=True))
+        self.assertIsNone(parse_equation_request('{"params": {"a": "x", "b": 1}}', ("a", "b")))
+        self.assertIsNone(parse_equation_request('nope', ("a",)))
+
+    def test_huge_integer(self):
+        huge = '1' + '0' * 400
+        self.assertIsNone(parse_equation_request('{"params": {"a": %s, "b": 1}}' % huge, ("a", "b")))
+        self.assertIsNone(parse_equation_request(
+            '{"params": {"coefficients": [[1, %s]]}}' % huge, ("coefficients",), batch=True, vector=True,
+        ))
+
+
+class TestCreateBatchResponse(unittest.TestCase):
+    """Тесты для функции create_batch_response"""
+
+    def test_items_match_create_response(self):
+        results = [([2.0, 3.0], 1.0), ([-1j, 1j], -4.0), (["Любое число"], 0.0), ([], 0.0)]
+        data = json.loads(create_batch_response(results))
+
+        self.assertEqual(len(data), len(results))
+        for item, (roots, discriminant) in zip(data, results):
+            self.assertEqual(item, json.loads(create_response(roots, discriminant)))
+
+    def test_empty(self):
+        self.assertEqual(json.loads(create_batch_response([])), [])
+
+
 class TestFullCycle(unittest.TestCase):
     """Тесты с полным циклом парсинга запроса и создания ответа"""
     
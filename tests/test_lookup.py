@@ -0,0 +1,128 @@
+"""
+Тесты для таблицы решений lookup.py
+"""
+import math
+import os
+import random
+import sys
+import threading
+import pytest
+
+# Добавляем путь к src для импорта (модули сервера импортируют друг друга напрямую)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Импортируем
+from lookup import LookupTable, open_table, main
+from cache import SolutionCache
+from quadratic import solve_quadratic
+
+
+@pytest.fixture(scope='module')
+def table():
+    return LookupTable(12)
+
+
+def same(first, second):
+    assert len(first) == len(second)
+    for x, y in zip(first, second):
+        if isinstance(x, str):
+            assert x == y
+        else:
+            assert type(x) is type(y)
+            assert x == y
+            assert math.copysign(1, x.real) == math.copysign(1, y.real)
+
+
+def test_matches_scalar_solver(table):
+    # Все тройки таблицы
+    for a in range(-12, 13):
+        for b in range(-12, 13):
+            for c in range(-12, 13):
+                # Сервер передаёт коэффициенты как float (parse_request)
+                expected, _ = solve_quadratic(float(a), float(b), float(c))
+                same(table.lookup(a, b, c), expected)
+
+
+def test_matches_scalar_solver_wide_range():
+    table = LookupTable(40)
+    rng = random.Random(0)
+    for _ in range(20000):
+        a, b, c = (rng.randint(-40, 40) for _ in range(3))
+        expected, _ = solve_quadratic(float(a), float(b), float(c))
+        same(table.lookup(a, b, c), expected)
+
+
+def test_float_coefficients(table):
+    same(table.lookup(1.0, -5.0, 6.0), [3.0, 2.0])
+    assert table.lookup(1.5, 2, 3) is None
+    assert table.lookup(-0.0, 2, 3) is None
+    assert table.lookup(1, -0.0, -4) is None
+    assert table.lookup(float('nan'), 1, 1) is None
+    assert table.lookup(float('inf'), 1, 1) is None
+
+
+def test_out_of_range(table):
+    assert table.lookup(13, 0, 0) is None
+    assert table.lookup(1, -13, 0) is None
+    assert table.lookup(1, 0, 10**30) is None
+
+
+def test_stats(table):
+    stats = table.stats()
+    assert stats["size"] == 25 ** 3
+    assert stats["bytes"] == 25 ** 3 * 24
+    assert stats["build_seconds"] >= 0
+
+
+def test_counters_from_many_threads():
+    table = LookupTable(2)
+
+    def lookups():
+        for _ in range(2000):
+            table.lookup(1, 2, 1)
+            table.lookup(100, 0, 0)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=lookups) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert (table.stats()["hits"], table.stats()["misses"]) == (16000, 16000)
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / 'table.npy')
+    built = open_table(5, path)
+    assert os.path.exists(path)
+
+    loaded = open_table(50, path)
+    assert loaded.limit == 5
+    for abc in ((1, -5, 4), (1, 2, 5), (0, 0, 0), (0, 3, 1)):
+        same(loaded.lookup(*abc), built.lookup(*abc))
+
+
+def test_load_rejects_other_arrays(tmp_path):
+    import numpy as np
+    path = str(tmp_path / 'other.npy')
+    np.save(path, np.zeros((10, 3)))
+    with pytest.raises(ValueError):
+        LookupTable.load(path)
+
+
+def test_solution_cache_uses_table(table):
+    cache = SolutionCache(16, solver=None, table=table)
+    roots, discriminant = cache.solve(2, -10, 12)
+    same(roots, [3.0, 2.0])
+    assert discriminant == 4.0
+    assert cache.stats()["misses"] == 0
+
+
+def test_cli(tmp_path, capsys):
+    path = str(tmp_path / 'cli.npy')
+    main(['build', '--limit', '3', path])
+    main(['stats', path])
+    assert '343 троек' in capsys.readouterr().err
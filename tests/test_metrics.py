@@ -0,0 +1,103 @@
+"""
+Тесты для метрик metrics.py
+"""
+import os
+import sys
+import threading
+
+# Добавляем путь к src для импорта (модули сервера импортируют друг друга напрямую)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Импортируем
+from metrics import Metrics, StageTimer
+
+
+def metric_lines(text):
+    return [line for line in text.splitlines() if not line.startswith('#')]
+
+
+def test_timer_disabled_by_default():
+    metrics = Metrics()
+    assert metrics.timer() is None
+    assert 'calcserv_stage_seconds_count' not in metrics.render()
+
+
+def test_stage_histogram():
+    metrics = Metrics(buckets=(0.001, 0.01))
+    shard = metrics.shard()
+    shard.observe('parse', 0.0005)
+    shard.observe('parse', 0.005)
+    shard.observe('parse', 1.0)
+
+    lines = metric_lines(metrics.render())
+
+    assert 'calcserv_stage_seconds_bucket{stage="parse",le="0.001"} 1' in lines
+    assert 'calcserv_stage_seconds_bucket{stage="parse",le="0.01"} 2' in lines
+    assert 'calcserv_stage_seconds_bucket{stage="parse",le="+Inf"} 3' in lines
+    assert 'calcserv_stage_seconds_count{stage="parse"} 3' in lines
+    assert 'calcserv_stage_seconds_sum{stage="parse"} 1.0055' in lines
+
+
+def test_timer_laps():
+    metrics = Metrics(timing=True)
+    timer = metrics.timer()
+    assert isinstance(timer, StageTimer)
+
+    timer.lap('read')
+    timer.lap('parse')
+
+    stages, _, _, _ = metrics.collect()
+    assert sum(stages['read'][0]) == 1
+    assert sum(stages['parse'][0]) == 1
+
+
+def test_counters_are_merged_across_threads():
+    metrics = Metrics()
+
+    def work():
+        for _ in range(1000):
+            metrics.count_status(200)
+        metrics.count_status(400)
+        metrics.request_started()
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    _, statuses, in_flight, _ = metrics.collect()
+    assert statuses == {200: 4000, 400: 4}
+    assert in_flight == 4
+
+    lines = metric_lines(metrics.render())
+    assert 'calcserv_responses_total{code="200"} 4000' in lines
+    assert 'calcserv_requests_in_flight 4' in lines
+
+
+def test_gauges_and_reset():
+    metrics = Metrics()
+    metrics.connection_opened()
+    metrics.connection_opened()
+    metrics.connection_closed()
+    metrics.count_status(404)
+
+    metrics.reset()
+    _, statuses, _, connections = metrics.collect()
+
+    assert statuses == {}
+    assert connections == 1
+
+
+def test_cache_stats():
+    metrics = Metrics()
+    text = metrics.render({
+        "solutions": {"size": 2, "hits": 5, "misses": 1, "evictions": 0},
+        "responses": {"size": 1, "hits": 3, "misses": 2, "evictions": 0, "bytes": 300},
+    })
+    lines = metric_lines(text)
+
+    assert 'calcserv_cache_hits_total{cache="solutions"} 5' in lines
+    assert 'calcserv_cache_misses_total{cache="responses"} 2' in lines
+    assert 'calcserv_cache_bytes{cache="responses"} 300' in lines
+    assert 'calcserv_cache_bytes{cache="solutions"}' not in text
+    assert '# TYPE calcserv_cache_hits_total counter' in text
@@ -0,0 +1,166 @@
+"""
+Тесты для решателей уравнений других степеней polynomial.py и реестра solvers.py
+"""
+import cmath
+import os
+import sys
+import numpy as np
+import pytest
+
+# Добавляем путь к src для импорта (модули сервера импортируют друг друга напрямую)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Импортируем
+from polynomial import (
+    MAX_DEGREE, solve_linear_batch, solve_cubic_batch, solve_quartic_batch, solve_polynomial_batch,
+    cubic_discriminant, quartic_discriminant,
+)
+from quadratic import solve_quadratic
+from solvers import SOLVERS, Solver, register
+
+
+def assert_roots(roots, expected, tolerance=1e-9):
+    assert len(roots) == len(expected)
+    for root, value in zip(roots, expected):
+        assert cmath.isclose(root, value, rel_tol=tolerance, abs_tol=tolerance), (roots, expected)
+
+
+def assert_matches_numpy(coefficients, roots):
+    expected = sorted(np.roots(coefficients), key=lambda x: (-x.real, -x.imag))
+    scale = max(1.0, max(abs(x) for x in expected))
+    assert len(roots) == len(expected)
+    for root, value in zip(roots, expected):
+        assert abs(complex(root) - value) <= 1e-6 * scale, (coefficients, roots, expected)
+
+
+def random_coefficients(degree, count=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    coefficients = rng.integers(-20, 21, size=(count, degree + 1)).astype(float)
+    coefficients[coefficients[:, 0] == 0, 0] = 1
+    return coefficients
+
+
+def test_linear():
+    results = solve_linear_batch([2, 0, 0], [-4, 0, 1])
+    assert results == [([2.0], 0.0), (["Любое число"], 0.0), ([], 0.0)]
+
+
+def test_cubic_known_roots():
+    (roots, discriminant), = solve_cubic_batch([1], [-6], [11], [-6])
+    assert_roots(roots, [3, 2, 1])
+    assert discriminant == 4.0
+
+
+def test_cubic_complex_pair():
+    (roots, discriminant), = solve_cubic_batch([1], [0], [0], [1])
+    assert_roots(roots, [complex(0.5, 3 ** 0.5 / 2), complex(0.5, -(3 ** 0.5) / 2), -1])
+    assert discriminant == -27.0
+    assert isinstance(roots[2], float)
+
+
+def test_cubic_multiple_roots():
+    (roots, _), = solve_cubic_batch([1], [-3], [3], [-1])
+    assert_roots(roots, [1, 1, 1], 1e-12)
+    (roots, _), = solve_cubic_batch([1], [0], [0], [0])
+    assert roots == [0.0, 0.0, 0.0]
+    # Двойной корень распадается на пару с ошибкой ~ sqrt(eps)
+    results = solve_cubic_batch([1, 1], [-2, 7], [0, 0], [0, 0])
+    assert results == [([2.0, 0.0, 0.0], 0.0), ([0.0, 0.0, -7.0], 0.0)]
+
+
+def test_close_roots_not_merged():
+    # (x - 1)(x - 1.001): корни близки, но различимы
+    (roots, _), = solve_cubic_batch([1], [-2.001], [1.001], [0])
+    assert_roots(roots, [1.001, 1, 0], 1e-12)
+
+
+def test_cubic_matches_numpy():
+    coefficients = random_coefficients(3)
+    for row, (roots, _) in zip(coefficients, solve_cubic_batch(*coefficients.T)):
+        assert_matches_numpy(row, roots)
+
+
+def test_cubic_degenerates_to_quadratic():
+    results = solve_cubic_batch([0, 1], [1, 1], [-5, 0], [6, 0])
+    assert results[0] == solve_quadratic(1, -5, 6)
+    assert_roots(results[1][0], [0, 0, -1])
+
+
+def test_quartic_known_roots():
+    (roots, discriminant), = solve_quartic_batch([1], [0], [-5], [0], [4])
+    assert_roots(roots, [2, 1, -1, -2])
+    assert discriminant == 5184.0
+
+
+def test_quartic_complex_roots():
+    # (x² + 1)(x² - 2x + 5): ±i, 1 ± 2i
+    (roots, _), = solve_quartic_batch([1], [-2], [6], [-2], [5])
+    assert_roots(roots, [complex(1, 2), complex(1, -2), 1j, -1j])
+
+
+def test_quartic_rounded_biquadratic():
+    # q приведённого уравнения - шум округления (в точной арифметике 0)
+    (roots, _), = solve_quartic_batch([9], [6], [4], [1], [-7])
+    assert_matches_numpy([9, 6, 4, 1, -7], roots)
+    polynomial_roots = solve_polynomial_batch([[9, 6, 4, 1, -7]])[0][0]
+    assert_roots(roots, polynomial_roots)
+
+
+def test_quartic_matches_numpy():
+    coefficients = random_coefficients(4)
+    for row, (roots, _) in zip(coefficients, solve_quartic_batch(*coefficients.T)):
+        assert_matches_numpy(row, roots)
+
+
+def test_quartic_degenerates():
+    results = solve_quartic_batch([0, 0], [1, 0], [-6, 1], [11, -5], [-6, 6])
+    assert_roots(results[0][0], [3, 2, 1])
+    assert results[1] == solve_quadratic(1, -5, 6)
+
+
+@pytest.mark.parametrize('degree', [3, 5, 8])
+def test_polynomial_matches_numpy(degree):
+    coefficients = random_coefficients(degree, count=300, seed=degree)
+    for row, (roots, discriminant) in zip(coefficients, solve_polynomial_batch(coefficients.tolist())):
+        assert_matches_numpy(row, roots)
+        if degree == 3:
+            assert discriminant == cubic_discriminant(*row)
+        else:
+            # По корням numpy: a^(2n-2) * prod (x_i - x_j)^2
+            expected = np.roots(row)
+            expected = row[0] ** (2 * degree - 2) * np.prod([
+                (expected[i] - expected[j]) ** 2 for i in range(degree) for j in range(i)
+            ]).real
+            assert discriminant == pytest.approx(expected, rel=1e-6)
+
+
+def test_polynomial_multiple_roots():
+    results = solve_polynomial_batch([[1, -3, 3, -1], [1, -2, 0, 0], [1, 0, -2, 0, 1], [1, -2, 1, 0, 0, 0]])
+    assert_roots(results[0][0], [1, 1, 1], 1e-12)
+    assert results[1] == ([2.0, 0.0, 0.0], 0.0)
+    assert_roots(results[2][0], [1, 1, -1, -1], 1e-12)
+    assert results[2][1] == quartic_discriminant(1, 0, -2, 0, 1) == 0
+    assert_roots(results[3][0], [1, 1, 0, 0, 0], 1e-12)
+    assert results[3][1] == 0.0
+
+
+def test_polynomial_mixed_degrees():
+    results = solve_polynomial_batch([[1, 0, -1], [0, 0, 2, -4], [0], [1, -6, 11, -6]])
+    assert results[0] == solve_quadratic(1, 0, -1)
+    assert results[1] == solve_quadratic(0, 2, -4)
+    assert results[2] == (["Любое число"], 0.0)
+    assert_roots(results[3][0], [3, 2, 1])
+
+
+def test_polynomial_limits():
+    with pytest.raises(ValueError):
+        solve_polynomial_batch([[]])
+    with pytest.raises(ValueError):
+        solve_polynomial_batch([[1] * (MAX_DEGREE + 2)])
+
+
+def test_registry():
+    assert list(SOLVERS) == ['linear', 'quadratic', 'cubic', 'quartic', 'polynomial']
+    assert SOLVERS['quadratic'].solve(1, -5, 6) == solve_quadratic(1, -5, 6)
+    assert_roots(SOLVERS['polynomial'].solve([1, -6, 11, -6])[0], [3, 2, 1])
+    with pytest.raises(ValueError):
+        register(Solver('cubic', '', ('a',), solve_linear_batch))
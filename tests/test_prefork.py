@@ -0,0 +1,60 @@
+"""
+Тесты для перезапуска процессов в режиме prefork (server.run_prefork)
+"""
+import os
+import signal
+import sys
+import tempfile
+import time
+import unittest
+import logging
+from unittest import mock
+
+# Отключаем логирование в тестах
+logging.disable(logging.CRITICAL)
+
+# Добавляем путь к src для импорта (модули сервера импортируют друг друга напрямую)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Импортируем
+import server
+
+
+@unittest.skipUnless(hasattr(os, 'fork'), "prefork requires os.fork")
+class TestPrefork(unittest.TestCase):
+    """Процессы, падающие при запуске"""
+
+    def setUp(self):
+        handlers = {signum: signal.getsignal(signum) for signum in (signal.SIGTERM, signal.SIGINT)}
+        for signum, handler in handlers.items():
+            self.addCleanup(signal.signal, signum, handler)
+
+        descriptor, self.path = tempfile.mkstemp()
+        os.close(descriptor)
+        self.addCleanup(os.remove, self.path)
+
+    def failing_create_server(self, *args):
+        # Процесс записывает, какой обработчик SIGTERM он унаследовал
+        with open(self.path, 'a') as file:
+            file.write(f"{signal.getsignal(signal.SIGTERM) == signal.SIG_DFL}\n")
+        raise OSError("Address already in use")
+
+    def test_startup_failures_stop_parent(self):
+        started = time.monotonic()
+        with mock.patch.object(server, 'create_server', self.failing_create_server), \
+                mock.patch.multiple(server, RESPAWN_DELAY=0.05, MAX_STARTUP_FAILURES=3), \
+                mock.patch('sys.stderr'):
+            with self.assertRaises(SystemExit) as raised:
+                server.run_prefork('127.0.0.1', 0, 2)
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(raised.exception.code, 1)
+        with open(self.path) as file:
+            spawned = file.read().split()
+        # Два процесса и два перезапуска; третье падение подряд останавливает сервер
+        self.assertEqual(spawned, ['True'] * 4)
+        # Паузы перед перезапусками: 0.05 и 0.1
+        self.assertGreaterEqual(elapsed, 0.15)
+
+
+if __name__ == '__main__':
+    unittest.main()
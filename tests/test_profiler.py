@@ -0,0 +1,128 @@
+"""
+Тесты для профилирования profiler.py
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+# Добавляем путь к src для импорта (модули сервера импортируют друг друга напрямую)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Импортируем
+from profiler import SamplingProfiler, TraceTimer, start_profile, stop_profile
+from metrics import Metrics
+from async_server import route
+import server
+
+logging.disable(logging.CRITICAL)
+
+
+def busy_loop(stop):
+    while not stop.is_set():
+        sum(range(100))
+
+
+def test_samples_all_threads():
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_loop, args=(stop,), name='busy')
+    worker.start()
+    profiler = SamplingProfiler(interval=0.001)
+    try:
+        profiler.start()
+        time.sleep(0.1)
+        profiler.stop()
+    finally:
+        stop.set()
+        worker.join()
+
+    assert profiler.samples > 0
+    assert not profiler.running
+    lines = profiler.collapsed().splitlines()
+    busy = [line for line in lines if line.startswith('busy;')]
+    assert busy and any('test_profiler.py:busy_loop' in line for line in busy)
+    # Свой поток профилировщик не показывает
+    assert not any(line.startswith('profiler;') for line in lines)
+    # Строка - стек и число выборок
+    stack, count = lines[0].rsplit(' ', 1)
+    assert int(count) > 0 and ';' in stack
+
+
+def test_session_stops_itself():
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start(seconds=0.05)
+    assert profiler.report()["running"]
+    profiler.thread.join(5)
+    report = profiler.report()
+    assert not report["running"]
+    assert report["seconds"] >= 0.05
+
+
+def test_trace_timer():
+    metrics = Metrics(timing=True)
+    trace = TraceTimer(metrics.timer())
+    trace.lap('parse')
+    trace.lap('solve')
+
+    header = trace.server_timing().decode('latin-1')
+    assert header.startswith('Server-Timing: parse;dur=')
+    assert ', solve;dur=' in header and ', total;dur=' in header
+    assert header.endswith('\r\n')
+    # Отметки попадают и в метрики
+    assert set(metrics.collect()[0]) == {'parse', 'solve'}
+
+
+def test_profile_file(tmp_path):
+    path = tmp_path / 'profile.folded'
+    start_profile(str(path), interval=0.001)
+    time.sleep(0.05)
+    stop_profile()
+    assert 'MainThread;' in path.read_text(encoding='utf-8')
+    # Повторная остановка ничего не делает
+    stop_profile()
+
+
+def test_routes_disabled_by_default():
+    assert route('GET', '/debug/profile?seconds=1', b'')[0] == 404
+    status, response = route('POST', '/calculate?quadratic', b'{"params": {"a": 1, "b": 2, "c": 1}}',
+                             {'x-calcserv-trace': '1'})
+    assert status == 200
+    assert b'Server-Timing' not in response
+
+
+def test_debug_profile_route(monkeypatch):
+    monkeypatch.setattr(server, 'profiling', True)
+    monkeypatch.setattr(server, 'profiler', SamplingProfiler())
+    for path, function in server.PROFILING_ROUTES.items():
+        monkeypatch.setitem(server.GET_ROUTES, path, function)
+
+    assert route('GET', '/debug/profile', b'')[0] == 404
+    assert route('GET', '/debug/profile?seconds=abc', b'')[0] == 400
+    assert route('GET', '/debug/profile?seconds=100000', b'')[0] == 400
+
+    status, response = route('GET', '/debug/profile?seconds=0.05&interval=1', b'')
+    assert status == 202
+    assert json.loads(response.split(b'\r\n\r\n', 1)[1])["running"] is True
+    assert route('GET', '/debug/profile?seconds=1', b'')[0] == 409
+
+    server.profiler.thread.join(5)
+    status, response = route('GET', '/debug/profile', b'')
+    assert status == 200
+    assert b'Content-Type: text/plain' in response
+    assert b'MainThread;' in response
+
+
+def test_server_timing_header(monkeypatch):
+    monkeypatch.setattr(server, 'profiling', True)
+    body = b'{"params": {"a": 1, "b": -3, "c": 2}}'
+
+    status, response = route('POST', '/calculate?quadratic', body, {'x-calcserv-trace': '1'})
+    assert status == 200
+    head, content = response.split(b'\r\n\r\n', 1)
+    timing = [line for line in head.split(b'\r\n') if line.startswith(b'Server-Timing: ')]
+    assert len(timing) == 1 and b'parse;dur=' in timing[0]
+    assert json.loads(content)["result"]["roots"] == [2.0, 1.0]
+
+    # Без заголовка - без Server-Timing
+    assert b'Server-Timing' not in route('POST', '/calculate?quadratic', body, {})[1]
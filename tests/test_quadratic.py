@@ -6,13 +6,19 @@
 """
 import sys
 import os
+import math
+import random
+from fractions import Fraction
 import pytest
 from pytest import approx
 
 # Добавляем путь к src для импорта
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 # Импортируем
-from src.quadratic import solve_quadratic
+from src.quadratic import (
+    solve_quadratic, solve_quadratic_batch, solve_quadratic_arrays, solve_quadratic_precise,
+    precise_discriminant, KIND_ANY, KIND_NONE,
+)
 
 
 # Базовые тесты
@@ -66,3 +72,157 @@ def test_solve_quadratic_errors(a, b, c):
     """Проверка генерации исключений при некорректных типах или значениях входных данных."""
     with pytest.raises(TypeError):
         solve_quadratic(a, b, c)
+
+
+
+def assert_same_result(actual, expected):
+    """Побитовое сравнение результатов, включая тип корней и знак нуля."""
+    actual_roots, actual_d = actual
+    expected_roots, expected_d = expected
+
+    def same(x, y):
+        if isinstance(y, complex):
+            return isinstance(x, complex) and same(x.real, y.real) and same(x.imag, y.imag)
+        if isinstance(y, float):
+            if math.isnan(y):
+                return isinstance(x, float) and math.isnan(x)
+            return type(x) is float and x == y and math.copysign(1, x) == math.copysign(1, y)
+        return x == y
+
+    assert len(actual_roots) == len(expected_roots)
+    for x, y in zip(actual_roots, expected_roots):
+        assert same(x, y), (actual, expected)
+    assert same(actual_d, float(expected_d)), (actual, expected)
+
+
+# Тесты пакетного решателя
+@pytest.mark.parametrize("a, b, c", [
+    (1.0, 5.0, 6.0),                    # Действительные
+    (1.0, 0.0, 1.0),                    # Чисто мнимые
+    (1.0, 2.0, 5.0),                    # Комплексные
+    (1.0, 2.0, 1.0),                    # Один корень
+    (0.0, 0.0, 0.0),                    # Любое число
+    (0.0, 0.0, 5.0),                    # Нет корней
+    (0.0, 3.0, 4.0),                    # Линейное уравнение
+    (0.0, 3.0, 0.0),                    # Линейное уравнение, корень -0.0
+    (2.0, 0.0, 0.0),                    # D=0, корень -0.0
+    (1.0, 0.0, -1e-20),                 # Корни меньше 1e-9
+    (1.0, 1e-12, 1.0),                  # Мелкая действительная часть
+    (1e-300, 1.0, 1e-300),              # Почти вырожденный случай
+    (2.2250738585072014e-308, 5e-324, 0.6110945489413325),  # D около DBL_MIN
+    (1.0, float("nan"), 1.0),           # NaN
+    (1.0, 1.0, float("inf")),           # Бесконечность
+])
+def test_solve_quadratic_batch_matches_scalar(a, b, c):
+    """Пакетный решатель даёт ровно тот же результат, что и solve_quadratic."""
+    [result] = solve_quadratic_batch([a], [b], [c])
+    assert_same_result(result, solve_quadratic(a, b, c))
+
+
+def test_solve_quadratic_batch_random():
+    """Сравнение со scalar-версией на случайных коэффициентах."""
+    rng = random.Random(42)
+    special = [0.0, -0.0, 1.0, -1.0, 4.0, 1e-9, -1e-9, 1e-12, 5e-324]
+
+    def coefficient():
+        if rng.random() < 0.3:
+            return rng.choice(special)
+        if rng.random() < 0.5:
+            return float(rng.randint(-10, 10))
+        return rng.uniform(-1e3, 1e3) * 10 ** rng.randint(-100, 100)
+
+    triples = [(coefficient(), coefficient(), coefficient()) for _ in range(5000)]
+    a, b, c = zip(*triples)
+
+    for triple, result in zip(triples, solve_quadratic_batch(a, b, c)):
+        assert_same_result(result, solve_quadratic(*triple))
+
+
+def test_solve_quadratic_arrays_kinds():
+    """Вид решения для вырожденных случаев."""
+    kinds, roots, discriminants = solve_quadratic_arrays([0, 0], [0, 0], [0, 1])
+
+    assert kinds.tolist() == [KIND_ANY, KIND_NONE]
+    assert roots.shape == (2, 2)
+    assert discriminants.tolist() == [0.0, 0.0]
+
+
+def test_solve_quadratic_batch_empty():
+    assert solve_quadratic_batch([], [], []) == []
+
+
+# Тесты устойчивости и режима повышенной точности
+@pytest.mark.parametrize("a, b, c, small_root", [
+    (1.0, 1e8, 1.0, -1e-8),             # b² ≫ 4ac, b > 0
+    (1.0, -1e8, 1.0, 1e-8),             # b² ≫ 4ac, b < 0
+    (1.0, 1e5, 1e-3, -1e-8),
+    (2.0, -3e7, 5.0, 5.0 / 3e7),
+])
+def test_solve_quadratic_small_root_is_accurate(a, b, c, small_root):
+    """Маленький корень не теряется при вычитании близких чисел."""
+    roots, _ = solve_quadratic(a, b, c)
+
+    assert len(roots) == 2
+    assert min(roots, key=abs) == approx(small_root, rel=1e-12)
+    # Произведение корней равно c/a
+    assert roots[0] * roots[1] == approx(c / a, rel=1e-12)
+
+
+def test_solve_quadratic_root_order():
+    """Порядок корней прежний: (-b + sqrt_d) / 2a, затем (-b - sqrt_d) / 2a."""
+    assert solve_quadratic(1, -5, 6) == ([3.0, 2.0], 1.0)
+    assert solve_quadratic(1, 5, 6) == ([-2.0, -3.0], 1.0)
+    assert solve_quadratic(-1, 5, -6) == ([2.0, 3.0], 1.0)
+    assert solve_quadratic(1, 0, -4) == ([2.0, -2.0], 16.0)
+
+
+@pytest.mark.parametrize("a, b, c", [
+    (1.0, 5.0, 6.0),
+    (1.0, 0.0, 1.0),
+    (1.0, 2.0, 5.0),
+    (1.0, 2.0, 1.0),
+    (0.0, 3.0, 4.0),
+    (0.0, 0.0, 0.0),
+    (1.0, float("nan"), 1.0),
+])
+def test_solve_quadratic_precise_same_format(a, b, c):
+    """На хорошо обусловленных уравнениях точный режим совпадает с обычным."""
+    assert_same_result(solve_quadratic_precise(a, b, c), solve_quadratic(a, b, c))
+
+
+def test_solve_quadratic_precise_ill_conditioned():
+    """b² ≈ 4ac: дискриминант считается без потери точности."""
+    a, b, c = 94906267.0, 189812534.0, 94906267.5
+    # Точное значение b² - 4ac
+    exact = Fraction(b) ** 2 - 4 * Fraction(a) * Fraction(c)
+
+    roots, discriminant = solve_quadratic_precise(a, b, c)
+
+    assert discriminant == float(exact) == -189812534.0
+    assert solve_quadratic(a, b, c)[1] != discriminant
+    assert precise_discriminant(a, b, c) == discriminant
+    assert roots[0] == roots[1].conjugate()
+    assert roots[0].real == -1.0
+    assert roots[0].imag == approx(math.sqrt(-float(exact)) / (2 * a), rel=1e-15)
+
+
+def test_solve_quadratic_precise_overflow():
+    """Вместо OverflowError на b**2 дискриминант равен inf."""
+    roots, discriminant = solve_quadratic_precise(1.0, 1e200, 1.0)
+
+    assert discriminant == math.inf
+    # Корень -1e-200 меньше 1e-9 и чистится до нуля
+    assert roots == [0.0, -1e200]
+
+
+def test_solve_quadratic_precise_errors():
+    with pytest.raises(TypeError):
+        solve_quadratic_precise("1", 2, 3)
+
+
+def test_solve_quadratic_batch_precise():
+    triples = [(1.0, 5.0, 6.0), (94906267.0, 189812534.0, 94906267.5), (0.0, 0.0, 1.0)]
+    a, b, c = zip(*triples)
+
+    for triple, result in zip(triples, solve_quadratic_batch(a, b, c, precise=True)):
+        assert_same_result(result, solve_quadratic_precise(*triple))
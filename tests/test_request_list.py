@@ -0,0 +1,107 @@
+"""
+Тесты для списка запросов в одном теле (request_list.py)
+"""
+import json
+import logging
+import os
+import sys
+import pytest
+
+# Добавляем путь к src для импорта (модули сервера импортируют друг друга напрямую)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Импортируем
+from request_list import ListSolver, solve_request_list
+from json_parser import parse_request_list, create_list_response, InvalidRequest
+from quadratic import solve_quadratic, solve_quadratic_batch
+from solver_pool import SolverPool
+from async_server import route
+import server
+
+logging.disable(logging.CRITICAL)
+
+
+class CountingSolver(ListSolver):
+    def __init__(self):
+        super().__init__()
+        self.columns = []
+
+    def solve(self, a, b, c, precise=False):
+        self.columns.append((a, b, c))
+        return super().solve(a, b, c, precise)
+
+
+def body_of(response):
+    return json.loads(response.split(b'\r\n\r\n', 1)[1])
+
+
+def test_parse_items():
+    items = parse_request_list(
+        '[{"params": {"a": 1, "b": -3, "c": 2}}, {"params": {"a": 1, "b": 2}}, 5, '
+        '{"params": {"a": "x", "b": 1, "c": 1}}, {"params": {"a": 1%s, "b": 0, "c": 0}}]' % ('0' * 400)
+    )
+    assert items[0] == (1.0, -3.0, 2.0)
+    assert all(isinstance(item, InvalidRequest) for item in items[1:])
+    assert str(items[1]) == "Отсутствуют коэффициенты: c"
+    assert items[3].category == "value"
+    assert items[4].category == "value"
+
+
+def test_parse_not_a_list():
+    assert parse_request_list('{"params": {"a": 1, "b": 2, "c": 3}}') is None
+    assert parse_request_list('[') is None
+    assert parse_request_list('[]') == []
+
+
+def test_duplicates_are_solved_once():
+    solver = CountingSolver()
+    items = [(1.0, -3.0, 2.0), InvalidRequest("missing", "нет"), (1.0, -3.0, 2.0), (1.0, 0.0, -4.0)]
+    results = solve_request_list(items, solver)
+
+    assert solver.columns == [([1.0, 1.0], [-3.0, 0.0], [2.0, -4.0])]
+    assert results[0] is results[2]
+    assert results[0] == solve_quadratic(1, -3, 2)
+    assert results[1] is items[1]
+    assert results[3] == solve_quadratic(1, 0, -4)
+
+
+def test_only_errors():
+    solver = CountingSolver()
+    results = solve_request_list([InvalidRequest("type", "плохой")], solver)
+    assert solver.columns == []
+    assert json.loads(create_list_response(results))[0]["error"] == "плохой"
+
+
+def test_route_partial_failure():
+    body = b'[{"params": {"a": 1, "b": -5, "c": 6}}, {"params": {"b": 1}}, {"params": {"a": 1, "b": -5, "c": 6}}]'
+    status, response = route('POST', '/calculate?quadratic', body)
+    assert status == 200
+
+    first, error, third = body_of(response)
+    assert first == third
+    assert first["result"]["roots"] == [3.0, 2.0]
+    assert first["error"] is None
+    assert error["error"] == "Отсутствуют коэффициенты: a, c"
+    assert error["result"]["message"] == "Ошибка"
+
+
+def test_route_limits(monkeypatch):
+    monkeypatch.setattr(server.list_solver, 'max_items', 2)
+    body = json.dumps([{"params": {"a": 1, "b": 2, "c": index}} for index in range(3)]).encode()
+    assert route('POST', '/calculate?quadratic', body)[0] == 413
+    assert route('POST', '/calculate?quadratic', b' [1, 2')[0] == 400
+
+
+def test_solver_pool():
+    # Порог списка свой, а не min_items пула
+    solver = ListSolver(pool=SolverPool(2, chunk_size=4, min_items=100), min_items=4)
+    a, b, c = [1.0] * 9, [float(-index) for index in range(9)], [1.0] * 9
+    try:
+        assert solver.solve(a, b, c) == [solve_quadratic(*abc) for abc in zip(a, b, c)]
+        assert solver.pool.stats()["batches"] == 1
+
+        # Меньше порога и точный режим - без пула
+        assert solver.solve([1.0], [2.0], [1.0]) == [solve_quadratic(1, 2, 1)]
+        assert solver.solve(a, b, c, precise=True) == solve_quadratic_batch(a, b, c, precise=True)
+        assert solver.pool.stats()["batches"] == 1
+    finally:
+        solver.pool.close()
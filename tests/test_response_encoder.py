@@ -0,0 +1,102 @@
+"""
+Тесты для сериализатора ответов response_encoder.py
+"""
+import json
+import logging
+import os
+import random
+import sys
+import numpy as np
+import pytest
+
+# Добавляем путь к src для импорта (модули сервера импортируют друг друга напрямую)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Импортируем
+from response_encoder import encode_result, encode_batch, encode_list, encode_error
+from json_parser import (
+    create_response, create_batch_response, create_list_response, error_response, InvalidRequest,
+)
+from quadratic import solve_quadratic
+from polynomial import solve_cubic_batch, solve_polynomial_batch
+from bulk import solve_chunk
+from async_server import route
+import server
+
+logging.disable(logging.CRITICAL)
+
+
+RESULTS = [
+    ([3.0, 2.0], 1.0),
+    ([1j, -1j], -4.0),
+    ([(1 + 2j), (1 - 2j)], -16.0),
+    ([complex(0.5, -0.0)], -0.0),
+    ([], -3.0),
+    ([-0.0], 0.0),
+    (["Любое число"], 0.0),
+    ([1.5, 2, -3.25], float('inf')),
+    ([float('nan')], float('-inf')),
+    ([1e300, -1e-300, 0.1 + 0.2], 5),
+    ([True], 1.0),
+    ([np.float64(0.5)], np.float64(2.0)),
+]
+
+
+@pytest.mark.parametrize('roots, discriminant', RESULTS)
+def test_matches_create_response(roots, discriminant):
+    assert encode_result(roots, discriminant) == create_response(roots, discriminant).encode('utf-8')
+    error = 'ошибка "в кавычках"\n\x01'
+    assert encode_result(roots, discriminant, error) == create_response(roots, discriminant, error).encode('utf-8')
+
+
+def test_solver_results():
+    rng = random.Random(0)
+    results = [solve_quadratic(*(rng.randint(-9, 9) for _ in range(3))) for _ in range(300)]
+    # Многочлены: больше двух корней и комплексные корни numpy
+    results += solve_cubic_batch([1.0], [-6.0], [11.0], [-6.0])
+    results += solve_polynomial_batch([[1.0, 0.0, 0.0, 0.0, -1.0], [1.0, 0.0, 0.0, 0.0, 0.0, 1.0]])
+    for result in results:
+        assert encode_result(*result) == create_response(*result).encode('utf-8')
+    assert encode_batch(results) == create_batch_response(results).encode('utf-8')
+    assert encode_batch([]) == b'[]'
+
+
+def test_list_and_errors():
+    shared = RESULTS[0]
+    results = [shared, InvalidRequest("missing", "Отсутствуют коэффициенты: c"), shared, RESULTS[1]]
+    assert encode_list(results) == create_list_response(results).encode('utf-8')
+    assert encode_error("Ошибка \"x\"") == error_response("Ошибка \"x\"").encode('utf-8')
+
+
+def test_unsupported_values_use_generic_path():
+    # Не сериализуемое json значение - ответ об ошибке, как у create_response
+    response = json.loads(encode_result([object()], 1.0))
+    assert response["error"].startswith("Ошибка сериализации")
+    assert json.loads(encode_batch([([object()], 1.0)]))["error"].startswith("Ошибка сериализации")
+
+
+def test_complex_object_format():
+    response = json.loads(encode_result([(1 + 2j), (1 - 2j)], -16.0, complex_format='object'))
+    assert response["result"]["roots"] == [{"re": 1.0, "im": 2.0}, {"re": 1.0, "im": -2.0}]
+    assert response["result"]["message"] == "Успех! Два корня"
+
+    # Действительные корни не меняются, общий путь даёт тот же вид
+    assert encode_result([2.0], 0.0, complex_format='object') == encode_result([2.0], 0.0)
+    roots = json.loads(encode_batch([([1j, True], -4.0)], complex_format='object'))[0]["result"]["roots"]
+    assert roots == [{"re": 0.0, "im": 1.0}, True]
+
+
+def test_server_complex_format():
+    body = b'{"params": {"a": 1, "b": 0, "c": 1}}'
+    try:
+        server.use_complex_format('object')
+        content = route('POST', '/calculate?quadratic', body)[1].split(b'\r\n\r\n', 1)[1]
+        assert json.loads(content)["result"]["roots"] == [{"re": 0.0, "im": 1.0}, {"re": 0.0, "im": -1.0}]
+        responses, _ = solve_chunk([body], complex_format='object')
+        assert json.loads(responses[0])["result"]["roots"][0] == {"re": 0.0, "im": 1.0}
+    finally:
+        server.use_complex_format('string')
+
+    content = route('POST', '/calculate?quadratic', body)[1].split(b'\r\n\r\n', 1)[1]
+    assert json.loads(content)["result"]["roots"] == ["1j", "-1j"]
+    with pytest.raises(ValueError):
+        server.use_complex_format('polar')
@@ -0,0 +1,120 @@
+"""
+Тесты для пула решателей с общей памятью solver_pool.py
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import numpy as np
+import pytest
+
+# Добавляем путь к src для импорта (модули сервера импортируют друг друга напрямую)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Импортируем
+from solver_pool import SolverPool
+from quadratic import solve_quadratic_arrays
+from binary_protocol import CONTENT_TYPE, encode_request
+from async_server import route
+import server
+
+logging.disable(logging.CRITICAL)
+
+
+@pytest.fixture(scope='module')
+def pool():
+    # Маленькие куски и один слот на процесс: слоты переиспользуются
+    pool = SolverPool(2, chunk_size=7, depth=1, min_items=10)
+    yield pool
+    pool.close()
+
+
+def coefficients(count, seed=0):
+    rng = np.random.default_rng(seed)
+    a, b, c = (rng.integers(-5, 6, count).astype(float) for _ in range(3))
+    # Вырожденные случаи и переполнение
+    a[:4], b[:4], c[:4] = [0, 0, 0, 1e200], [0, 0, 2, 1e200], [0, 1, -4, 1]
+    return a, b, c
+
+
+def assert_same(result, expected):
+    for actual, wanted in zip(result, expected):
+        assert np.array_equal(actual, wanted, equal_nan=True)
+
+
+def test_matches_inline_solver(pool):
+    a, b, c = coefficients(100)
+    assert_same(pool.solve_arrays(a, b, c), solve_quadratic_arrays(a, b, c))
+    stats = pool.stats()
+    assert stats["running"] and stats["slots"] == 2
+    assert stats["chunks"] >= 15
+
+    # Неполный последний кусок и пустая пачка
+    assert_same(pool.solve_arrays(a[:9], b[:9], c[:9]), solve_quadratic_arrays(a[:9], b[:9], c[:9]))
+    assert [len(array) for array in pool.solve_arrays([], [], [])] == [0, 0, 0]
+
+
+def test_concurrent_batches(pool):
+    batches = [coefficients(50 + index, seed=index) for index in range(6)]
+    results = [None] * len(batches)
+
+    def solve(index):
+        results[index] = pool.solve_arrays(*batches[index])
+
+    threads = [threading.Thread(target=solve, args=(index,)) for index in range(len(batches))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+
+    for batch, result in zip(batches, results):
+        assert_same(result, solve_quadratic_arrays(*batch))
+
+
+def test_close_and_restart():
+    pool = SolverPool(1, chunk_size=16)
+    a, b, c = coefficients(40)
+    try:
+        pool.solve_arrays(a, b, c)
+        pool.close()
+        assert not pool.stats()["running"]
+        # Следующая пачка запускает решатели заново
+        assert_same(pool.solve_arrays(a, b, c), solve_quadratic_arrays(a, b, c))
+        assert pool.stats()["batches"] == 2
+    finally:
+        pool.close()
+
+
+def test_routes_use_pool(monkeypatch, pool):
+    a, b, c = coefficients(30)
+    body = json.dumps({"params": {"a": a.tolist(), "b": b.tolist(), "c": c.tolist()}}).encode()
+    binary = encode_request(zip(a, b, c))
+    headers = {'content-type': CONTENT_TYPE}
+
+    expected = (
+        route('POST', '/calculate?quadratic&batch', body)[1],
+        route('POST', '/calculate?quadratic', binary, headers)[1],
+    )
+    batches = pool.stats()["batches"]
+
+    monkeypatch.setattr(server, 'solver_pool', pool)
+    assert route('POST', '/calculate?quadratic&batch', body)[1] == expected[0]
+    assert route('POST', '/calculate?quadratic', binary, headers)[1] == expected[1]
+    assert pool.stats()["batches"] == batches + 2
+
+    # Маленькая пачка решается на месте
+    route('POST', '/calculate?quadratic&batch', b'{"params": {"a": [1], "b": [2], "c": [1]}}')
+    assert pool.stats()["batches"] == batches + 2
+
+    stats = json.loads(route('GET', '/stats/cache', b'')[1].split(b'\r\n\r\n', 1)[1])
+    assert stats["pool"]["workers"] == 2
+
+
+def test_configure_solver_pool():
+    try:
+        server.configure_solver_pool(2, chunk_size=1024, min_items=100)
+        assert server.list_solver.pool is server.solver_pool
+        assert server.solver_pool.used_for(100) and not server.solver_pool.used_for(99)
+    finally:
+        server.configure_solver_pool(0)
+    assert server.solver_pool is None and server.list_solver.pool is None
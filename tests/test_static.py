@@ -0,0 +1,114 @@
+"""
+Тесты для кэша статических файлов static.py
+"""
+import gzip
+import os
+import sys
+import pytest
+
+# Добавляем путь к src для импорта (модули сервера импортируют друг друга напрямую)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Импортируем
+from static import StaticAsset, StaticFiles, parse_accept_encoding, parse_etags
+
+
+CONTENT = b'body { color: red; }\n' * 50
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate, br", {"gzip", "deflate", "br"}),
+    ("gzip;q=0, identity", {"identity"}),
+    ("br;q=0.5 , GZIP;q=1.0", {"br", "gzip"}),
+    ("", set()),
+    (None, set()),
+])
+def test_parse_accept_encoding(header, expected):
+    assert parse_accept_encoding(header) == expected
+
+
+def test_parse_etags():
+    assert parse_etags('"a", W/"b"') == {'"a"', '"b"'}
+    assert parse_etags(None) == set()
+
+
+def headers_dict(headers):
+    return dict(headers)
+
+
+def test_identity_response():
+    asset = StaticAsset('text/css', CONTENT, 0)
+    status, headers, body = asset.respond()
+    headers = headers_dict(headers)
+
+    assert status == 200
+    assert body == CONTENT
+    assert headers['Content-Length'] == str(len(CONTENT))
+    assert headers['Cache-Control'] == 'public, max-age=300'
+    assert 'Content-Encoding' not in headers
+    assert headers['ETag'].startswith('"')
+
+
+def test_gzip_response():
+    asset = StaticAsset('text/css', CONTENT, 0)
+    status, headers, body = asset.respond(accept_encoding='gzip, deflate')
+    headers = headers_dict(headers)
+
+    assert status == 200
+    assert headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(body) == CONTENT
+    assert headers['Content-Length'] == str(len(body))
+    # У сжатого варианта свой ETag
+    assert headers['ETag'] != headers_dict(asset.respond()[1])['ETag']
+
+
+def test_small_file_not_compressed():
+    asset = StaticAsset('text/html', b'<p>', 0)
+    _, headers, body = asset.respond(accept_encoding='gzip')
+
+    assert body == b'<p>'
+    assert 'Content-Encoding' not in headers_dict(headers)
+    assert headers_dict(headers)['Cache-Control'] == 'no-cache'
+
+
+def test_not_modified():
+    asset = StaticAsset('text/css', CONTENT, 0)
+    etag = headers_dict(asset.respond()[1])['ETag']
+
+    status, headers, body = asset.respond(if_none_match=f'"other", W/{etag}')
+    assert status == 304
+    assert body == b''
+    assert headers_dict(headers)['ETag'] == etag
+
+    assert asset.respond(if_none_match='*')[0] == 304
+    assert asset.respond(if_none_match='"stale"')[0] == 200
+
+
+def test_reload_on_mtime_change(tmp_path):
+    path = tmp_path / "styles.css"
+    path.write_bytes(b'old')
+    files = StaticFiles(str(tmp_path), {'/styles.css': ('styles.css', 'text/css')}, check_interval=0)
+    files.load_all()
+
+    assert files.lookup('/styles.css')[1].respond()[2] == b'old'
+
+    path.write_bytes(b'new')
+    os.utime(path, (1, 1))
+    assert files.lookup('/styles.css')[1].respond()[2] == b'new'
+
+
+def test_missing_file_and_route(tmp_path):
+    files = StaticFiles(str(tmp_path), {'/': ('index.html', 'text/html')}, check_interval=None)
+    files.load_all()
+
+    assert files.lookup('/') == (404, "index.html not found")
+    assert files.lookup('/nope') == (404, "Not found")
+
+
+def test_missing_file_appears(tmp_path):
+    files = StaticFiles(str(tmp_path), {'/': ('index.html', 'text/html')}, check_interval=0)
+    files.load_all()
+    (tmp_path / "index.html").write_bytes(b'<html>')
+
+    status, asset = files.lookup('/')
+    assert status == 200
+    assert asset.respond()[2] == b'<html>'
@@ -0,0 +1,234 @@
+"""
+Тесты для постоянного хранилища решений store.py
+"""
+import cmath
+import json
+import logging
+import math
+import multiprocessing
+import os
+import sys
+import threading
+import pytest
+
+# Добавляем путь к src для импорта (модули сервера импортируют друг друга напрямую)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Импортируем
+from store import MmapStore, SqliteStore, open_store, populate, pack_roots, unpack_roots, main
+from cache import SolutionCache, coefficients_key, normalize_coefficients
+from quadratic import solve_quadratic, solve_quadratic_precise
+import server
+
+logging.disable(logging.CRITICAL)
+
+
+ROOTS = [
+    [2.0, 3.0],
+    [-0.0, 1.5],
+    [complex(-1, 2), complex(-1, -2)],
+    [-1.0],
+    ["Любое число"],
+    [],
+]
+
+
+@pytest.fixture(params=['mmap', 'sqlite'])
+def make_store(request, tmp_path):
+    def make(capacity=1024, name='solutions', precise=False):
+        return open_store(str(tmp_path / name), capacity, request.param, precise)
+    return make
+
+
+def key(a, b, c):
+    return coefficients_key(*normalize_coefficients(a, b, c))
+
+
+def same(first, second):
+    assert len(first) == len(second)
+    for x, y in zip(first, second):
+        if isinstance(x, str):
+            assert x == y
+        else:
+            assert type(x) is type(y)
+            assert cmath.isclose(x, y) and math.copysign(1, x.real) == math.copysign(1, y.real)
+
+
+def test_pack_roundtrip():
+    for roots in ROOTS:
+        same(unpack_roots(*pack_roots(roots)), roots)
+
+
+def test_open_store_backend(tmp_path):
+    assert isinstance(open_store(str(tmp_path / 'a.db')), SqliteStore)
+    assert isinstance(open_store(str(tmp_path / 'a.store'), 64), MmapStore)
+    with pytest.raises(ValueError):
+        open_store(str(tmp_path / 'a'), backend='redis')
+
+
+def test_get_put(make_store):
+    store = make_store()
+    assert store.get(key(1, 2, 3)) is None
+    for index, roots in enumerate(ROOTS):
+        store.put(key(1, index, 7), roots)
+    for index, roots in enumerate(ROOTS):
+        same(store.get(key(1, index, 7)), roots)
+    assert store.count() == len(ROOTS)
+    stats = store.stats()
+    assert stats["hits"] == len(ROOTS) and stats["misses"] == 1
+    store.close()
+
+
+def test_reopen(make_store):
+    store = make_store()
+    store.put(key(1, -5, 6), [2.0, 3.0])
+    store.close()
+
+    store = make_store()
+    same(store.get(key(1, -5, 6)), [2.0, 3.0])
+    store.close()
+
+
+def test_counters_from_many_threads(make_store):
+    store = make_store()
+    store.put(key(1, -5, 6), [2.0, 3.0])
+
+    def lookups():
+        for _ in range(500):
+            store.get(key(1, -5, 6))
+            store.get(key(1, 0, 1))
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=lookups) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    stats = store.stats()
+    assert (stats["hits"], stats["misses"]) == (4000, 4000)
+    store.close()
+
+
+def test_mmap_eviction(tmp_path):
+    store = MmapStore(str(tmp_path / 'small'), 8)
+    for b in range(100):
+        store.put(key(1, b, 1), [float(b)])
+    assert store.count() == 8
+    assert store.evictions == 92
+    # последняя запись всегда на месте
+    same(store.get(key(1, 99, 1)), [99.0])
+    store.close()
+
+
+def test_mmap_rejects_foreign_file(tmp_path):
+    path = tmp_path / 'foreign'
+    path.write_bytes(b'not a store' * 10)
+    with pytest.raises(ValueError):
+        MmapStore(str(path))
+
+
+def test_sqlite_prune(tmp_path):
+    store = SqliteStore(str(tmp_path / 'small.db'), max_entries=10)
+    store.PRUNE_EVERY = 5
+    for b in range(20):
+        store.put(key(1, b, 1), [float(b)])
+    assert store.count() == 10
+    assert store.evictions == 10
+    same(store.get(key(1, 19, 1)), [19.0])
+    store.close()
+
+
+def _write_in_child(path, backend):
+    store = open_store(path, 1024, backend)
+    for b in range(50):
+        store.put(key(1, b, -1), solve_quadratic(1, b, -1)[0])
+    store.close()
+
+
+def test_shared_between_processes(make_store):
+    store = make_store()
+    backend = store.stats()["backend"]
+    process = multiprocessing.get_context('fork').Process(target=_write_in_child, args=(store.path, backend))
+    process.start()
+    process.join()
+    assert process.exitcode == 0
+    for b in range(50):
+        same(store.get(key(1, b, -1)), solve_quadratic(1, b, -1)[0])
+    store.close()
+
+
+def test_solution_cache_uses_store(make_store):
+    store = make_store()
+    calls = []
+
+    def solver(a, b, c):
+        calls.append((a, b, c))
+        return solve_quadratic(a, b, c)
+
+    cache = SolutionCache(16, solver=solver, store=store)
+    first = cache.solve(1, -5, 6)
+    assert len(calls) == 1
+
+    # новый процесс: пустой кэш в памяти, решение берётся из хранилища
+    cache = SolutionCache(16, solver=solver, store=store)
+    assert cache.solve(2, -10, 12)[0] == first[0]
+    assert len(calls) == 1
+    store.close()
+
+
+def test_populate(make_store):
+    store = make_store()
+    lines = [
+        json.dumps({"params": {"a": 1, "b": -5, "c": 6}}).encode(),
+        json.dumps({"params": {"a": 2, "b": -10, "c": 12}}).encode(),
+        b'not json',
+        b'',
+        json.dumps({"params": {"a": 1, "b": 2, "c": 5}}).encode(),
+        # Целое, которое не переводится во float
+        b'{"params": {"a": 1, "b": 1' + b'0' * 400 + b', "c": 1}}',
+    ]
+    assert populate(store, lines) == (5, 2)
+    assert populate(store, lines) == (5, 0)
+    same(store.get(key(1, 2, 5)), solve_quadratic(1, 2, 5)[0])
+    store.close()
+
+
+def test_store_remembers_solver(make_store):
+    store = make_store(name='precise', precise=True)
+    assert populate(store, [b'{"params": {"a": 1, "b": 2, "c": 0.9999999999}}']) == (1, 1)
+    same(store.get(key(1, 2, 0.9999999999)), solve_quadratic_precise(1, 2, 0.9999999999)[0])
+    store.close()
+
+    # Хранилище одного режима не открывается в другом
+    with pytest.raises(ValueError):
+        make_store(name='precise')
+    make_store(name='fast').close()
+    with pytest.raises(ValueError):
+        make_store(name='fast', precise=True)
+
+
+def test_precise_mode_detaches_fast_store(make_store, monkeypatch):
+    store = make_store()
+    for name in ('solver', 'discriminant', 'table', 'store'):
+        monkeypatch.setattr(server.solution_cache, name, getattr(server.solution_cache, name))
+    monkeypatch.setattr(server, 'precise', server.precise)
+
+    server.solution_cache.store = store
+    server.use_precise_solver()
+    assert server.solution_cache.store is None
+    store.close()
+
+
+def test_cli(tmp_path, capsys):
+    log = tmp_path / 'requests.ndjson'
+    log.write_text('\n'.join(json.dumps({"params": {"a": 1, "b": b, "c": -1}}) for b in range(10)))
+    path = str(tmp_path / 'cli.store')
+
+    main(['--capacity', '64', 'populate', path, str(log)])
+    main(['stats', path])
+    output = capsys.readouterr().out
+    assert 'entries: 10' in output
+    assert 'capacity: 64' in output
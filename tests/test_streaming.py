@@ -0,0 +1,146 @@
+"""
+Тесты для потокового чтения тела запроса streaming.py
+"""
+import http.client
+import io
+import json
+import logging
+import sys
+import os
+import socket
+import threading
+import pytest
+
+# Добавляем путь к src для импорта (модули сервера импортируют друг друга напрямую)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Импортируем
+from streaming import BodyError, ChunkedWriter, request_body, iter_lines, read_chunked
+import server
+
+logging.disable(logging.CRITICAL)
+
+
+def chunked(*parts):
+    """Кодирует части в формате Transfer-Encoding: chunked."""
+    encoded = io.BytesIO()
+    writer = ChunkedWriter(encoded)
+    for part in parts:
+        writer.write(part)
+    writer.close()
+    return encoded.getvalue()
+
+
+def test_chunked_writer_format():
+    assert chunked(b'hello', b'', b'0123456789abcdef') == b'5\r\nhello\r\n10\r\n0123456789abcdef\r\n0\r\n\r\n'
+
+
+def test_read_chunked_roundtrip():
+    body = chunked(b'{"a"', b': 1}\n{"b', b'": 2}\n')
+    rfile = io.BytesIO(body + b'next request')
+
+    assert b''.join(read_chunked(rfile)) == b'{"a": 1}\n{"b": 2}\n'
+    # Тело прочитано ровно до конца
+    assert rfile.read() == b'next request'
+
+
+def test_read_chunked_with_extensions_and_trailers():
+    rfile = io.BytesIO(b'3;name=value\r\nabc\r\n0\r\nX-Trailer: 1\r\n\r\n')
+    assert b''.join(read_chunked(rfile)) == b'abc'
+
+
+@pytest.mark.parametrize("body", [
+    b'zz\r\nabc\r\n0\r\n\r\n',      # размер не hex
+    b'5\r\nabc',                    # тело оборвано
+    b'3\r\nabcXX0\r\n\r\n',         # нет CRLF после куска
+    b'3\r\nabc\r\n',                # нет последнего куска
+], ids=["Bad_Size", "Truncated", "No_Terminator", "No_Last_Chunk"])
+def test_read_chunked_errors(body):
+    with pytest.raises(BodyError):
+        b''.join(read_chunked(io.BytesIO(body)))
+
+
+def test_request_body_content_length():
+    rfile = io.BytesIO(b'abcdefgh')
+    assert b''.join(request_body(rfile, {'Content-Length': '5'})) == b'abcde'
+
+
+@pytest.mark.parametrize("headers", [
+    {},
+    {'Content-Length': 'x'},
+    {'Content-Length': '-1'},
+    {'Transfer-Encoding': 'gzip'},
+], ids=["No_Length", "Bad_Length", "Negative_Length", "Unsupported_Encoding"])
+def test_request_body_errors(headers):
+    with pytest.raises(BodyError):
+        request_body(io.BytesIO(b''), headers)
+
+
+def test_content_length_truncated():
+    with pytest.raises(BodyError):
+        b''.join(request_body(io.BytesIO(b'abc'), {'Content-Length': '10'}))
+
+
+def test_iter_lines_across_blocks():
+    blocks = [b'one\ntw', b'o', b'\nthree\n\nfour']
+    assert list(iter_lines(blocks)) == [b'one', b'two', b'three', b'', b'four']
+
+
+@pytest.fixture
+def live_server():
+    httpd = server.create_server('127.0.0.1', 0, 'threads', threads=2)
+    thread = threading.Thread(target=httpd.serve_forever)
+    thread.start()
+    try:
+        yield httpd.server_address[1]
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        thread.join()
+
+
+def post_stream(port, body):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+    connection.request('POST', server.STREAM_PATH, body)
+    response = connection.getresponse()
+    try:
+        return response.status, response.read()
+    finally:
+        connection.close()
+
+
+def test_stream_huge_integer_inline(live_server):
+    huge = b'{"params": {"a": 1%s, "b": 0, "c": 0}}' % (b'0' * 400)
+    body = b'{"params": {"a": 1, "b": -5, "c": 6}}\n' + huge + b'\n{"params": {"a": 1, "b": 2, "c": 1}}\n'
+
+    status, content = post_stream(live_server, body)
+    responses = [json.loads(line) for line in content.splitlines()]
+
+    assert status == 200
+    assert len(responses) == 3
+    assert responses[0]["result"]["roots"] == [3.0, 2.0]
+    assert responses[1]["error"] is not None
+    assert responses[2]["result"]["roots"] == [-1.0]
+
+
+def test_stream_aborted_on_unexpected_error(live_server, monkeypatch):
+    def failing_chunks(*args):
+        yield ['{"first": 1}'], 0
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(server, 'iter_solved_chunks', failing_chunks)
+    body = b'{"params": {"a": 1, "b": 2, "c": 1}}\n'
+    with socket.create_connection(('127.0.0.1', live_server), timeout=5) as sock:
+        sock.sendall(b'POST %s HTTP/1.1\r\nHost: x\r\nContent-Length: %d\r\n\r\n%s'
+                     % (server.STREAM_PATH.encode(), len(body), body))
+        raw = b''
+        while True:
+            data = sock.recv(65536)
+            if not data:
+                break
+            raw += data
+
+    # Ответ обрывается без завершающего куска и без второй строки статуса
+    head, content = raw.split(b'\r\n\r\n', 1)
+    assert head.startswith(b'HTTP/1.1 200')
+    assert b'HTTP/1.' not in content
+    assert content == chunked(b'{"first": 1}\n')[:-len(b'0\r\n\r\n')]
@@ -0,0 +1,168 @@
+"""
+Тесты для журнала JSON lines structured_log.py
+"""
+import io
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import http.client
+import pytest
+
+# Добавляем путь к src для импорта (модули сервера импортируют друг друга напрямую)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Импортируем
+import structured_log
+from structured_log import BatchHandler, JsonLinesFormatter, LogWriter, log_access, setup_logging, stop_logging
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    # В тестах логирование выключено глобально (logging.disable) другими модулями
+    previous = logging.root.manager.disable
+    logging.disable(logging.NOTSET)
+    path = tmp_path / 'access.log'
+    yield path
+    stop_logging()
+    logging.disable(previous)
+
+
+def read_lines(path):
+    return [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+
+
+def test_formatter_fields():
+    record = logging.LogRecord('calcserv.access', logging.INFO, __file__, 1, "%s %d", ('GET', 200), None)
+    record.fields = {"status": 200, "client": "127.0.0.1"}
+    entry = json.loads(JsonLinesFormatter().format(record))
+    assert entry["message"] == "GET 200"
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "calcserv.access"
+    assert entry["status"] == 200
+    assert entry["time"].endswith('Z')
+
+
+def test_formatter_exception():
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        record = logging.LogRecord('x', logging.ERROR, __file__, 1, "boom", (), sys.exc_info())
+    entry = json.loads(JsonLinesFormatter().format(record))
+    assert 'ZeroDivisionError' in entry["exception"]
+
+
+def test_batch_handler_flushes_by_size():
+    stream = io.StringIO()
+    handler = BatchHandler(stream, batch_size=3)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    for index in range(4):
+        handler.handle(logging.LogRecord('x', logging.INFO, __file__, 1, str(index), (), None))
+    assert stream.getvalue() == '0\n1\n2\n'
+    handler.flush()
+    assert stream.getvalue() == '0\n1\n2\n3\n'
+
+
+def test_access_and_error_lines(log_file):
+    setup_logging(str(log_file))
+    log_access('127.0.0.1', 'POST', '/calculate?quadratic', 200, 98)
+    log_access('127.0.0.1', 'GET', '/missing', 404, 10)
+    logging.getLogger('json_parser').warning("Ошибка парсинга JSON: %s", 'bad')
+    stop_logging()
+
+    access, missing, error = read_lines(log_file)
+    assert access["status"] == 200 and access["level"] == "INFO"
+    assert access["message"] == "POST /calculate?quadratic 200"
+    assert missing["status"] == 404 and missing["level"] == "WARNING"
+    assert error["logger"] == "json_parser"
+    assert error["message"] == "Ошибка парсинга JSON: bad"
+
+
+def test_sampling_keeps_errors(log_file):
+    setup_logging(str(log_file), sample=0.0)
+    for _ in range(100):
+        log_access('127.0.0.1', 'POST', '/calculate?quadratic', 200, 98)
+    log_access('127.0.0.1', 'POST', '/calculate?quadratic', 400, 50)
+    log_access('127.0.0.1', 'POST', '/calculate?quadratic', 500, 50)
+    stop_logging()
+
+    assert [line["status"] for line in read_lines(log_file)] == [400, 500]
+
+
+def test_sampling_rate(log_file):
+    setup_logging(str(log_file), sample=0.5)
+    for _ in range(2000):
+        log_access('127.0.0.1', 'GET', '/', 200, 1)
+    stop_logging()
+    assert 700 < len(read_lines(log_file)) < 1300
+
+
+def test_many_threads(log_file):
+    setup_logging(str(log_file), batch_size=16)
+
+    def write():
+        for index in range(500):
+            log_access('127.0.0.1', 'GET', f'/{index}', 200, 1)
+
+    threads = [threading.Thread(target=write) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stop_logging()
+    assert len(read_lines(log_file)) == 2000
+
+
+def test_disabled_by_default():
+    # Без setup_logging журнал доступа не пишется и ничего не стоит
+    assert structured_log._writer is None
+    assert not structured_log.access_logger.isEnabledFor(logging.INFO)
+
+
+def test_json_parser_does_not_configure_root_logger():
+    code = "import logging, json_parser; print(len(logging.getLogger().handlers))"
+    output = subprocess.run(
+        [sys.executable, '-c', code], capture_output=True, text=True, check=True,
+        cwd=os.path.join(os.path.dirname(__file__), '..', 'src'),
+    ).stdout
+    assert output.strip() == '0'
+
+
+def test_disable_logging_silences_warnings():
+    # --log none: send_error пишет через log_message, и это не должно попасть в stderr
+    code = (
+        "import logging, server, structured_log; structured_log.disable_logging(); "
+        "server.logger.warning('code %d, message %s', 400, 'Bad request')"
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', code], capture_output=True, text=True, check=True,
+        cwd=os.path.join(os.path.dirname(__file__), '..', 'src'),
+    )
+    assert result.stderr == ''
+
+
+def test_server_access_log(log_file):
+    import server
+
+    setup_logging(str(log_file))
+    httpd = server.create_server('127.0.0.1', 0, 'threads', threads=2)
+    thread = threading.Thread(target=httpd.serve_forever)
+    thread.start()
+    try:
+        connection = http.client.HTTPConnection('127.0.0.1', httpd.server_address[1], timeout=5)
+        connection.request('POST', '/calculate?quadratic', b'{"params": {"a": 1, "b": -5, "c": 6}}')
+        connection.getresponse().read()
+        connection.request('GET', '/missing')
+        connection.getresponse().read()
+        connection.close()
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        thread.join()
+    stop_logging()
+
+    access = [line for line in read_lines(log_file) if line["logger"] == "calcserv.access"]
+    assert [(line["method"], line["status"]) for line in access] == [('POST', 200), ('GET', 404)]
+    assert access[0]["duration_ms"] >= 0
+    assert access[0]["client"] == '127.0.0.1'
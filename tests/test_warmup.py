@@ -0,0 +1,99 @@
+"""
+Тесты для прогрева warmup.py и GET /healthz
+"""
+import json
+import logging
+import os
+import subprocess
+import sys
+import pytest
+
+# Добавляем путь к src для импорта (модули сервера импортируют друг друга напрямую)
+SRC_DIR = os.path.join(os.path.dirname(__file__), '..', 'src')
+sys.path.insert(0, SRC_DIR)
+# Импортируем
+from warmup import Warmup, PENDING, DONE, FAILED
+import server
+from async_server import route
+
+logging.disable(logging.CRITICAL)
+
+
+def test_run_steps_in_order():
+    calls = []
+    warmup = Warmup()
+    warmup.add('first', lambda: calls.append('first'))
+    warmup.add('second', lambda: calls.append('second'))
+    assert not warmup.ready
+    assert warmup.report()["steps"]["first"]["state"] == PENDING
+
+    warmup.run()
+    assert calls == ['first', 'second']
+    assert warmup.ready
+
+    report = warmup.report()
+    assert report["ready"] is True
+    assert [step["state"] for step in report["steps"].values()] == [DONE, DONE]
+    assert report["seconds"] >= 0
+
+
+def test_failed_step_does_not_stop_others():
+    calls = []
+    warmup = Warmup()
+    warmup.add('broken', lambda: 1 / 0)
+    warmup.add('next', lambda: calls.append('next'))
+    warmup.run()
+
+    assert calls == ['next']
+    assert warmup.ready
+    step = warmup.report()["steps"]["broken"]
+    assert step["state"] == FAILED
+    assert 'ZeroDivisionError' in step["error"]
+
+
+def test_background_and_skip():
+    warmup = Warmup()
+    warmup.add('step', lambda: None)
+    warmup.start().join(5)
+    assert warmup.ready
+    assert warmup.thread.name == 'warmup'
+
+    skipped = Warmup()
+    skipped.add('step', lambda: pytest.fail("step must not run"))
+    skipped.skip()
+    assert skipped.ready
+    assert skipped.report()["steps"] == {}
+
+
+def test_healthz(monkeypatch):
+    warmup = Warmup()
+    warmup.add('step', lambda: None)
+    monkeypatch.setattr(server, 'warmup', warmup)
+
+    status, response = route('GET', '/healthz', b'')
+    assert status == 503
+    assert json.loads(response.split(b'\r\n\r\n', 1)[1])["ready"] is False
+
+    warmup.run()
+    status, response = route('GET', '/healthz', b'')
+    assert status == 200
+    assert json.loads(response.split(b'\r\n\r\n', 1)[1])["steps"]["step"]["state"] == DONE
+
+
+def test_server_steps():
+    # Шаги прогрева самого сервера выполняются без ошибок
+    warmup = Warmup()
+    for name, function in server.warmup.steps.items():
+        warmup.add(name, function)
+    warmup.run()
+    assert {step["state"] for step in warmup.report()["steps"].values()} == {DONE}
+
+
+def test_import_is_lazy():
+    # NumPy и сжатие загружаются при прогреве или первом запросе, не при импорте
+    code = (
+        "import sys; sys.path.insert(0, sys.argv[1]); import server, async_server; "
+        "print('numpy' in sys.modules, 'gzip' in sys.modules)"
+    )
+    output = subprocess.run([sys.executable, '-c', code, SRC_DIR], capture_output=True, text=True, check=True)
+    assert output.stdout.split() == ['False', 'False']
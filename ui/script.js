@@ -25,59 +25,259 @@ document.querySelectorAll('.btn').forEach(btn => {
     };
 });
 
+// Клиент API решения уравнений.
+// - Решённые уравнения запоминаются по (a, b, c) в памяти и в sessionStorage:
+//   повторное "Решить" не идёт на сервер.
+// - Уравнения, запрошенные в течение BATCH_DELAY_MS, уходят одним запросом
+//   (список запросов [{"params": ...}, ...] на /calculate?quadratic).
+// - Запрос, который больше никому не нужен (все ожидающие отменили свой
+//   AbortSignal), отменяется через AbortController.
+const API_PATH = '/calculate?quadratic';
+const BATCH_DELAY_MS = 10;
+const MAX_BATCH_SIZE = 100;
+const CACHE_SIZE = 200;
+const STORAGE_PREFIX = 'calcserv:';
+
+const solveClient = {
+    // ключ -> ответ сервера (в порядке использования, последний - самый свежий)
+    cache: new Map(),
+    // ключ -> запрос, который ждёт отправки или ответа
+    pending: new Map(),
+    // запросы, которые ждут отправки
+    queue: [],
+    timer: null,
+
+    key(a, b, c) {
+        return `${a},${b},${c}`;
+    },
+
+    cached(key) {
+        let result = this.cache.get(key);
+        if (result === undefined) {
+            try {
+                const stored = sessionStorage.getItem(STORAGE_PREFIX + key);
+                if (stored !== null) {
+                    result = JSON.parse(stored);
+                }
+            } catch (error) {
+                // sessionStorage может быть недоступен (приватный режим, file://)
+            }
+            if (result === undefined) {
+                return undefined;
+            }
+        }
+        this.remember(key, result);
+        return result;
+    },
+
+    remember(key, result) {
+        this.cache.delete(key);
+        this.cache.set(key, result);
+        if (this.cache.size > CACHE_SIZE) {
+            this.cache.delete(this.cache.keys().next().value);
+        }
+        try {
+            sessionStorage.setItem(STORAGE_PREFIX + key, JSON.stringify(result));
+        } catch (error) {
+            // Переполнение или недоступность хранилища - остаётся кэш в памяти
+        }
+    },
+
+    // Решает уравнение; signal - AbortSignal того, кто ждёт ответа
+    solve(a, b, c, signal) {
+        const key = this.key(a, b, c);
+        const result = this.cached(key);
+        if (result !== undefined) {
+            return Promise.resolve(result);
+        }
+
+        let request = this.pending.get(key);
+        if (request === undefined) {
+            request = {key, params: {a, b, c}, waiters: 0, controller: null};
+            request.promise = new Promise((resolve, reject) => {
+                request.resolve = resolve;
+                request.reject = reject;
+            });
+            this.pending.set(key, request);
+            this.queue.push(request);
+            this.schedule();
+        }
+        request.waiters += 1;
+
+        return new Promise((resolve, reject) => {
+            if (signal) {
+                if (signal.aborted) {
+                    this.release(request);
+                    reject(new DOMException('Aborted', 'AbortError'));
+                    return;
+                }
+                signal.addEventListener('abort', () => {
+                    this.release(request);
+                    reject(new DOMException('Aborted', 'AbortError'));
+                }, {once: true});
+            }
+            request.promise.then(resolve, reject);
+        });
+    },
+
+    // Ожидающий больше не ждёт запрос: если ждать некому, запрос снимается
+    // с очереди, а отправленный - отменяется (когда никому не нужна вся пачка)
+    release(request) {
+        request.waiters -= 1;
+        if (request.waiters > 0) {
+            return;
+        }
+        const position = this.queue.indexOf(request);
+        if (position !== -1) {
+            this.queue.splice(position, 1);
+            this.pending.delete(request.key);
+            request.reject(new DOMException('Aborted', 'AbortError'));
+        } else if (request.batch && request.batch.every(item => item.waiters <= 0)) {
+            // Новые запросы тех же уравнений пойдут уже отдельно
+            for (const item of request.batch) {
+                this.forget(item);
+            }
+            request.controller.abort();
+        }
+    },
+
+    forget(request) {
+        if (this.pending.get(request.key) === request) {
+            this.pending.delete(request.key);
+        }
+    },
+
+    schedule() {
+        if (this.queue.length >= MAX_BATCH_SIZE) {
+            clearTimeout(this.timer);
+            this.flush();
+        } else if (this.timer === null) {
+            this.timer = setTimeout(() => this.flush(), BATCH_DELAY_MS);
+        }
+    },
+
+    async flush() {
+        this.timer = null;
+        const batch = this.queue.splice(0, MAX_BATCH_SIZE);
+        if (this.queue.length > 0) {
+            this.schedule();
+        }
+        if (batch.length === 0) {
+            return;
+        }
+
+        const controller = new AbortController();
+        for (const request of batch) {
+            request.controller = controller;
+            request.batch = batch;
+        }
+
+        // Одно уравнение - обычный запрос, несколько - список запросов
+        const body = batch.length === 1
+            ? {params: batch[0].params}
+            : batch.map(request => ({params: request.params}));
+
+        try {
+            const response = await fetch(API_PATH, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify(body),
+                signal: controller.signal,
+            });
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+
+            const data = await response.json();
+            const results = batch.length === 1 ? [data] : data;
+            batch.forEach((request, index) => {
+                const result = results[index];
+                if (!result.error) {
+                    this.remember(request.key, result);
+                }
+                request.resolve(result);
+            });
+        } catch (error) {
+            for (const request of batch) {
+                request.reject(error);
+            }
+        } finally {
+            for (const request of batch) {
+                this.forget(request);
+            }
+        }
+    },
+};
+
+// Контроллер текущего решения: новое "Решить" отменяет ожидание предыдущего
+let solveController = null;
+
 async function solveEquation() {
     const a = parseFloat(document.getElementById('a').value);
     const b = parseFloat(document.getElementById('b').value);
     const c = parseFloat(document.getElementById('c').value);
-    
-    const equationData = {
-        params: {
-            a: a,
-            b: b,
-            c: c
-        }
-    };
-    
+
+    if (solveController) {
+        solveController.abort();
+    }
+    const controller = solveController = new AbortController();
+
     try {
         document.getElementById('result').innerHTML = 'Вычисление...';
-        
-        const response = await fetch('/calculate?quadratic', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify(equationData)
-        });
-        
-        const result = await response.json();
-        
-        if (result.error) {
-            document.getElementById('result').innerHTML = `Ошибка: ${result.error}`;
-        } else {
-            const roots = result.result.roots;
-            const discriminant = result.result.discriminant;
-            const message = result.result.message;
-
-            let html = `<h3>${message}</h3>`;
-            html += `<p><strong>Дискриминант:</strong> ${discriminant}</p>`;
-            
-            if (roots[0] === "Любое число") {
-                html += `<p><strong>Корни:</strong> Любое число</p>`;
-            } else if (roots.length === 0) {
-                html += `<p><strong>Корни:</strong> Нет действительных корней</p>`;
-            } else if (roots.length === 1) {
-                html += `<p><strong>Корень:</strong> ${roots[0]}</p>`;
-            } else {
-                html += `<p><strong>Корни:</strong> ${roots[0]}, ${roots[1]}</p>`;
-            }
-            
-            document.getElementById('result').innerHTML = html;
-        }
-        
+
+        const result = await solveClient.solve(a, b, c, controller.signal);
+        showResult(result);
+
     } catch (error) {
+        if (error.name === 'AbortError') {
+            // Ответ на устаревший запрос не нужен: на экране уже новый
+            return;
+        }
         document.getElementById('result').innerHTML = `Ошибка: ${error.message}`;
     }
 }
 
+// Комплексный корень приходит строкой "(1+2j)" или, если сервер запущен
+// с --complex-format object, объектом {"re": 1, "im": 2}
+function formatRoot(root) {
+    if (root === null || typeof root !== 'object') {
+        return root;
+    }
+    if (root.im === 0) {
+        return `${root.re}`;
+    }
+    if (root.re === 0) {
+        return `${root.im}i`;
+    }
+    return `${root.re} ${root.im < 0 ? '-' : '+'} ${Math.abs(root.im)}i`;
+}
+
+function showResult(result) {
+    if (result.error) {
+        document.getElementById('result').innerHTML = `Ошибка: ${result.error}`;
+    } else {
+        const roots = result.result.roots;
+        const discriminant = result.result.discriminant;
+        const message = result.result.message;
+
+        let html = `<h3>${message}</h3>`;
+        html += `<p><strong>Дискриминант:</strong> ${discriminant}</p>`;
+
+        if (roots[0] === "Любое число") {
+            html += `<p><strong>Корни:</strong> Любое число</p>`;
+        } else if (roots.length === 0) {
+            html += `<p><strong>Корни:</strong> Нет действительных корней</p>`;
+        } else if (roots.length === 1) {
+            html += `<p><strong>Корень:</strong> ${formatRoot(roots[0])}</p>`;
+        } else {
+            html += `<p><strong>Корни:</strong> ${formatRoot(roots[0])}, ${formatRoot(roots[1])}</p>`;
+        }
+
+        document.getElementById('result').innerHTML = html;
+    }
+}
+
 // Начальное выделение поля 'a'
 document.getElementById('a').style.borderColor = 'red';
\ No newline at end of file